@@ -0,0 +1,80 @@
+"""
+Compare the analysis of dataclasses, attrs classes and named tuples
+from their field metadata with the generic ``inspect.signature`` path.
+
+The analysis is done once per class, so this mostly matters for the startup
+of containers registering many classes.
+
+Usage: python benchmarks/construction.py [iterations]
+"""
+import dataclasses
+import sys
+import timeit
+import typing
+from inspect import signature
+
+from pyjection.signature_cache import SignatureCache
+
+try:
+    import attr
+except ImportError:
+    attr = None
+
+
+class Configuration(object):
+    pass
+
+
+@dataclasses.dataclass
+class DataClass(object):
+    configuration: Configuration
+    name: str = 'name'
+    retries: int = 3
+    tags: list = dataclasses.field(default_factory=list)
+
+
+class NamedTupleClass(typing.NamedTuple):
+    configuration: Configuration
+    name: str = 'name'
+    retries: int = 3
+
+
+def get_subjects():
+    subjects = [DataClass, NamedTupleClass]
+    if attr is not None:
+        @attr.s(auto_attribs=True)
+        class AttrsClass(object):
+            configuration: Configuration
+            name: str = 'name'
+            retries: int = 3
+            tags: list = attr.Factory(list)
+
+        subjects.append(AttrsClass)
+    return subjects
+
+
+def analyze_signature(subject):
+    """
+    The generic path: introspect the generated constructor
+    """
+    constructor = subject.__new__ if issubclass(subject, tuple) else subject.__init__
+    parameters = tuple(signature(constructor).parameters.values())[1:]
+    localns = {subject.__name__: subject}
+    return SignatureCache._evaluate_annotations(constructor, parameters, localns)
+
+
+def main(iterations):
+    cache = SignatureCache()
+    for subject in get_subjects():
+        fields = timeit.timeit(lambda: cache._analyze(subject), number=iterations)
+        generic = timeit.timeit(lambda: analyze_signature(subject), number=iterations)
+        print("{0:<16} fields: {1:>8.2f} us  signature: {2:>8.2f} us  (x{3:.1f})".format(
+            subject.__name__,
+            fields / iterations * 1e6,
+            generic / iterations * 1e6,
+            generic / fields
+        ))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,74 @@
+"""
+Measure the throughput of ``DependencyInjector.get`` with 1 to 32 threads.
+
+Reads do not take any lock, so on a free-threaded interpreter
+the throughput is expected to scale with the number of threads.
+
+Usage: python benchmarks/threads.py [iterations]
+"""
+import sys
+import threading
+import time
+
+from pyjection.dependency_injector import DependencyInjector
+
+
+class Configuration(object):
+    pass
+
+
+class Repository(object):
+
+    def __init__(self, configuration):
+        self.configuration = configuration
+
+
+class Handler(object):
+
+    def __init__(self, repository: Repository, configuration):
+        self.repository = repository
+        self.configuration = configuration
+
+
+def build_injector():
+    injector = DependencyInjector()
+    injector.register_singleton(Configuration)
+    injector.register_singleton(Repository)
+    injector.register(Handler)
+    return injector
+
+
+def run(injector, thread_count, iterations):
+    barrier = threading.Barrier(thread_count + 1)
+
+    def worker():
+        barrier.wait()
+        for _ in range(iterations):
+            injector.get('handler')
+
+    threads = [threading.Thread(target=worker) for _ in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return thread_count * iterations / (time.perf_counter() - start)
+
+
+def main(iterations):
+    injector = build_injector()
+    # Warm up the signature cache and the call plans
+    run(injector, 1, 1000)
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print("Python {0} (GIL {1})".format(sys.version.split()[0], "enabled" if gil else "disabled"))
+    baseline = None
+    for thread_count in (1, 2, 4, 8, 16, 32):
+        throughput = run(injector, thread_count, iterations)
+        baseline = baseline or throughput
+        print("{0:>3} threads: {1:>12,.0f} get/s (x{2:.2f})".format(
+            thread_count, throughput, throughput / baseline))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
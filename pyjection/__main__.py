@@ -0,0 +1,111 @@
+"""
+Command line interface of pyjection.
+
+Usage::
+
+    python -m pyjection compile app.container:injector out.py
+    python -m pyjection check app.container:injector --max-depth 10
+"""
+import argparse
+import sys
+
+from pyjection.compiler import ContainerCompiler
+from pyjection.errors import PyjectionError
+from pyjection.helper import load_object
+from pyjection.validator import ContainerValidator
+
+
+def compile_injector(arguments):
+    injector = load_object(arguments.injector)
+    ContainerCompiler(injector, arguments.injector).write(arguments.output)
+    return 0
+
+
+def check_injector(arguments):
+    injector = load_object(arguments.injector)
+    report = ContainerValidator(injector).validate()
+    failed = not report.is_valid
+
+    for problem in report.errors:
+        sys.stdout.write("error: {0}: {1}\n".format(problem.identifier, problem.message))
+    for problem in report.warnings:
+        sys.stdout.write("warning: {0}: {1}\n".format(problem.identifier, problem.message))
+    for cycle in report.cycles:
+        sys.stdout.write("error: circular dependency: {0}\n".format(' -> '.join(cycle)))
+    for identifier, metrics in sorted(report.metrics.items()):
+        if arguments.max_depth is not None and metrics.depth > arguments.max_depth:
+            sys.stdout.write("error: {0}: depth {1} exceeds {2}\n".format(
+                identifier, metrics.depth, arguments.max_depth))
+            failed = True
+        if arguments.max_fan_out is not None and metrics.fan_out > arguments.max_fan_out:
+            sys.stdout.write("error: {0}: fan-out {1} exceeds {2}\n".format(
+                identifier, metrics.fan_out, arguments.max_fan_out))
+            failed = True
+
+    if arguments.verbose:
+        width = max([len(identifier) for identifier in report.metrics] + [len('service')])
+        sys.stdout.write("{0:<{1}}  depth  fan-out  fan-in\n".format('service', width))
+        for identifier, metrics in sorted(report.metrics.items()):
+            sys.stdout.write("{0:<{1}}  {2:>5}  {3:>7}  {4:>6}\n".format(
+                identifier, width, metrics.depth, metrics.fan_out, metrics.fan_in))
+    sys.stdout.write("{0} services checked: {1}\n".format(
+        len(report.metrics),
+        'failed' if failed else 'ok'
+    ))
+    return 1 if failed else 0
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(prog='python -m pyjection')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    compile_parser = subparsers.add_parser(
+        'compile',
+        help='Generate a python module building the services of a dependency injector'
+    )
+    compile_parser.add_argument(
+        'injector',
+        help='Path of the dependency injector, e.g. app.container:injector'
+    )
+    compile_parser.add_argument('output', help='Path of the generated module')
+    compile_parser.set_defaults(handler=compile_injector)
+
+    check_parser = subparsers.add_parser(
+        'check',
+        help='Validate the wiring of a dependency injector without instantiating any service'
+    )
+    check_parser.add_argument(
+        'injector',
+        help='Path of the dependency injector, e.g. app.container:injector'
+    )
+    check_parser.add_argument(
+        '--max-depth',
+        type=int,
+        help='Fail when a dependency chain is deeper'
+    )
+    check_parser.add_argument(
+        '--max-fan-out',
+        type=int,
+        help='Fail when a service has more direct dependencies'
+    )
+    check_parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help='Print the metrics of each service'
+    )
+    check_parser.set_defaults(handler=check_injector)
+    return parser
+
+
+def main(argv=None):
+    arguments = get_parser().parse_args(argv)
+    try:
+        return arguments.handler(arguments)
+    except PyjectionError as error:
+        sys.stderr.write("{0}\n".format(error))
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
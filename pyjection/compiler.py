@@ -0,0 +1,252 @@
+"""
+Ahead-of-time compiler of a dependency injector.
+
+The compiler analyzes a configured dependency injector and generates a python module
+made of straight-line factory functions and a dispatch table.
+Importing the generated module does no introspection at all
+and its ``get`` function is a dict lookup plus a direct call.
+
+The dependency injector stays the source of truth:
+the generated module imports it to retrieve the registered classes and argument values.
+Singletons built by the generated module are not shared with the dependency injector.
+"""
+import ast
+import logging
+
+from pyjection.errors import CircularDependencyError, CompilationError
+from pyjection.resolvers import VALUE, SERVICE, CLASS, MULTI
+
+HEADER = '''"""
+Generated by pyjection from {path}. Do not edit.
+"""
+from pyjection.errors import ServiceNotFoundError
+from pyjection.helper import get_service_subject_identifier
+from {module} import {attribute} as _injector
+
+_singletons = dict()
+'''
+
+FOOTER = '''
+
+def get(identifier):
+    if not isinstance(identifier, str):
+        identifier = get_service_subject_identifier(identifier)
+    try:
+        factory = FACTORIES[identifier]
+    except KeyError:
+        raise ServiceNotFoundError("No service has been declared with this ID")
+    return factory()
+'''
+
+
+class ContainerCompiler(object):
+    """
+    Generate the source code of a module building the services of a dependency injector
+    """
+
+    def __init__(self, injector, path):
+        """
+        :param injector: The dependency injector to compile
+        :type injector: DependencyInjector
+        :param path: The ``module:attribute`` path used to import the dependency injector
+        :type path: string
+        """
+        self._logger = logging.getLogger(__name__)
+        self._injector = injector
+        self._path = path
+        self._names = dict()
+        self._subjects = list()
+        self._values = list()
+        self._factories = list()
+
+    def compile(self):
+        """
+        Generate the module source code
+
+        :return: The python source code of the module
+        :rtype: string
+        """
+        identifiers = self._injector.get_identifiers()
+        self._names = {identifier: index for index, identifier in enumerate(identifiers)}
+        self._subjects = list()
+        self._values = list()
+        self._factories = list()
+        self._check_cycles(identifiers)
+        for identifier in identifiers:
+            self._factories.append(self._compile_factory(identifier))
+
+        module, _, attribute = self._path.partition(':')
+        lines = [HEADER.format(path=self._path, module=module, attribute=attribute)]
+        lines.extend(self._subjects)
+        lines.extend(self._values)
+        lines.extend(self._factories)
+        lines.append('\nFACTORIES = {')
+        for identifier in identifiers:
+            lines.append('    {0!r}: _build_{1},'.format(identifier, self._names[identifier]))
+        for interface, implementation in self._get_interfaces():
+            lines.append('    {0!r}: _build_{1},'.format(interface, self._names[implementation]))
+        lines.append('}')
+        lines.append(FOOTER)
+        return '\n'.join(lines)
+
+    def write(self, output):
+        """
+        Generate the module and write it in the given file
+
+        :param output: Path of the generated module
+        :type output: string
+        """
+        source = self.compile()
+        with open(output, 'w') as output_file:
+            output_file.write(source)
+        self._logger.debug("Dependency injector %s compiled in %s", self._path, output)
+
+    def _get_interfaces(self):
+        """
+        Return the interfaces bound to a service or implemented by a single registered class,
+        with the identifier of their implementation
+
+        :rtype: list
+        """
+        interfaces = list()
+        for interface in sorted(set(self._injector._bindings) | set(self._injector._mro_index)):
+            if interface in self._names:
+                continue
+            implementation = self._injector.resolve_identifier(interface)
+            if implementation in self._names:
+                interfaces.append((interface, implementation))
+        return interfaces
+
+    def _compile_factory(self, identifier):
+        name = self._names[identifier]
+        service = self._injector.get_service(identifier)
+        header = '\n\ndef _build_{0}():  # {1!r}'.format(name, identifier)
+
+        if service.lifetime is not None or service.interceptors:
+            # Lifetimes other than transient and singleton, and interceptors,
+            # are managed by the dependency injector
+            return '{0}\n    return _injector.get({1!r})'.format(header, identifier)
+        if service.type == 'instance':
+            return '{0}\n    return {1}'.format(header, self._get_subject(identifier))
+
+        try:
+            plan = self._injector.get_construction_plan(identifier)
+        except NotImplementedError:
+            # A resolver does not support static resolution, the arguments are resolved
+            # by the dependency injector on each call
+            return '{0}\n    return _injector.get({1!r})'.format(header, identifier)
+
+        arguments = list()
+        for method_parameter, resolution in plan:
+            if resolution is None:
+                continue
+            expression = self._get_expression(identifier, method_parameter, resolution)
+            arguments.append('{0}={1}'.format(method_parameter.name, expression))
+        call = '{0}({1})'.format(self._get_subject(identifier), ', '.join(arguments))
+
+        if not service.is_singleton:
+            return '{0}\n    return {1}'.format(header, call)
+        return (
+            '{0}\n'
+            '    try:\n'
+            '        return _singletons[{1!r}]\n'
+            '    except KeyError:\n'
+            '        instance = _singletons[{1!r}] = {2}\n'
+            '        return instance'
+        ).format(header, identifier, call)
+
+    def _get_expression(self, identifier, method_parameter, resolution):
+        if resolution.kind == SERVICE:
+            return '_build_{0}()'.format(self._get_name(resolution.value))
+        if resolution.kind == CLASS:
+            return self._get_subject(resolution.value)
+        if resolution.kind == VALUE:
+            return self._get_value(identifier, method_parameter.name, resolution.value)
+        if resolution.kind == MULTI:
+            members = self._injector.get_tagged_identifiers(resolution.value)
+            return '[{0}]'.format(', '.join(
+                '_build_{0}()'.format(self._get_name(member)) for member in members
+            ))
+        raise CompilationError("Unsupported resolution kind: {0}".format(resolution.kind))
+
+    def _get_name(self, identifier):
+        try:
+            return self._names[self._injector.resolve_identifier(identifier)]
+        except KeyError:
+            raise CompilationError("No service has been declared with ID {0}".format(identifier))
+
+    def _get_subject(self, identifier):
+        name = self._get_name(identifier)
+        subject = '_subject_{0}'.format(name)
+        line = '{0} = _injector.get_uninstantiated({1!r})'.format(subject, identifier)
+        if line not in self._subjects:
+            self._subjects.append(line)
+        return subject
+
+    def _get_value(self, identifier, argument_name, value):
+        if self._is_literal(value):
+            return repr(value)
+        service = self._injector.get_service(identifier)
+        if service.arguments.get(argument_name) is not value:
+            error = "The value of argument {0} of service {1} can't be compiled".format(
+                argument_name,
+                identifier
+            )
+            self._logger.error(error)
+            raise CompilationError(error)
+        name = '_value_{0}'.format(len(self._values))
+        self._values.append('{0} = _injector.get_service({1!r}).arguments[{2!r}]'.format(
+            name,
+            identifier,
+            argument_name
+        ))
+        return name
+
+    @staticmethod
+    def _is_literal(value):
+        if value is None or isinstance(value, (bool, int, float, str, bytes)):
+            try:
+                return ast.literal_eval(repr(value)) == value
+            except (ValueError, SyntaxError):
+                return False
+        return False
+
+    def _check_cycles(self, identifiers):
+        """
+        Make sure the generated factories won't call each other endlessly
+        """
+        dependencies = dict()
+        for identifier in identifiers:
+            dependencies[identifier] = list()
+            try:
+                plan = self._injector.get_construction_plan(identifier)
+            except NotImplementedError:
+                # Built by the dependency injector, which detects the cycles itself
+                continue
+            for _, resolution in plan:
+                if resolution is None:
+                    continue
+                if resolution.kind == SERVICE:
+                    dependencies[identifier].append(
+                        self._injector.resolve_identifier(resolution.value)
+                    )
+                elif resolution.kind == MULTI:
+                    dependencies[identifier].extend(
+                        self._injector.get_tagged_identifiers(resolution.value)
+                    )
+
+        visited = set()
+        for identifier in identifiers:
+            self._visit(identifier, dependencies, visited, list())
+
+    def _visit(self, identifier, dependencies, visited, path):
+        if identifier in path:
+            cycle = ' -> '.join(path[path.index(identifier):] + [identifier])
+            raise CircularDependencyError("Circular dependency: {0}".format(cycle))
+        if identifier in visited:
+            return
+        path.append(identifier)
+        for dependency in dependencies.get(identifier, list()):
+            self._visit(dependency, dependencies, visited, path)
+        path.pop()
+        visited.add(identifier)
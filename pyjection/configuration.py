@@ -0,0 +1,349 @@
+"""
+Declarative configuration of a dependency injector from a JSON or TOML file.
+
+.. code:: json
+
+    {
+        "services": {
+            "connection": {"class": "app.db:Connection", "lifetime": "singleton",
+                           "arguments": {"url": "sqlite://"}},
+            "repository": {"class": "app.repository:Repository", "tags": ["repositories"],
+                           "arguments": {"connection": {"$ref": "connection"}}},
+            "settings": {"instance": "app.settings:settings"}
+        },
+        "bindings": {"app.interfaces:Repository": "repository"}
+    }
+
+Argument values are injected as is, except for the objects made of a single key:
+``{"$ref": id}`` injects the service, ``{"$class": id}`` its class
+and ``{"$tag": tag}`` the list of the services registered under the tag.
+The results of some methods of a service can be cached with
+``"memoize": {"methods": ["find"], "max_size": 100, "ttl": 60}``.
+
+Parsing and validating the file is skipped when a cache file is given
+and the file hasn't changed since the cache has been written.
+"""
+import hashlib
+import json
+import logging
+import marshal
+import os
+import sys
+import tempfile
+
+from pyjection.dependency_injector import DependencyInjector
+from pyjection.errors import ConfigurationError
+from pyjection.helper import load_object
+from pyjection.interceptors import MemoizingInterceptor
+from pyjection.reference import Reference
+
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# Version of the layout of the cached configuration, to increase whenever it changes
+CACHE_FORMAT = 1
+
+SERVICE_FIELDS = 9
+
+LIFETIMES = {
+    'transient': set(),
+    'singleton': set(),
+    'pooled': {'max_size', 'idle_timeout', 'timeout'},
+    'thread_local': {'per_task'},
+    'multiton': {'max_size', 'ttl'},
+    'refreshing': {'ttl', 'refresh_ahead'},
+    'weak_singleton': {'idle_timeout'},
+}
+
+SERVICE_KEYS = {
+    'class', 'instance', 'lifetime', 'options', 'tags', 'profiles', 'memoize', 'arguments'
+}
+
+MEMOIZE_KEYS = {'methods', 'max_size', 'ttl'}
+
+REFERENCE_KEYS = {
+    '$ref': 'service',
+    '$class': 'class',
+    '$tag': 'tag',
+}
+
+
+class ConfigurationLoader(object):
+    """
+    Build or complete a dependency injector from a configuration file
+    """
+
+    def __init__(self, cache_path=None):
+        """
+        :param cache_path: Path of the file caching the validated configuration
+        :type cache_path: string
+        """
+        self._logger = logging.getLogger(__name__)
+        self._cache_path = cache_path
+
+    def load(self, path, injector=None):
+        """
+        Register the services described in the configuration file
+
+        :param path: Path of the ``.json`` or ``.toml`` configuration file
+        :type path: string
+        :param injector: The dependency injector to complete, a new one is created by default
+        :type injector: DependencyInjector
+        :return: The configured dependency injector
+        :rtype: DependencyInjector
+        """
+        try:
+            with open(path, 'rb') as configuration_file:
+                content = configuration_file.read()
+        except OSError as error:
+            raise ConfigurationError(
+                "Can't read the configuration file {0}: {1}".format(path, error)
+            )
+        digest = hashlib.sha1(content).hexdigest()
+
+        configuration = self._read_cache(digest)
+        if configuration is None:
+            configuration = self.validate(self._parse(path, content))
+            self._write_cache(digest, configuration)
+        else:
+            self._logger.debug("Configuration %s loaded from cache", path)
+
+        if injector is None:
+            injector = DependencyInjector()
+        self._apply(configuration, injector)
+        return injector
+
+    def validate(self, content):
+        """
+        Validate the parsed configuration and normalize it into plain tuples
+
+        :param content: The parsed configuration file
+        :type content: dict
+        :return: The services and the bindings
+        :rtype: tuple
+        """
+        if not isinstance(content, dict):
+            raise ConfigurationError("The configuration must be an object")
+        unknown_keys = set(content) - {'services', 'bindings'}
+        if unknown_keys:
+            raise ConfigurationError(
+                "Unknown configuration keys: {0}".format(', '.join(sorted(unknown_keys)))
+            )
+
+        services = list()
+        definitions = self._get_mapping(content, 'services', 'configuration')
+        for identifier, definition in definitions.items():
+            services.append(self._validate_service(identifier, definition))
+        bindings = list()
+        implementations = self._get_mapping(content, 'bindings', 'configuration')
+        for interface, implementation in implementations.items():
+            if not isinstance(implementation, str):
+                raise ConfigurationError(
+                    "Interface {0} must be bound to a service ID".format(interface)
+                )
+            self._check_path(interface, 'bindings')
+            bindings.append((interface, implementation))
+        return tuple(services), tuple(bindings)
+
+    def _validate_service(self, identifier, definition):
+        """
+        :return: (identifier, kind, path, lifetime, options, tags, profiles, memoize, arguments)
+            tuple
+        :rtype: tuple
+        """
+        if not isinstance(definition, dict):
+            raise ConfigurationError("Service {0} must be an object".format(identifier))
+        unknown_keys = set(definition) - SERVICE_KEYS
+        if unknown_keys:
+            raise ConfigurationError("Unknown keys for service {0}: {1}".format(
+                identifier,
+                ', '.join(sorted(unknown_keys))
+            ))
+        if ('class' in definition) == ('instance' in definition):
+            raise ConfigurationError(
+                "Service {0} must define either a class or an instance".format(identifier)
+            )
+        kind = 'class' if 'class' in definition else 'instance'
+        path = definition[kind]
+        self._check_path(path, identifier)
+
+        lifetime = definition.get('lifetime', 'transient')
+        if lifetime not in LIFETIMES:
+            raise ConfigurationError(
+                "Unknown lifetime {0} for service {1}".format(lifetime, identifier)
+            )
+        if kind == 'instance' and lifetime != 'transient':
+            raise ConfigurationError(
+                "The instance of service {0} can't have a lifetime".format(identifier)
+            )
+        options = self._get_mapping(definition, 'options', identifier)
+        unknown_options = set(options) - LIFETIMES[lifetime]
+        if unknown_options:
+            raise ConfigurationError("Unknown options for service {0}: {1}".format(
+                identifier,
+                ', '.join(sorted(unknown_options))
+            ))
+
+        tags = self._get_strings(definition, 'tags', identifier)
+        profiles = self._get_strings(definition, 'profiles', identifier)
+        memoize = self._validate_memoize(identifier, kind, definition)
+
+        arguments = list()
+        for name, value in self._get_mapping(definition, 'arguments', identifier).items():
+            arguments.append((name,) + self._validate_value(value))
+        return (
+            identifier, kind, path, lifetime, dict(options), tags, profiles, memoize,
+            tuple(arguments)
+        )
+
+    def _validate_memoize(self, identifier, kind, definition):
+        if 'memoize' not in definition:
+            return None
+        if kind == 'instance':
+            raise ConfigurationError(
+                "The methods of the instance of service {0} can't be memoized".format(identifier)
+            )
+        memoize = self._get_mapping(definition, 'memoize', identifier)
+        unknown_keys = set(memoize) - MEMOIZE_KEYS
+        if unknown_keys:
+            raise ConfigurationError("Unknown memoize keys for service {0}: {1}".format(
+                identifier,
+                ', '.join(sorted(unknown_keys))
+            ))
+        memoize = dict(memoize)
+        memoize['methods'] = self._get_strings(memoize, 'methods', identifier)
+        return memoize
+
+    @staticmethod
+    def _validate_value(value):
+        """
+        :return: (kind, value) tuple, the kind being value, service, class or tag
+        :rtype: tuple
+        """
+        if isinstance(value, dict) and len(value) == 1:
+            key, reference = next(iter(value.items()))
+            if key in REFERENCE_KEYS:
+                if not isinstance(reference, str):
+                    raise ConfigurationError("{0} must be followed by a service ID".format(key))
+                return REFERENCE_KEYS[key], reference
+        return 'value', value
+
+    @staticmethod
+    def _get_mapping(definition, key, owner):
+        mapping = definition.get(key, dict())
+        if not isinstance(mapping, dict):
+            raise ConfigurationError("The {0} of {1} must be an object".format(key, owner))
+        return mapping
+
+    @staticmethod
+    def _get_strings(definition, key, owner):
+        strings = definition.get(key, list())
+        if not isinstance(strings, list) or not all(isinstance(string, str) for string in strings):
+            raise ConfigurationError(
+                "The {0} of service {1} must be a list of strings".format(key, owner)
+            )
+        return tuple(strings)
+
+    @staticmethod
+    def _check_path(path, owner):
+        if not isinstance(path, str) or not path.partition(':')[2]:
+            raise ConfigurationError(
+                "{0}: {1!r} must be formatted as module:attribute".format(owner, path)
+            )
+
+    @staticmethod
+    def _parse(path, content):
+        if path.endswith('.toml'):
+            if tomllib is None:
+                raise ConfigurationError("TOML configuration files require python 3.11 or tomli")
+            try:
+                return tomllib.loads(content.decode('utf-8'))
+            except (ValueError, UnicodeDecodeError) as error:
+                raise ConfigurationError("Invalid configuration file {0}: {1}".format(path, error))
+        try:
+            return json.loads(content.decode('utf-8'))
+        except (ValueError, UnicodeDecodeError) as error:
+            raise ConfigurationError("Invalid configuration file {0}: {1}".format(path, error))
+
+    def _apply(self, configuration, injector):
+        services, bindings = configuration
+        for service_definition in services:
+            identifier, kind, path, lifetime, options, tags, profiles, memoize, arguments = (
+                service_definition
+            )
+            try:
+                subject = load_object(path)
+            except (ImportError, AttributeError) as error:
+                raise ConfigurationError(
+                    "Can't load {0} for service {1}: {2}".format(path, identifier, error)
+                )
+            profiles = set(profiles) or None
+            if kind == 'instance':
+                injector.register(subject, identifier, tags=list(tags), profiles=profiles)
+                continue
+            interceptors = [MemoizingInterceptor(**memoize)] if memoize else None
+            method = 'register' if lifetime == 'transient' else 'register_' + lifetime
+            register = getattr(injector, method)
+            service = register(subject, identifier, tags=list(tags), profiles=profiles,
+                               interceptors=interceptors, **options)
+            service.add_arguments(**{
+                name: self._get_argument(argument_kind, value)
+                for name, argument_kind, value in arguments
+            })
+        for interface, implementation in bindings:
+            try:
+                injector.bind(load_object(interface), implementation)
+            except (ImportError, AttributeError) as error:
+                raise ConfigurationError(
+                    "Can't load the interface {0}: {1}".format(interface, error)
+                )
+        self._logger.debug("%d services configured", len(services))
+
+    @staticmethod
+    def _get_argument(kind, value):
+        if kind == 'service':
+            return Reference(value)
+        if kind == 'class':
+            return Reference(value, return_class=True)
+        if kind == 'tag':
+            return Reference(value, multi=True)
+        return value
+
+    def _read_cache(self, digest):
+        if self._cache_path is None:
+            return None
+        try:
+            with open(self._cache_path, 'rb') as cache_file:
+                cache_format, version, cached_digest, configuration = marshal.load(cache_file)
+            # Caches written by other pyjection versions may have another layout
+            if cache_format != CACHE_FORMAT:
+                return None
+            services, bindings = configuration
+            if any(len(service) != SERVICE_FIELDS for service in services):
+                return None
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        # The marshal format is not stable from one interpreter version to another
+        if version != sys.version or cached_digest != digest:
+            return None
+        return configuration
+
+    def _write_cache(self, digest, configuration):
+        if self._cache_path is None:
+            return
+        try:
+            data = marshal.dumps((CACHE_FORMAT, sys.version, digest, configuration))
+        except ValueError:
+            # Values such as TOML dates can't be cached
+            self._logger.debug("Configuration can't be cached")
+            return
+        directory = os.path.dirname(os.path.abspath(self._cache_path))
+        handle, temporary_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(handle, 'wb') as cache_file:
+            cache_file.write(data)
+        os.replace(temporary_path, self._cache_path)
@@ -1,12 +1,31 @@
+import contextlib
+import contextvars
+import functools
+import inspect
 import logging
-from collections import OrderedDict
+import os
+import threading
+import time
+import weakref
+from collections import namedtuple
 from inspect import Parameter
-from inspect import signature
 
-from pyjection.errors import ServiceNotFoundError, ArgumentNotFoundError
+from pyjection.errors import ServiceNotFoundError, ArgumentNotFoundError, CircularDependencyError
 from pyjection.helper import get_service_subject_identifier
+from pyjection.lifecycle import LifecycleManager
+from pyjection.lifetimes import PooledLifetime, ThreadLocalLifetime, MultitonLifetime
+from pyjection.lifetimes import RefreshingLifetime, WeakLifetime
+from pyjection.resolvers import VALUE, SERVICE, CLASS, MULTI
 from pyjection.resolvers import ServiceResolver, NameResolver, TypingResolver
+from pyjection.scope import Scope
 from pyjection.service import Service
+from pyjection.signature_cache import SignatureCache
+
+CallPlan = namedtuple('CallPlan', ['registry_version', 'parameters', 'resolutions'])
+FactoryPlan = namedtuple(
+    'FactoryPlan',
+    ['registry_version', 'constants', 'resolutions', 'parameters', 'runtime_parameters']
+)
 
 
 class DependencyInjector(object):
@@ -16,10 +35,61 @@ class DependencyInjector(object):
     This is the interface that should be used to get objects from the dependency injector.
     """
 
-    def __init__(self, resolvers=None):
+    def __init__(self, resolvers=None, signature_cache=None, index_mro=False, memory_tracker=None,
+                 sampler=None, tracer=None, executor=None):
+        """
+        :param resolvers: Resolvers used to retrieve the arguments of the services
+        :type resolvers: list
+        :param signature_cache: Cache of the analyzed ``__init__`` signatures,
+            a ``FileSignatureCache`` may be given to persist them between two processes
+        :type signature_cache: SignatureCache
+        :param index_mro: Whether registered classes are indexed by their bases,
+            a base implemented by a single registered class then resolves to it
+        :type index_mro: bool
+        :param memory_tracker: Tracker recording the live instances and the allocations
+            of each service
+        :type memory_tracker: MemoryTracker
+        :param sampler: Sampler capturing the resolutions slower than its threshold
+        :type sampler: SlowResolutionSampler
+        :param tracer: Tracer emitting a span for each retrieval of a service
+        :type tracer: Tracer
+        :param executor: Thread pool used to build the independent dependencies of a service
+            concurrently
+        :type executor: concurrent.futures.Executor
+        """
         self._logger = logging.getLogger(__name__)
+        # The registries read when retrieving services are never mutated in place:
+        # writers copy them and swap the new version under this lock so that readers need no lock
+        self._lock = threading.RLock()
+        self._singleton_locks = dict()
         self._services = dict()
         self._singletons = dict()
+        self._dependencies = dict()
+        self._dependents = dict()
+        self._tags = dict()
+        self._service_tags = dict()
+        self._bindings = dict()
+        self._index_mro = index_mro
+        self._implementations = dict()
+        self._mro_index = dict()
+        self._registry_version = 0
+        # Registrations depending on profiles or conditions,
+        # until the dependency injector is finalized
+        self._pending_services = list()
+        self._active_profiles = None
+        # Functions are held weakly, e.g. closures created for each request
+        self._call_plans = weakref.WeakKeyDictionary()
+        self._local = threading.local()
+        self._current_scope = contextvars.ContextVar('pyjection_scope', default=None)
+        self._lifecycle = LifecycleManager()
+        self._memory_tracker = memory_tracker
+        self._sampler = sampler
+        self._tracer = tracer
+        self._executor = executor
+        self._parallel_plans = dict()
+        self._signature_cache = signature_cache
+        if signature_cache is None:
+            self._signature_cache = SignatureCache()
         self._resolvers = resolvers
         if not resolvers:
             self._resolvers = [
@@ -28,7 +98,8 @@ class DependencyInjector(object):
                 NameResolver(),
             ]
 
-    def register(self, service_subject, identifier=None):
+    def register(self, service_subject, identifier=None, tags=None, profiles=None, condition=None,
+                 interceptors=None):
         """
         Register a new service in the dependency injector
 
@@ -42,6 +113,15 @@ class DependencyInjector(object):
         :type service_subject: mixed
         :param identifier: The identifier used to later retrieve a service instance
         :type identifier: string
+        :param tags: Tags (strings or classes) under which the service is collected, see get_all
+        :type tags: list
+        :param profiles: Profiles in which the service is registered, see finalize
+        :type profiles: set
+        :param condition: Callable without argument returning whether the service is registered,
+            evaluated once by finalize
+        :type condition: callable
+        :param interceptors: Interceptors applied to each new instance, see Service.add_interceptor
+        :type interceptors: list
 
         :return: Return the newly created service entry
         :rtype: Service
@@ -49,7 +129,7 @@ class DependencyInjector(object):
         if identifier is None:
             identifier = get_service_subject_identifier(service_subject)
         service = Service(service_subject)
-        self._services[identifier] = service
+        self._register_service(identifier, service, tags, profiles, condition, interceptors)
         self._logger.debug(
             "Class %s registered with identifier %s",
             str(service_subject),
@@ -57,7 +137,8 @@ class DependencyInjector(object):
         )
         return service
 
-    def register_singleton(self, service_subject, identifier=None):
+    def register_singleton(self, service_subject, identifier=None, tags=None, profiles=None,
+                           condition=None, interceptors=None):
         """
         Register a new singleton service in in the dependency injector
 
@@ -71,6 +152,15 @@ class DependencyInjector(object):
         :type service_subject: mixed
         :param identifier: The identifier used to later retrieve a service singleton
         :type identifier: string
+        :param tags: Tags (strings or classes) under which the service is collected, see get_all
+        :type tags: list
+        :param profiles: Profiles in which the service is registered, see finalize
+        :type profiles: set
+        :param condition: Callable without argument returning whether the service is registered,
+            evaluated once by finalize
+        :type condition: callable
+        :param interceptors: Interceptors applied to each new instance, see Service.add_interceptor
+        :type interceptors: list
 
         :return: Return the newly created dependency entry
         :rtype: Service
@@ -79,7 +169,7 @@ class DependencyInjector(object):
             identifier = get_service_subject_identifier(service_subject)
         service = Service(service_subject)
         service.is_singleton = True
-        self._services[identifier] = service
+        self._register_service(identifier, service, tags, profiles, condition, interceptors)
         self._logger.debug(
             "Class %s registered as singleton with identifier %s",
             str(service_subject),
@@ -87,39 +177,589 @@ class DependencyInjector(object):
         )
         return service
 
-    def get(self, identifier):
+    def register_pooled(self, service_subject, identifier=None, max_size=10, idle_timeout=None,
+                        timeout=None, tags=None, profiles=None, condition=None, interceptors=None):
+        """
+        Register a new pooled service in the dependency injector
+
+        Instances are checked out of a bounded pool and returned to it
+        when the scope they have been retrieved in is exited,
+        or with the release method.
+
+        :param service_subject: The class to instantiate
+        :type service_subject: type
+        :param identifier: The identifier used to later retrieve a service instance
+        :type identifier: string
+        :param max_size: Maximum number of instances in the pool
+        :type max_size: int
+        :param idle_timeout: Seconds after which an idle instance is disposed
+        :type idle_timeout: float
+        :param timeout: Maximum number of seconds to wait for an available instance
+        :type timeout: float
+        :param tags: Tags (strings or classes) under which the service is collected, see get_all
+        :type tags: list
+        :param profiles: Profiles in which the service is registered, see finalize
+        :type profiles: set
+        :param condition: Callable without argument returning whether the service is registered,
+            evaluated once by finalize
+        :type condition: callable
+        :param interceptors: Interceptors applied to each new instance, see Service.add_interceptor
+        :type interceptors: list
+
+        :return: Return the newly created service entry
+        :rtype: Service
+        """
+        if identifier is None:
+            identifier = get_service_subject_identifier(service_subject)
+        service = Service(service_subject)
+        service.lifetime = PooledLifetime(max_size, idle_timeout, timeout)
+        self._register_service(identifier, service, tags, profiles, condition, interceptors)
+        self._logger.debug(
+            "Class %s registered as pooled with identifier %s",
+            str(service_subject),
+            identifier
+        )
+        return service
+
+    def register_thread_local(self, service_subject, identifier=None, per_task=False, tags=None,
+                              profiles=None, condition=None, interceptors=None):
+        """
+        Register a new service instantiated once per thread in the dependency injector
+
+        Instances are disposed when their thread exits.
+
+        :param service_subject: The class to instantiate
+        :type service_subject: type
+        :param identifier: The identifier used to later retrieve a service instance
+        :type identifier: string
+        :param per_task: Whether instances retrieved within an asyncio task
+            are bound to the task instead of the thread
+        :type per_task: bool
+        :param tags: Tags (strings or classes) under which the service is collected, see get_all
+        :type tags: list
+        :param profiles: Profiles in which the service is registered, see finalize
+        :type profiles: set
+        :param condition: Callable without argument returning whether the service is registered,
+            evaluated once by finalize
+        :type condition: callable
+        :param interceptors: Interceptors applied to each new instance, see Service.add_interceptor
+        :type interceptors: list
+
+        :return: Return the newly created service entry
+        :rtype: Service
+        """
+        if identifier is None:
+            identifier = get_service_subject_identifier(service_subject)
+        service = Service(service_subject)
+        service.lifetime = ThreadLocalLifetime(per_task)
+        self._register_service(identifier, service, tags, profiles, condition, interceptors)
+        self._logger.debug(
+            "Class %s registered as thread local with identifier %s",
+            str(service_subject),
+            identifier
+        )
+        return service
+
+    def register_multiton(self, service_subject, identifier=None, max_size=None, ttl=None,
+                          tags=None, profiles=None, condition=None, interceptors=None):
+        """
+        Register a new service instantiated once per set of runtime arguments
+
+        .. code:: python
+
+            injector.register_multiton(Database, max_size=100)
+            injector.get(Database, shard=3)
+
+        :param service_subject: The class to instantiate
+        :type service_subject: type
+        :param identifier: The identifier used to later retrieve a service instance
+        :type identifier: string
+        :param max_size: Maximum number of cached instances,
+            the least recently used is evicted first
+        :type max_size: int
+        :param ttl: Seconds after which an instance is rebuilt
+        :type ttl: float
+        :param tags: Tags (strings or classes) under which the service is collected, see get_all
+        :type tags: list
+        :param profiles: Profiles in which the service is registered, see finalize
+        :type profiles: set
+        :param condition: Callable without argument returning whether the service is registered,
+            evaluated once by finalize
+        :type condition: callable
+        :param interceptors: Interceptors applied to each new instance, see Service.add_interceptor
+        :type interceptors: list
+
+        :return: Return the newly created service entry
+        :rtype: Service
+        """
+        if identifier is None:
+            identifier = get_service_subject_identifier(service_subject)
+        service = Service(service_subject)
+        service.lifetime = MultitonLifetime(max_size, ttl)
+        self._register_service(identifier, service, tags, profiles, condition, interceptors)
+        self._logger.debug(
+            "Class %s registered as multiton with identifier %s",
+            str(service_subject),
+            identifier
+        )
+        return service
+
+    def register_refreshing(self, service_subject, identifier=None, ttl=60, refresh_ahead=0,
+                            tags=None, profiles=None, condition=None, interceptors=None):
+        """
+        Register a new singleton service rebuilt in the background once its time to live has expired
+
+        The previous instance keeps being returned until the new one has been built,
+        it is then disposed.
+
+        .. code:: python
+
+            injector.register_refreshing(Credentials, ttl=300, refresh_ahead=30)
+
+        :param service_subject: The class to instantiate
+        :type service_subject: type
+        :param identifier: The identifier used to later retrieve a service instance
+        :type identifier: string
+        :param ttl: Seconds after which the instance is rebuilt
+        :type ttl: float
+        :param refresh_ahead: Seconds before the expiration at which the rebuild starts
+        :type refresh_ahead: float
+        :param tags: Tags (strings or classes) under which the service is collected, see get_all
+        :type tags: list
+        :param profiles: Profiles in which the service is registered, see finalize
+        :type profiles: set
+        :param condition: Callable without argument returning whether the service is registered,
+            evaluated once by finalize
+        :type condition: callable
+        :param interceptors: Interceptors applied to each new instance, see Service.add_interceptor
+        :type interceptors: list
+
+        :return: Return the newly created service entry
+        :rtype: Service
+        """
+        if identifier is None:
+            identifier = get_service_subject_identifier(service_subject)
+        service = Service(service_subject)
+        service.lifetime = RefreshingLifetime(ttl, refresh_ahead)
+        self._register_service(identifier, service, tags, profiles, condition, interceptors)
+        self._logger.debug(
+            "Class %s registered as refreshing with identifier %s",
+            str(service_subject),
+            identifier
+        )
+        return service
+
+    def register_weak_singleton(self, service_subject, identifier=None, idle_timeout=None,
+                                tags=None, profiles=None, condition=None, interceptors=None):
+        """
+        Register a new singleton service held weakly, rebuilt when needed once it has been collected
+
+        The instance is only kept alive by the objects using it and, with an idle timeout,
+        until it hasn't been retrieved for that many seconds.
+
+        .. code:: python
+
+            injector.register_weak_singleton(LanguageModel, idle_timeout=600)
+
+        :param service_subject: The class to instantiate
+        :type service_subject: type
+        :param identifier: The identifier used to later retrieve a service instance
+        :type identifier: string
+        :param idle_timeout: Seconds during which the instance is kept alive after being retrieved
+        :type idle_timeout: float
+        :param tags: Tags (strings or classes) under which the service is collected, see get_all
+        :type tags: list
+        :param profiles: Profiles in which the service is registered, see finalize
+        :type profiles: set
+        :param condition: Callable without argument returning whether the service is registered,
+            evaluated once by finalize
+        :type condition: callable
+        :param interceptors: Interceptors applied to each new instance, see Service.add_interceptor
+        :type interceptors: list
+
+        :return: Return the newly created service entry
+        :rtype: Service
+        """
+        if identifier is None:
+            identifier = get_service_subject_identifier(service_subject)
+        service = Service(service_subject)
+        service.lifetime = WeakLifetime(idle_timeout)
+        self._register_service(identifier, service, tags, profiles, condition, interceptors)
+        self._logger.debug(
+            "Class %s registered as weak singleton with identifier %s",
+            str(service_subject),
+            identifier
+        )
+        return service
+
+    def finalize(self, profiles=None):
+        """
+        Register the services whose profiles are active and whose condition is fulfilled,
+        the other alternatives are dropped.
+
+        Profiles and conditions are evaluated only once, the services later registered
+        with profiles or conditions are evaluated when they are registered.
+        An active service replaces the service registered without profile nor condition
+        under the same identifier.
+        When registrations are pending, the dependency injector is finalized with the profiles
+        of the ``PYJECTION_PROFILES`` environment variable as soon as its registry is read,
+        e.g. by get or get_identifiers, so that it never changes while services are retrieved.
+
+        :param profiles: The active profiles, by default the comma separated
+            profiles of the ``PYJECTION_PROFILES`` environment variable
+        :type profiles: set
+        """
+        if profiles is None:
+            profiles = os.environ.get('PYJECTION_PROFILES', '').split(',')
+        active_profiles = set(profile.strip() for profile in profiles if profile.strip())
+        with self._lock:
+            for identifier, service, tags, service_profiles, condition in self._pending_services:
+                if self._is_active(active_profiles, service_profiles, condition):
+                    self._add_service(identifier, service, tags)
+                else:
+                    self._logger.debug("Inactive service with ID %s dropped", identifier)
+            # Set last so that readers don't skip the finalization while services are being added
+            self._pending_services = list()
+            self._active_profiles = active_profiles
+        self._logger.debug("Dependency injector finalized with profiles %s", self._active_profiles)
+
+    def get(self, identifier, **arguments):
         """
         Instantiate and retrieve the service matching this identifier
 
         If the service has been self has a singleton the same service object
         will be return each time this service is asked
 
+        Runtime arguments take precedence over the service arguments.
+        They are ignored when an existing instance is returned (e.g. singletons).
+
         :param identifier: The identifier or the class to retrieve
         :type identifier: mixed
+        :param arguments: Runtime arguments used to instantiate the service
         :return: The instantiated object
         :rtype: mixed
         """
-        identifier = self._get_string_identifier(identifier)
+        identifier = self.resolve_identifier(identifier)
 
         self._validate_service_name(identifier)
 
         service = self._services[identifier]
-        instance = self._get_singleton(identifier, service)
-        if instance:
-            self._logger.debug("Return singleton with ID %s", identifier)
-            return instance
+        resolution_stack = self._get_resolution_stack()
+        if resolution_stack:
+            self._add_dependency(resolution_stack[-1], identifier)
 
-        instance = self._get_instance(service)
-        self._set_singleton(identifier, instance, service)
-        self._logger.debug("Return instance with ID %s", identifier)
-        return instance
+        if self._tracer is None:
+            return self._retrieve(identifier, service, arguments)
+        return self._trace(identifier, service, self._retrieve, identifier, service, arguments)
+
+    async def aget(self, identifier, **arguments):
+        """
+        Asynchronous variant of get
+
+        Lifetimes that may have to wait for an instance (e.g. pools)
+        wait without blocking the event loop.
+
+        :param identifier: The identifier or the class to retrieve
+        :type identifier: mixed
+        :param arguments: Runtime arguments used to instantiate the service
+        :return: The instantiated object
+        :rtype: mixed
+        """
+        identifier = self.resolve_identifier(identifier)
+        self._validate_service_name(identifier)
+        service = self._services[identifier]
+        if service.lifetime is not None:
+            return await service.lifetime.aget(identifier, service, self, arguments)
+        return self.get(identifier, **arguments)
+
+    def release(self, identifier, instance):
+        """
+        Return a pooled instance retrieved outside of a scope to its pool
+
+        :param identifier: The identifier or the class of the service
+        :type identifier: mixed
+        :param instance: The instance to release
+        :type instance: mixed
+        """
+        service = self.get_service(identifier)
+        if isinstance(service.lifetime, PooledLifetime):
+            service.lifetime.release(instance, service, self)
+
+    def scope(self):
+        """
+        Create a new scope, to use as a (asynchronous) context manager
+
+        Pooled instances retrieved within the scope are released when it is exited.
+
+        :rtype: Scope
+        """
+        return Scope(self)
+
+    def get_current_scope(self):
+        """
+        Return the innermost scope entered in the current context
+
+        :return: The current scope or None
+        :rtype: Scope
+        """
+        return self._current_scope.get()
+
+    def call(self, function, *args, **kwargs):
+        """
+        Call the function, injecting the parameters that are not given
+
+        The way each parameter is resolved is computed once per function
+        and computed again only when new services are registered.
+
+        :param function: The function or method to call
+        :type function: callable
+        :return: The value returned by the function
+        :rtype: mixed
+        """
+        plan = self._get_call_plan(function)
+        service = Service(function) if plan.resolutions is None else None
+        arguments = dict()
+        positional_count = 0
+        for index, method_parameter in enumerate(plan.parameters):
+            if method_parameter.kind in [Parameter.POSITIONAL_ONLY,
+                                         Parameter.POSITIONAL_OR_KEYWORD]:
+                positional_count += 1
+                if positional_count <= len(args):
+                    continue
+            if method_parameter.name in kwargs:
+                continue
+            if plan.resolutions is None:
+                argument = self._get_argument(service, method_parameter)
+            elif plan.resolutions[index] is None:
+                argument = self._handle_unresolved_argument(method_parameter)
+            else:
+                argument = self._materialize(plan.resolutions[index])
+            if argument is not None:
+                arguments[method_parameter.name] = argument
+        arguments.update(kwargs)
+        return function(*args, **arguments)
+
+    def inject(self, function):
+        """
+        Decorator injecting the parameters of the function that are not given
+
+        .. code:: python
+
+            @injector.inject
+            def handler(request, repository: Repository):
+                pass
+
+            handler(request)
+
+        :param function: The function or method to decorate
+        :type function: callable
+        :rtype: callable
+        """
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            return self.call(function, *args, **kwargs)
+        return wrapper
+
+    def factory_for(self, subject, runtime=None):
+        """
+        Return a factory building instances of the class from injected and runtime arguments
+
+        The way each injected parameter is resolved is computed once,
+        values and classes are resolved once and services are retrieved on each call
+        according to their lifetime. The runtime parameters are given to the factory,
+        positionally in the signature order or by name. They are decided when the factory
+        is created, later registrations only change how the other parameters are injected.
+
+        .. code:: python
+
+            create_handler = injector.factory_for(RequestHandler)
+            handler = create_handler(request_context)
+
+        :param subject: The class, or the identifier of a registered service
+        :type subject: mixed
+        :param runtime: Names of the parameters given to the factory,
+            by default the required parameters that can't be resolved
+        :type runtime: list
+        :rtype: callable
+        """
+        if isinstance(subject, str) or self.has_service(subject):
+            identifier = self.resolve_identifier(subject)
+            service = self.get_service(identifier)
+        else:
+            identifier = get_service_subject_identifier(subject)
+            service = Service(subject)
+        plans = [self._get_factory_plan(service, set(runtime) if runtime is not None else None)]
+        runtime_parameters = plans[0].runtime_parameters
+
+        def generate_arguments(args, kwargs):
+            plan = plans[0]
+            if plan.registry_version != self._registry_version:
+                plan = plans[0] = self._get_factory_plan(service, set(runtime_parameters))
+            arguments = dict(plan.constants)
+            for name, resolution in plan.resolutions:
+                if name not in kwargs:
+                    arguments[name] = self._materialize(resolution)
+            for method_parameter in plan.parameters:
+                if method_parameter.name not in kwargs:
+                    argument = self._get_argument(service, method_parameter)
+                    if argument is not None:
+                        arguments[method_parameter.name] = argument
+            arguments.update(zip(runtime_parameters, args))
+            arguments.update(kwargs)
+            return arguments
+
+        def factory(*args, **kwargs):
+            if len(args) > len(runtime_parameters):
+                raise TypeError(
+                    "The factory takes {0} positional arguments but {1} were given".format(
+                        len(runtime_parameters),
+                        len(args)
+                    )
+                )
+            build = functools.partial(generate_arguments, args, kwargs)
+            if self._tracer is None:
+                return self._create_instance(identifier, service, generate_arguments=build)
+            return self._trace(
+                identifier, service, self._create_instance, identifier, service, None, build
+            )
+
+        return factory
+
+    def warm(self, identifiers=None):
+        """
+        Build the singletons, concurrently when an executor has been given
+
+        :param identifiers: Identifiers or classes of the services to build,
+            by default all the singletons
+        :type identifiers: list
+        """
+        if identifiers is None:
+            self._finalize_pending()
+            identifiers = [
+                identifier
+                for identifier, service in self._services.items()
+                if service.is_singleton is True and service.type == 'class'
+            ]
+        tasks = [functools.partial(self.get, identifier) for identifier in identifiers]
+        if self._executor is None or len(tasks) < 2:
+            for task in tasks:
+                task()
+        else:
+            self._run_concurrently(tasks)
+
+    def get_all(self, tag):
+        """
+        Retrieve the instances of all the services registered under the tag,
+        in registration order
+
+        :param tag: The tag or the class the services are registered under
+        :type tag: mixed
+        :return: The instantiated objects
+        :rtype: list
+        """
+        self._finalize_pending()
+        tag = self._get_string_identifier(tag)
+        return [self.get(identifier) for identifier in self._tags.get(tag, ())]
+
+    def get_tagged_identifiers(self, tag):
+        """
+        Return the identifiers of the services registered under the tag, in registration order
+
+        :param tag: The tag or the class
+        :type tag: mixed
+        :rtype: list
+        """
+        self._finalize_pending()
+        return list(self._tags.get(self._get_string_identifier(tag), ()))
+
+    def has_tag(self, tag):
+        """
+        Check if at least one service has been registered under the tag
+
+        :param tag: The tag or the class
+        :type tag: mixed
+        :rtype: boolean
+        """
+        self._finalize_pending()
+        return self._get_string_identifier(tag) in self._tags
 
     def get_uninstantiated(self, identifier):
-        identifier = self._get_string_identifier(identifier)
+        identifier = self.resolve_identifier(identifier)
         self._validate_service_name(identifier)
         service = self._services[identifier]
         return service.subject
 
+    def get_service(self, identifier):
+        """
+        Retrieve the service entry matching this identifier
+
+        :param identifier: The identifier or the class of the service
+        :type identifier: mixed
+        :return: The service entry
+        :rtype: Service
+        """
+        identifier = self.resolve_identifier(identifier)
+        self._validate_service_name(identifier)
+        return self._services[identifier]
+
+    def get_identifiers(self):
+        """
+        Return the identifiers of all the registered services
+
+        :rtype: list
+        """
+        self._finalize_pending()
+        return list(self._services)
+
+    def get_construction_plan(self, identifier):
+        """
+        Describe how the service matching this identifier would be instantiated,
+        without instantiating anything.
+
+        The plan contains a resolution for each parameter of the service ``__init__`` method.
+        The resolution is None when an optional parameter can't be resolved.
+
+        :param identifier: The identifier or the class of the service
+        :type identifier: mixed
+        :return: List of (parameter, resolution) tuples
+        :rtype: list
+        """
+        service = self.get_service(identifier)
+        plan = list()
+        for method_parameter in self.get_parameters(identifier):
+            plan.append((method_parameter, self._plan_argument(service, method_parameter)))
+        return plan
+
+    def get_parameters(self, identifier):
+        """
+        Return the parameters of the ``__init__`` method of the service matching this identifier
+
+        :param identifier: The identifier or the class of the service
+        :type identifier: mixed
+        :return: The parameters, none for registered instances
+        :rtype: tuple
+        """
+        service = self.get_service(identifier)
+        if service.type == 'instance':
+            return tuple()
+        return self._signature_cache.get_parameters(service.subject)
+
+    def get_resolution(self, identifier, method_parameter):
+        """
+        Describe how a parameter of the service matching this identifier would be resolved,
+        without instantiating anything.
+
+        A NotImplementedError is raised when a resolver does not support static resolution.
+
+        :param identifier: The identifier or the class of the service
+        :type identifier: mixed
+        :param method_parameter: A parameter returned by get_parameters
+        :type method_parameter: Parameter
+        :return: The resolution or None when no resolver can resolve the parameter
+        :rtype: Resolution
+        """
+        return self._find_resolution(self.get_service(identifier), method_parameter)
+
     def has_service(self, identifier):
         """
         Check if the service matching the given identifier
@@ -130,13 +770,441 @@ class DependencyInjector(object):
         :return: Whether or not the service exists
         :rtype: boolean
         """
-        if isinstance(identifier, str) is False:
-            identifier = get_service_subject_identifier(identifier)
-
-        if identifier in self._services:
+        if self.resolve_identifier(identifier) in self._services:
             return True
         return False
 
+    def bind(self, interface, implementation):
+        """
+        Bind an interface (e.g. an abstract base class) to the service implementing it
+
+        Parameters annotated with the interface then receive the implementation
+        and the implementation can be retrieved with the interface.
+
+        :param interface: The interface class or its identifier
+        :type interface: mixed
+        :param implementation: The class or the identifier of the implementation service
+        :type implementation: mixed
+        """
+        interface = self._get_string_identifier(interface)
+        implementation = self._get_string_identifier(implementation)
+        with self._lock:
+            bindings = dict(self._bindings)
+            bindings[interface] = implementation
+            self._bindings = bindings
+            self._registry_version += 1
+        self._logger.debug("Interface %s bound to %s", interface, implementation)
+
+    def resolve_identifier(self, identifier):
+        """
+        Return the identifier of the registered service matching the given identifier
+
+        Interfaces are resolved through the explicit bindings first,
+        then through the index of the registered classes by their bases.
+
+        :param identifier: Name of the service, of an interface or a class
+        :type identifier: mixed
+        :return: The identifier of the service
+        :rtype: string
+        """
+        identifier = self._get_string_identifier(identifier)
+        self._finalize_pending()
+        if identifier in self._services:
+            return identifier
+        binding = self._bindings.get(identifier)
+        if binding is not None:
+            return binding
+        return self._mro_index.get(identifier, identifier)
+
+    @contextlib.contextmanager
+    def override(self, identifier, replacement):
+        """
+        Temporarily replace the service matching this identifier, e.g. in tests
+
+        .. code:: python
+
+            with injector.override(Repository, FakeRepository()):
+                injector.get(Consumer) # Built with the fake repository
+
+        Only the singletons depending (directly or not) on the overridden service
+        are invalidated, they are restored when the context is exited.
+        Instances cached by other lifetimes are not invalidated.
+        Overrides are not thread safe and meant to be used by tests.
+
+        :param identifier: The identifier or the class of the service to override
+        :type identifier: mixed
+        :param replacement: The replacement class, instance or service
+        :type replacement: mixed
+        :return: The replacement service
+        :rtype: Service
+        """
+        identifier = self.resolve_identifier(identifier)
+        service = replacement if isinstance(replacement, Service) else Service(replacement)
+        with self._lock:
+            previous_service = self._services.get(identifier)
+            saved_singletons = self._pop_singletons(self._get_dependents(identifier))
+            services = dict(self._services)
+            services[identifier] = service
+            self._services = services
+            # Cached plans may not know about this service or hold the replaced one
+            self._registry_version += 1
+        self._logger.debug("Service with ID %s overridden", identifier)
+        try:
+            yield service
+        finally:
+            with self._lock:
+                for dependent, instance in self._pop_singletons(self._get_dependents(identifier)):
+                    self._lifecycle.untrack(instance)
+                    self._lifecycle.dispose(self._services[dependent], instance)
+                services = dict(self._services)
+                if previous_service is None:
+                    del services[identifier]
+                else:
+                    services[identifier] = previous_service
+                self._services = services
+                self._registry_version += 1
+                singletons = dict(self._singletons)
+                singletons.update(saved_singletons)
+                self._singletons = singletons
+            self._logger.debug("Service with ID %s restored", identifier)
+
+    def shutdown(self, concurrent=False):
+        """
+        Dispose the singletons created by the dependency injector
+        and the registered instances having a close callback.
+
+        Instances are disposed in reverse dependency order:
+        an instance is always disposed before the instances it depends on.
+        Singletons are created again if they are retrieved after the shutdown.
+
+        :param concurrent: Whether independent instances are disposed concurrently in threads
+        :type concurrent: bool
+        """
+        self._reset_lifetimes()
+        self._lifecycle.shutdown(self._dependencies, concurrent, self._get_registered_instances())
+
+    async def ashutdown(self, concurrent=False):
+        """
+        Same as shutdown but awaits the asynchronous close callbacks
+        and uses ``__aexit__`` for asynchronous context managers
+
+        :param concurrent: Whether independent instances are disposed concurrently
+        :type concurrent: bool
+        """
+        self._reset_lifetimes()
+        await self._lifecycle.ashutdown(
+            self._dependencies,
+            concurrent,
+            self._get_registered_instances()
+        )
+
+    def _reset_lifetimes(self):
+        with self._lock:
+            self._singletons = dict()
+        for service in self._services.values():
+            if service.lifetime is not None:
+                service.lifetime.reset()
+
+    def _get_registered_instances(self):
+        """
+        Return the registered instances to dispose
+
+        Registered instances are owned by the caller,
+        they are only disposed when a close callback has been set.
+
+        :return: List of (identifier, service, instance) tuples
+        :rtype: list
+        """
+        return [
+            (identifier, service, service.subject)
+            for identifier, service in self._services.items()
+            if service.type == 'instance' and service.close_callback is not None
+        ]
+
+    def _add_dependency(self, dependent, identifier):
+        """
+        Record that the dependent service has been built with the service matching the identifier
+
+        :param dependent: Identifier of the dependent service
+        :param identifier: Identifier of the dependency
+        :type dependent: string
+        :type identifier: string
+        """
+        dependencies = self._dependencies.get(dependent)
+        if dependencies is not None and identifier in dependencies:
+            return
+        with self._lock:
+            self._dependencies.setdefault(dependent, set()).add(identifier)
+            self._dependents.setdefault(identifier, set()).add(dependent)
+
+    def _get_dependents(self, identifier):
+        """
+        Return the identifier and the identifiers of all the services depending on it,
+        directly or not
+
+        :param identifier: The service identifier
+        :type identifier: string
+        :rtype: set
+        """
+        dependents = set()
+        pending = [identifier]
+        while pending:
+            current = pending.pop()
+            if current in dependents:
+                continue
+            dependents.add(current)
+            pending.extend(self._dependents.get(current, ()))
+        return dependents
+
+    def _pop_singletons(self, identifiers):
+        """
+        Remove the singletons of the given services
+
+        Must be called with the lock acquired.
+
+        :param identifiers: The service identifiers
+        :type identifiers: set
+        :return: List of (identifier, singleton) tuples
+        :rtype: list
+        """
+        singletons = dict(self._singletons)
+        popped = [
+            (identifier, singletons.pop(identifier))
+            for identifier in identifiers
+            if identifier in singletons
+        ]
+        self._singletons = singletons
+        return popped
+
+    def _get_singleton_lock(self, identifier):
+        lock = self._singleton_locks.get(identifier)
+        if lock is None:
+            with self._lock:
+                lock = self._singleton_locks.setdefault(identifier, threading.RLock())
+        return lock
+
+    def _get_resolution_stack(self):
+        """
+        Return the identifiers of the services being instantiated in the current thread
+
+        :rtype: list
+        """
+        try:
+            return self._local.resolution_stack
+        except AttributeError:
+            self._local.resolution_stack = list()
+            return self._local.resolution_stack
+
+    def _add_service(self, identifier, service, tags=None):
+        """
+        Store the service and update the tag memberships
+
+        :param identifier: The service identifier
+        :param service: The registered service
+        :param tags: Tags the service is registered under
+        :type identifier: string
+        :type service: Service
+        :type tags: list
+        """
+        if tags:
+            tags = [self._get_string_identifier(tag) for tag in tags]
+        with self._lock:
+            memberships = dict(self._tags)
+            for tag in self._service_tags.pop(identifier, ()):
+                members = [member for member in memberships[tag] if member != identifier]
+                if members:
+                    memberships[tag] = members
+                else:
+                    del memberships[tag]
+            if tags:
+                self._service_tags[identifier] = tags
+                for tag in tags:
+                    memberships[tag] = memberships.get(tag, list()) + [identifier]
+            services = dict(self._services)
+            services[identifier] = service
+            self._services = services
+            self._tags = memberships
+            if self._index_mro:
+                self._index_bases(identifier, service)
+            self._registry_version += 1
+
+    def _index_bases(self, identifier, service):
+        """
+        Index the service by the bases of its class
+
+        A base is only resolved to a service when a single registered class inherits from it.
+        Must be called with the lock acquired.
+
+        :param identifier: The service identifier
+        :param service: The registered service
+        :type identifier: string
+        :type service: Service
+        """
+        subject_class = service.subject if service.type == 'class' else type(service.subject)
+        bases = set(
+            get_service_subject_identifier(base)
+            for base in inspect.getmro(subject_class)[1:]
+            if base is not object
+        )
+        mro_index = dict(self._mro_index)
+        for base, implementations in self._implementations.items():
+            if identifier in implementations and base not in bases:
+                implementations.remove(identifier)
+                self._update_mro_index(mro_index, base)
+        for base in bases:
+            implementations = self._implementations.setdefault(base, list())
+            if identifier not in implementations:
+                implementations.append(identifier)
+                self._update_mro_index(mro_index, base)
+        self._mro_index = mro_index
+
+    def _update_mro_index(self, mro_index, base):
+        implementations = self._implementations[base]
+        if len(implementations) == 1:
+            mro_index[base] = implementations[0]
+        else:
+            mro_index.pop(base, None)
+
+    def _get_call_plan(self, function):
+        """
+        Return the call plan of the function, computing it if the registry changed
+
+        :param function: The function or method to call
+        :type function: callable
+        :rtype: CallPlan
+        """
+        key = getattr(function, '__func__', function)
+        is_method = inspect.ismethod(function)
+        try:
+            plans = self._call_plans.get(key)
+        except TypeError:
+            # Unhashable callable object or without weak reference support
+            key = None
+            plans = None
+        plan = plans.get(is_method) if plans is not None else None
+        if plan is not None and plan.registry_version == self._registry_version:
+            return plan
+
+        service = Service(function)
+        parameters = tuple(
+            method_parameter
+            for method_parameter in self._signature_cache.get_callable_parameters(function)
+            if method_parameter.kind not in [Parameter.VAR_POSITIONAL, Parameter.VAR_KEYWORD]
+        )
+        try:
+            resolutions = tuple(
+                self._find_resolution(service, method_parameter) for method_parameter in parameters
+            )
+        except NotImplementedError:
+            # A resolver does not support static resolution, arguments are resolved on each call
+            resolutions = None
+        # The plan must not reference the function, it would never be removed from the cache
+        plan = CallPlan(self._registry_version, parameters, resolutions)
+        if key is not None:
+            self._call_plans.setdefault(key, dict())[is_method] = plan
+        return plan
+
+    def _get_factory_plan(self, service, runtime):
+        """
+        Split the parameters of the service between the constant, the injected
+        and the runtime ones
+
+        :param service: The service built by the factory
+        :type service: Service
+        :param runtime: Names of the parameters given to the factory, None to use
+            the required parameters that can't be resolved
+        :type runtime: set
+        :rtype: FactoryPlan
+        """
+        constants = dict()
+        resolutions = list()
+        parameters = list()
+        runtime_parameters = list()
+        for method_parameter in self._signature_cache.get_parameters(service.subject):
+            if method_parameter.kind in [Parameter.VAR_POSITIONAL, Parameter.VAR_KEYWORD]:
+                continue
+            if runtime is not None and method_parameter.name in runtime:
+                runtime_parameters.append(method_parameter.name)
+                continue
+            try:
+                resolution = self._find_resolution(service, method_parameter)
+            except NotImplementedError:
+                # A resolver does not support static resolution,
+                # the argument is resolved on each call
+                parameters.append(method_parameter)
+                continue
+            if resolution is None:
+                if method_parameter.default is not Parameter.empty:
+                    continue
+                if runtime is None:
+                    runtime_parameters.append(method_parameter.name)
+                else:
+                    # Must be given by name until it can be resolved
+                    parameters.append(method_parameter)
+            elif resolution.kind in [VALUE, CLASS]:
+                constants[method_parameter.name] = self._materialize(resolution)
+            else:
+                resolutions.append((method_parameter.name, resolution))
+        return FactoryPlan(
+            self._registry_version,
+            constants,
+            tuple(resolutions),
+            tuple(parameters),
+            tuple(runtime_parameters)
+        )
+
+    def _materialize(self, resolution):
+        """
+        Retrieve the value described by a static resolution
+
+        :param resolution: The resolution of an argument
+        :type resolution: Resolution
+        :rtype: mixed
+        """
+        if resolution.kind == VALUE:
+            return resolution.value
+        if resolution.kind == CLASS:
+            return self.get_uninstantiated(resolution.value)
+        if resolution.kind == MULTI:
+            return self.get_all(resolution.value)
+        return self.get(resolution.value)
+
+    def _register_service(self, identifier, service, tags, profiles, condition, interceptors):
+        """
+        Add the service to the registry, or wait for the dependency injector to be finalized
+        if it depends on profiles or a condition
+        """
+        for interceptor in interceptors or ():
+            service.add_interceptor(interceptor)
+        if profiles is None and condition is None:
+            self._add_service(identifier, service, tags)
+            return
+        with self._lock:
+            if self._active_profiles is None:
+                self._pending_services.append(
+                    (identifier, service, tags, set(profiles or ()), condition)
+                )
+                return
+        if self._is_active(self._active_profiles, set(profiles or ()), condition):
+            self._add_service(identifier, service, tags)
+
+    def _finalize_pending(self):
+        """
+        Finalize the dependency injector from the environment before its registry is read
+        if registrations are still pending
+        """
+        if self._pending_services and self._active_profiles is None:
+            with self._lock:
+                # Another thread may have finalized it meanwhile
+                if self._active_profiles is None:
+                    self.finalize()
+
+    @staticmethod
+    def _is_active(active_profiles, profiles, condition):
+        if profiles and not profiles & active_profiles:
+            return False
+        return condition is None or bool(condition())
+
     def _validate_service_name(self, identifier):
         if not self.has_service(identifier):
             self._logger.error("No service has been declared with ID %s", identifier)
@@ -161,8 +1229,8 @@ class DependencyInjector(object):
         :return: The singleton instance or None
         :rtype: mixed
         """
-        if service.is_singleton is True and identifier in self._singletons:
-            return self._singletons[identifier]
+        if service.is_singleton is True:
+            return self._singletons.get(identifier)
         return None
 
     def _set_singleton(self, identifier, instance, service):
@@ -178,22 +1246,136 @@ class DependencyInjector(object):
         :type instance: mixed
         """
         if service.is_singleton is True:
-            self._singletons[identifier] = instance
+            with self._lock:
+                singletons = dict(self._singletons)
+                singletons[identifier] = instance
+                self._singletons = singletons
+            if service.type == 'class':
+                self._lifecycle.track(identifier, service, instance)
+
+    def _retrieve(self, identifier, service, arguments):
+        """
+        Return an instance of the service according to its lifetime
+
+        :param identifier: The service identifier
+        :param service: The service to retrieve
+        :param arguments: Runtime arguments used to instantiate the service
+        :type identifier: string
+        :type service: Service
+        :type arguments: dict
+        :return: The instantiated object
+        """
+        if service.lifetime is not None:
+            return service.lifetime.get(identifier, service, self, arguments)
+
+        instance = self._get_singleton(identifier, service)
+        if instance:
+            self._logger.debug("Return singleton with ID %s", identifier)
+            return instance
+
+        if service.is_singleton is True:
+            # A circular dependency must be detected
+            # before waiting for a lock held by another branch
+            self._check_circular_dependency(identifier, self._get_resolution_stack())
+            # Make sure the singleton is only built once when several threads ask for it
+            with self._get_singleton_lock(identifier):
+                instance = self._get_singleton(identifier, service)
+                if instance:
+                    return instance
+                instance = self._create_instance(identifier, service, arguments)
+                self._set_singleton(identifier, instance, service)
+        else:
+            instance = self._create_instance(identifier, service, arguments)
+        self._logger.debug("Return instance with ID %s", identifier)
+        return instance
 
-    def _get_instance(self, service):
+    def _create_instance(self, identifier, service, arguments=None, generate_arguments=None):
+        """
+        Build a new instance of the service, whatever its lifetime is
+
+        :param identifier: the service identifier
+        :param service: The service we need an instance for
+        :param arguments: Runtime arguments
+        :param generate_arguments: Callable without argument returning all the constructor
+            arguments, by default they are resolved from the signature of the service
+        :type identifier: string
+        :type service: Service
+        :type arguments: dict
+        :type generate_arguments: callable
+        :return: The instantiated object
+        """
+        resolution_stack = self._get_resolution_stack()
+        self._check_circular_dependency(identifier, resolution_stack)
+        resolution_stack.append(identifier)
+        if self._sampler is not None:
+            self._sampler.enter(identifier)
+        try:
+            return self._get_instance(identifier, service, arguments, generate_arguments)
+        finally:
+            resolution_stack.pop()
+            if self._sampler is not None:
+                self._sampler.exit()
+
+    def _trace(self, identifier, service, function, *args):
+        """
+        Call the function within the span of the retrieval of the service
+        """
+        span = self._tracer.start_span(identifier, service)
+        try:
+            instance = function(*args)
+        except Exception as error:
+            self._tracer.end_span(span, error)
+            raise
+        self._tracer.end_span(span)
+        return instance
+
+    def _check_circular_dependency(self, identifier, resolution_stack):
+        if identifier in resolution_stack:
+            error = "Circular dependency: {0}".format(
+                " -> ".join(resolution_stack[resolution_stack.index(identifier):] + [identifier])
+            )
+            self._logger.error(error)
+            raise CircularDependencyError(error)
+
+    def _get_instance(self, identifier, service, runtime_arguments=None, generate_arguments=None):
         """
         Return the instantiated object for the given service
 
+        :param identifier: the service identifier
         :param service: The service we need an instance for
+        :param runtime_arguments: Arguments given when retrieving the service
+        :param generate_arguments: Callable without argument returning all the constructor arguments
+        :type identifier: string
         :type service: Service
+        :type runtime_arguments: dict
+        :type generate_arguments: callable
         :return: The instantiated object
         """
         if service.type == 'instance':
             return service.subject
-        arguments = self._generate_arguments_dict(service)
-        return service.subject(**arguments)
+        if self._tracer is not None:
+            self._tracer.constructed()
+        if generate_arguments is not None:
+            arguments = generate_arguments()
+        else:
+            arguments = self._generate_arguments_dict(service, runtime_arguments)
+        if self._sampler is None:
+            return self._construct(identifier, service, arguments)
+        start = time.perf_counter()
+        instance = self._construct(identifier, service, arguments)
+        self._sampler.record_constructor(time.perf_counter() - start)
+        return instance
 
-    def _generate_arguments_dict(self, service):
+    def _construct(self, identifier, service, arguments):
+        if self._memory_tracker is not None:
+            instance = self._memory_tracker.construct(identifier, service.subject, arguments)
+        else:
+            instance = service.subject(**arguments)
+        for interceptor in service.interceptors:
+            instance = interceptor.intercept(identifier, instance)
+        return instance
+
+    def _generate_arguments_dict(self, service, runtime_arguments=None):
         """
         Generate a dict containing all the parameters values
         required to Instantiate the service.
@@ -202,45 +1384,190 @@ class DependencyInjector(object):
         retrieved.
 
         :param service: The service that needs to be instantiated
+        :param runtime_arguments: Arguments given when retrieving the service
         :type service: Service
+        :type runtime_arguments: dict
         :return: The parameters values to use to instantiate the service
         :rtype: dict
         """
         arguments = dict()
+        parameters = self._signature_cache.get_parameters(service.subject)
+        if self._executor is not None:
+            parameters = self._resolve_branches(service, parameters, runtime_arguments, arguments)
+        for method_parameter in parameters:
+            if runtime_arguments and method_parameter.name in runtime_arguments:
+                continue
+            argument = self._get_argument(service, method_parameter)
+            if argument is not None:
+                arguments[method_parameter.name] = argument
 
-        # We can't use signature on class object __init__
-        if self._is_object_init(service.subject):
-            return arguments
+        if runtime_arguments:
+            arguments.update(runtime_arguments)
+        return arguments
 
-        sig = signature(service.subject.__init__)
-        method_parameters = OrderedDict(sig.parameters)
+    def _resolve_branches(self, service, parameters, runtime_arguments, arguments):
+        """
+        Build concurrently the dependencies of the service that still have to be built
 
-        # Pop the first param since it's the self class instance
-        method_parameters.popitem(False)
+        :param service: The service that needs to be instantiated
+        :param parameters: The parameters of the service
+        :param runtime_arguments: Arguments given when retrieving the service
+        :param arguments: The arguments dict, completed with the built dependencies
+        :type service: Service
+        :type parameters: tuple
+        :type runtime_arguments: dict
+        :type arguments: dict
+        :return: The parameters left to resolve
+        :rtype: list
+        """
+        branches = list()
+        for method_parameter in self._get_parallel_parameters(service, parameters):
+            if runtime_arguments and method_parameter.name in runtime_arguments:
+                continue
+            branches.append(method_parameter)
+        if len(branches) < 2:
+            return parameters
 
-        for method_parameter in method_parameters.values():
-            argument = self._get_argument(service, method_parameter)
+        results = self._run_concurrently([
+            functools.partial(self._get_argument, service, method_parameter)
+            for method_parameter in branches
+        ])
+        for method_parameter, argument in zip(branches, results):
             if argument is not None:
                 arguments[method_parameter.name] = argument
+        return [
+            method_parameter
+            for method_parameter in parameters
+            if method_parameter not in branches
+        ]
 
-        return arguments
+    def _get_parallel_parameters(self, service, parameters):
+        """
+        Return the parameters resolved to services that haven't been built yet
 
-    @staticmethod
-    def _is_object_init(subject):
+        :rtype: list
         """
-        Check if the __init__ method for the object comes from
-        the default object class or has been overridden
+        plan = self._parallel_plans.get(service)
+        if plan is None or plan[0] != self._registry_version:
+            resolutions = list()
+            for method_parameter in parameters:
+                try:
+                    resolution = self._find_resolution(service, method_parameter)
+                except NotImplementedError:
+                    continue
+                if resolution is None or resolution.kind not in [SERVICE, MULTI]:
+                    continue
+                # Thread local instances must be retrieved in the calling thread
+                if self._is_thread_bound(resolution, set()):
+                    continue
+                resolutions.append((method_parameter, resolution))
+            plan = self._parallel_plans[service] = (self._registry_version, resolutions)
 
-        :param subject: The subject we want to check the __init__ for
-        :type subject: mixed
+        parallel_parameters = list()
+        for method_parameter, resolution in plan[1]:
+            # Existing singletons are retrieved faster than a task is scheduled
+            if (resolution.kind == SERVICE and
+                    self.resolve_identifier(resolution.value) in self._singletons):
+                continue
+            parallel_parameters.append(method_parameter)
+        return parallel_parameters
+
+    def _is_thread_bound(self, resolution, visited):
+        """
+        Check whether the resolution leads to a thread local service, directly or through
+        the dependencies built along with it
 
-        :return: Whether the __init__ method is the default on or not
+        :param resolution: The resolution of an argument
+        :param visited: The identifiers already checked
+        :type resolution: Resolution
+        :type visited: set
         :rtype: boolean
         """
-        if '__objclass__' in dir(subject.__init__) and subject.__init__.__objclass__ == object:
-            return True
+        if resolution.kind == MULTI:
+            identifiers = self._tags.get(self._get_string_identifier(resolution.value), ())
+        else:
+            identifiers = [resolution.value]
+        for identifier in identifiers:
+            identifier = self.resolve_identifier(identifier)
+            service = self._services.get(identifier)
+            if service is None or identifier in visited:
+                continue
+            visited.add(identifier)
+            if isinstance(service.lifetime, ThreadLocalLifetime):
+                return True
+            if service.type == 'instance':
+                continue
+            for method_parameter in self._signature_cache.get_parameters(service.subject):
+                try:
+                    dependency = self._find_resolution(service, method_parameter)
+                except NotImplementedError:
+                    continue
+                if (dependency is not None and dependency.kind in [SERVICE, MULTI] and
+                        self._is_thread_bound(dependency, visited)):
+                    return True
         return False
 
+    def _run_concurrently(self, tasks):
+        """
+        Run the tasks in the thread pool, the first one in the current thread
+
+        Tasks that haven't started yet when their result is needed are run in the current thread,
+        so that a full thread pool never waits for itself.
+
+        :param tasks: Callables without argument
+        :type tasks: list
+        :return: The results of the tasks
+        :rtype: list
+        """
+        branch_context = (
+            list(self._get_resolution_stack()),
+            self._tracer.get_context() if self._tracer is not None else None,
+            self._sampler.get_context() if self._sampler is not None else None,
+        )
+        futures = [
+            self._executor.submit(
+                contextvars.copy_context().run, self._run_branch, branch_context, task
+            )
+            for task in tasks[1:]
+        ]
+        results = list()
+        errors = list()
+        for task, future in zip(tasks, [None] + futures):
+            try:
+                if future is None or future.cancel():
+                    results.append(task())
+                else:
+                    results.append(future.result())
+            except Exception as error:
+                # Every task must be done before the error is raised
+                errors.append(error)
+                results.append(None)
+        if errors:
+            raise errors[0]
+        return results
+
+    def _run_branch(self, branch_context, task):
+        """
+        Run the task in a worker thread as if it was run by the thread that submitted it
+
+        The resolution stack, the spans and the sampled constructions of the submitting thread
+        are continued in the worker thread.
+        """
+        resolution_stack, tracer_context, sampler_context = branch_context
+        self._local.resolution_stack = list(resolution_stack)
+        if tracer_context is not None:
+            self._tracer.attach(tracer_context)
+        if sampler_context is not None:
+            self._sampler.attach(sampler_context)
+        try:
+            return task()
+        finally:
+            self._local.resolution_stack = list()
+            if tracer_context is not None:
+                self._tracer.detach()
+            if sampler_context is not None:
+                self._sampler.detach()
+
     def _get_argument(self, service, method_parameter):
         """
         Retrieve the argument value for the given service
@@ -252,11 +1579,63 @@ class DependencyInjector(object):
         :return: The argument value
         :rtype: mixed
         """
+        if self._sampler is not None:
+            start = time.perf_counter()
         for resolver in self._resolvers:
+            if self._tracer is not None:
+                self._tracer.resolving(resolver)
             resolved = resolver.resolve(method_parameter, service, self)
-            if resolved:
+            if resolved is not None:
+                if self._sampler is not None:
+                    self._sampler.record_argument(
+                        method_parameter.name,
+                        resolver,
+                        time.perf_counter() - start
+                    )
                 return resolved
 
+        return self._handle_unresolved_argument(method_parameter)
+
+    def _plan_argument(self, service, method_parameter):
+        """
+        Retrieve the static resolution of the argument for the given service
+
+        :param service: The service we need an argument for
+        :param method_parameter: The parameter we need the resolution for
+        :type service: Service
+        :type method_parameter: Parameter
+        :return: The resolution
+        :rtype: Resolution
+        """
+        resolution = self._find_resolution(service, method_parameter)
+        if resolution is not None:
+            return resolution
+        return self._handle_unresolved_argument(method_parameter)
+
+    def _find_resolution(self, service, method_parameter):
+        """
+        Return the static resolution of the first resolver able to resolve the argument
+
+        :param service: The service we need an argument for
+        :param method_parameter: The parameter we need the resolution for
+        :type service: Service
+        :type method_parameter: Parameter
+        :return: The resolution or None
+        :rtype: Resolution
+        """
+        for resolver in self._resolvers:
+            resolution = resolver.plan(method_parameter, service, self)
+            if resolution is not None:
+                return resolution
+        return None
+
+    def _handle_unresolved_argument(self, method_parameter):
+        """
+        Raise an exception if the parameter that couldn't be resolved is mandatory
+
+        :param method_parameter: The parameter that couldn't be resolved
+        :type method_parameter: Parameter
+        """
         # If the parameter is *args or **kwargs or has a default value
         # then we don't raise any exception
         if (method_parameter.kind in [Parameter.VAR_POSITIONAL, Parameter.VAR_KEYWORD] or
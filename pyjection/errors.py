@@ -8,3 +8,19 @@ class ServiceNotFoundError(PyjectionError):
 
 class ArgumentNotFoundError(PyjectionError):
     pass
+
+
+class CircularDependencyError(PyjectionError):
+    pass
+
+
+class CompilationError(PyjectionError):
+    pass
+
+
+class PoolTimeoutError(PyjectionError):
+    pass
+
+
+class ConfigurationError(PyjectionError):
+    pass
@@ -1,5 +1,13 @@
-import re
+import functools
+import importlib
 import inspect
+import re
+import types
+import typing
+
+UNION_TYPES = [typing.Union]
+if hasattr(types, 'UnionType'):
+    UNION_TYPES.append(types.UnionType)
 
 
 def get_service_subject_identifier(service_subject):
@@ -17,6 +25,7 @@ def get_service_subject_identifier(service_subject):
     return convert_camel_to_snake(subject_name)
 
 
+@functools.lru_cache(maxsize=None)
 def convert_camel_to_snake(value):
     """Convert string from CamelCase to snake_case
 
@@ -27,3 +36,55 @@ def convert_camel_to_snake(value):
     """
     s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', value)
     return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+
+
+def load_object(path):
+    """Load an object from its ``module:attribute`` path
+
+    :param path: Path of the object, e.g. ``app.container:injector``
+    :type path: str
+    :return: The loaded object
+    :rtype: mixed
+    """
+    module_name, _, attributes = path.partition(':')
+    if not attributes:
+        raise ValueError("The path must be formatted as module:attribute")
+    loaded = importlib.import_module(module_name)
+    for attribute in attributes.split('.'):
+        loaded = getattr(loaded, attribute)
+    return loaded
+
+
+def unwrap_annotation(annotation):
+    """Unwrap an annotation into the concrete type to inject and its qualifier
+
+    ``Optional[Repo]``, ``Repo | None`` and ``Annotated[Repo, "primary"]`` are unwrapped
+    to ``Repo``, the first string metadata of ``Annotated`` being the qualifier.
+    Unions of several types can't be unwrapped and give a None target.
+
+    :param annotation: The parameter annotation
+    :type annotation: mixed
+    :return: Tuple made of the target type and the qualifier
+    :rtype: tuple
+    """
+    qualifier = None
+    while True:
+        origin = typing.get_origin(annotation)
+        if origin is typing.Annotated:
+            if qualifier is None:
+                qualifier = next(
+                    (metadata for metadata in annotation.__metadata__ if isinstance(metadata, str)),
+                    None
+                )
+            annotation = typing.get_args(annotation)[0]
+        elif origin in UNION_TYPES:
+            arguments = [
+                argument
+                for argument in typing.get_args(annotation)
+                if argument is not type(None)
+            ]
+            if len(arguments) != 1:
+                return None, qualifier
+            annotation = arguments[0]
+        else:
+            return annotation, qualifier
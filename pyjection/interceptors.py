@@ -0,0 +1,134 @@
+"""
+Module that contains the interceptors.
+
+An interceptor is given each new instance of the services it has been registered for
+and returns the instance to inject, e.g. the same instance with some methods wrapped.
+"""
+import collections
+import functools
+import logging
+import threading
+import time
+
+_MISSING = object()
+# Separates the positional arguments from the keyword ones in the cache keys
+_KWARGS_MARK = object()
+
+
+class BaseInterceptor(object):
+    """
+    Base class for the interceptors
+    """
+
+    def intercept(self, identifier, instance):
+        """
+        Called with each new instance of the service
+
+        :param identifier: Identifier of the service
+        :type identifier: string
+        :param instance: The new instance
+        :type instance: mixed
+        :return: The instance to inject
+        :rtype: mixed
+        """
+        raise NotImplementedError('This method must be implemented')
+
+
+class MemoizingInterceptor(BaseInterceptor):
+    """
+    Cache the results of some methods of the instances.
+
+    Each instance has its own cache per method, bounded in size and in time.
+    Calls with unhashable arguments are not cached.
+    """
+
+    def __init__(self, methods, max_size=128, ttl=None):
+        """
+        :param methods: Names of the methods whose results are cached
+        :type methods: list
+        :param max_size: Maximum number of results cached per method and instance,
+            the least recently used is evicted first
+        :type max_size: int
+        :param ttl: Seconds after which a cached result expires
+        :type ttl: float
+        """
+        self._logger = logging.getLogger(__name__)
+        self._methods = list(methods)
+        self._max_size = max_size
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        # hits, misses, evictions and uncacheable calls per method
+        self._counters = {method: [0, 0, 0, 0] for method in self._methods}
+
+    def intercept(self, identifier, instance):
+        for method in self._methods:
+            function = getattr(instance, method)
+            try:
+                setattr(instance, method, self._memoize(method, function))
+            except AttributeError:
+                self._logger.warning(
+                    "Method %s of service %s can't be cached, "
+                    "its instances don't accept new attributes",
+                    method,
+                    identifier
+                )
+        return instance
+
+    def stats(self):
+        """
+        Return the hit and miss counters of each cached method
+
+        :rtype: dict
+        """
+        with self._lock:
+            stats = dict()
+            for method, (hits, misses, evictions, uncacheable) in self._counters.items():
+                stats[method] = {
+                    'hits': hits,
+                    'misses': misses,
+                    'evictions': evictions,
+                    'uncacheable': uncacheable,
+                    'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+                }
+            return stats
+
+    def _memoize(self, method, function):
+        counters = self._counters[method]
+        cache = collections.OrderedDict()
+        lock = threading.Lock()
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            key = args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items())) if kwargs else args
+            try:
+                with lock:
+                    entry = cache.get(key, _MISSING)
+                    if entry is not _MISSING and (self._ttl is None or time.monotonic() < entry[1]):
+                        cache.move_to_end(key)
+                        hit = True
+                    else:
+                        hit = False
+            except TypeError:
+                with self._lock:
+                    counters[3] += 1
+                return function(*args, **kwargs)
+            if hit:
+                with self._lock:
+                    counters[0] += 1
+                return entry[0]
+
+            result = function(*args, **kwargs)
+            expiration = None if self._ttl is None else time.monotonic() + self._ttl
+            evictions = 0
+            with lock:
+                cache[key] = (result, expiration)
+                cache.move_to_end(key)
+                while self._max_size is not None and len(cache) > self._max_size:
+                    cache.popitem(last=False)
+                    evictions += 1
+            with self._lock:
+                counters[1] += 1
+                counters[2] += evictions
+            return result
+
+        return wrapper
@@ -0,0 +1,205 @@
+"""
+Module that manages the disposal of the instances created by the dependency injector.
+
+An instance is disposed by:
+    * The close callback registered on its service with ``Service.on_close``
+    * Its ``__exit__`` (or ``__aexit__``) method if it is a context manager
+"""
+import asyncio
+import inspect
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LifecycleManager(object):
+    """
+    Keep track of the instances to dispose and dispose them in reverse dependency order
+    """
+
+    def __init__(self):
+        self._logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._instances = dict()
+
+    def track(self, identifier, service, instance):
+        """
+        Register an instance that has to be disposed on shutdown
+
+        :param identifier: Identifier of the service
+        :param service: The service the instance has been created for
+        :param instance: The instance to dispose
+        :type identifier: string
+        :type service: Service
+        :type instance: mixed
+        """
+        with self._lock:
+            self._instances[id(instance)] = (identifier, service, instance)
+
+    def untrack(self, instance):
+        """
+        Forget an instance that has already been disposed
+
+        :param instance: The tracked instance
+        :type instance: mixed
+        """
+        with self._lock:
+            self._instances.pop(id(instance), None)
+
+    def shutdown(self, dependencies, concurrent=False, registered_instances=None):
+        """
+        Dispose all the tracked instances, dependents first
+
+        :param dependencies: Dependencies of each identifier
+        :type dependencies: dict
+        :param concurrent: Whether independent instances are disposed concurrently in threads
+        :type concurrent: bool
+        :param registered_instances: Untracked (identifier, service, instance) tuples
+            created before anything else, hence disposed last
+        :type registered_instances: list
+        """
+        instances = self._pop_instances(registered_instances)
+        if not concurrent:
+            for _, service, instance in reversed(instances):
+                self.dispose(service, instance)
+            return
+        with ThreadPoolExecutor() as executor:
+            for wave in self._get_waves(instances, dependencies):
+                futures = [
+                    executor.submit(self.dispose, service, instance)
+                    for _, service, instance in wave
+                ]
+                for future in futures:
+                    future.result()
+
+    async def ashutdown(self, dependencies, concurrent=False, registered_instances=None):
+        """
+        Dispose all the tracked instances, dependents first, awaiting asynchronous callbacks
+
+        :param dependencies: Dependencies of each identifier
+        :type dependencies: dict
+        :param concurrent: Whether independent instances are disposed concurrently
+        :type concurrent: bool
+        :param registered_instances: Untracked (identifier, service, instance) tuples
+            created before anything else, hence disposed last
+        :type registered_instances: list
+        """
+        instances = self._pop_instances(registered_instances)
+        if not concurrent:
+            for _, service, instance in reversed(instances):
+                await self.adispose(service, instance)
+            return
+        for wave in self._get_waves(instances, dependencies):
+            await asyncio.gather(*[
+                self.adispose(service, instance)
+                for _, service, instance in wave
+            ])
+
+    def dispose(self, service, instance):
+        """
+        Dispose a single instance
+
+        Errors are logged so that the other instances still get disposed.
+
+        :param service: The service the instance has been created for
+        :param instance: The instance to dispose
+        :type service: Service
+        :type instance: mixed
+        """
+        try:
+            if service.close_callback is not None:
+                result = service.close_callback(instance)
+            elif hasattr(instance, '__exit__'):
+                result = instance.__exit__(None, None, None)
+            elif hasattr(instance, '__aexit__'):
+                result = instance.__aexit__(None, None, None)
+            else:
+                return
+            if inspect.isawaitable(result):
+                self._run_awaitable(result)
+        except Exception:
+            self._logger.exception("Error while disposing %s", str(instance))
+
+    async def adispose(self, service, instance):
+        """
+        Dispose a single instance, awaiting asynchronous callbacks
+
+        :param service: The service the instance has been created for
+        :param instance: The instance to dispose
+        :type service: Service
+        :type instance: mixed
+        """
+        try:
+            if service.close_callback is not None:
+                result = service.close_callback(instance)
+            elif hasattr(instance, '__aexit__'):
+                result = instance.__aexit__(None, None, None)
+            elif hasattr(instance, '__exit__'):
+                result = instance.__exit__(None, None, None)
+            else:
+                return
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            self._logger.exception("Error while disposing %s", str(instance))
+
+    def _pop_instances(self, registered_instances):
+        with self._lock:
+            instances = list(registered_instances or ()) + list(self._instances.values())
+            self._instances = dict()
+        return instances
+
+    def _run_awaitable(self, awaitable):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(self._await(awaitable))
+            return
+        if inspect.iscoroutine(awaitable):
+            awaitable.close()
+        self._logger.error("Asynchronous close callbacks must be disposed with ashutdown")
+
+    @staticmethod
+    async def _await(awaitable):
+        return await awaitable
+
+    @staticmethod
+    def _get_waves(instances, dependencies):
+        """
+        Split the instances in waves that can be disposed concurrently.
+
+        An instance is only disposed once all the instances depending on it have been disposed.
+
+        :param instances: The tracked instances in creation order
+        :type instances: list
+        :param dependencies: Dependencies of each identifier
+        :type dependencies: dict
+        :rtype: list
+        """
+        identifiers = set(identifier for identifier, _, _ in instances)
+        reachable = dict()
+        for identifier in identifiers:
+            reachable[identifier] = set()
+            pending = list(dependencies.get(identifier, ()))
+            while pending:
+                dependency = pending.pop()
+                if dependency in reachable[identifier] or dependency == identifier:
+                    continue
+                reachable[identifier].add(dependency)
+                pending.extend(dependencies.get(dependency, ()))
+
+        remaining = list(instances)
+        waves = list()
+        while remaining:
+            remaining_identifiers = set(identifier for identifier, _, _ in remaining)
+            depended_upon = set()
+            for identifier in remaining_identifiers:
+                depended_upon.update(reachable[identifier] & remaining_identifiers)
+            wave = [item for item in remaining if item[0] not in depended_upon]
+            if not wave:
+                # Should not happen since circular dependencies are forbidden
+                wave = remaining
+            waves.append(wave)
+            disposed = set(id(item) for item in wave)
+            remaining = [item for item in remaining if id(item) not in disposed]
+        return waves
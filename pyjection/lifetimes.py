@@ -0,0 +1,643 @@
+"""
+Module that contains all the lifetimes.
+
+A lifetime decides when the dependency injector has to build
+a new instance of a service and when an existing one can be reused.
+Transient services and singletons are handled by the dependency injector itself,
+the other lifetimes are attached to their service.
+"""
+import asyncio
+import collections
+import logging
+import threading
+import time
+import weakref
+
+from pyjection.errors import PoolTimeoutError
+
+
+class BaseLifetime(object):
+    """
+    Base class for the lifetimes
+    """
+
+    def get(self, identifier, service, injector, arguments=None):
+        """
+        Return an instance of the service
+
+        :param identifier: Identifier of the service
+        :param service: The service
+        :param injector: The dependency injector building the instances
+        :param arguments: Runtime arguments given to the dependency injector
+        :type identifier: string
+        :type service: Service
+        :type injector: DependencyInjector
+        :type arguments: dict
+        """
+        raise NotImplementedError('This method must be implemented')
+
+    async def aget(self, identifier, service, injector, arguments=None):
+        """
+        Asynchronous variant of get
+
+        By default it does not differ from get.
+        """
+        return self.get(identifier, service, injector, arguments)
+
+    def reset(self):
+        """
+        Forget all the instances, called when the dependency injector is shut down
+
+        The instances are disposed by the dependency injector.
+        """
+        pass
+
+
+class PooledLifetime(BaseLifetime):
+    """
+    Check instances out of a bounded pool.
+
+    Instances retrieved within a scope are returned to the pool on scope exit,
+    otherwise they have to be returned with ``DependencyInjector.release``.
+    """
+
+    def __init__(self, max_size=10, idle_timeout=None, timeout=None):
+        """
+        :param max_size: Maximum number of instances built by the pool
+        :type max_size: int
+        :param idle_timeout: Seconds after which an idle instance is disposed
+        :type idle_timeout: float
+        :param timeout: Maximum number of seconds to wait for an instance
+        :type timeout: float
+        """
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._timeout = timeout
+        self._condition = threading.Condition()
+        self._idle = list()
+        self._in_use = set()
+        self._size = 0
+        self._async_waiters = list()
+        self._checkouts = 0
+        self._waits = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._created = 0
+        self._evicted = 0
+
+    def get(self, identifier, service, injector, arguments=None):
+        start = time.monotonic()
+        with self._condition:
+            while True:
+                instance, must_build = self._try_checkout(identifier, service, injector)
+                if instance is not None or must_build:
+                    break
+                remaining = self._get_remaining_time(start)
+                if remaining is not None and remaining <= 0:
+                    raise PoolTimeoutError(
+                        "No instance available in the pool of {0}".format(identifier)
+                    )
+                self._condition.wait(remaining)
+            self._record_wait(start)
+        return self._complete_checkout(
+            instance, must_build, identifier, service, injector, arguments
+        )
+
+    async def aget(self, identifier, service, injector, arguments=None):
+        start = time.monotonic()
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                instance, must_build = self._try_checkout(identifier, service, injector)
+                if instance is not None or must_build:
+                    self._record_wait(start)
+                    break
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            remaining = self._get_remaining_time(start)
+            if remaining is not None and remaining <= 0:
+                raise PoolTimeoutError(
+                    "No instance available in the pool of {0}".format(identifier)
+                )
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                pass
+        return self._complete_checkout(
+            instance, must_build, identifier, service, injector, arguments
+        )
+
+    def release(self, instance, service, injector):
+        """
+        Return an instance to the pool
+
+        :param instance: The checked out instance
+        :param service: The pooled service
+        :param injector: The dependency injector
+        :type instance: mixed
+        :type service: Service
+        :type injector: DependencyInjector
+        """
+        with self._condition:
+            if id(instance) not in self._in_use:
+                return
+            self._in_use.discard(id(instance))
+            self._idle.append((instance, time.monotonic()))
+            self._evict_idle(service, injector)
+            self._notify()
+
+    def stats(self):
+        """
+        Return the utilization and wait time metrics of the pool
+
+        :rtype: dict
+        """
+        with self._condition:
+            return {
+                'max_size': self._max_size,
+                'size': self._size,
+                'in_use': len(self._in_use),
+                'idle': len(self._idle),
+                'utilization': len(self._in_use) / self._max_size,
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'total_wait_time': self._total_wait_time,
+                'max_wait_time': self._max_wait_time,
+                'created': self._created,
+                'evicted': self._evicted,
+            }
+
+    def reset(self):
+        with self._condition:
+            self._idle = list()
+            self._in_use = set()
+            self._size = 0
+            self._notify()
+
+    def _try_checkout(self, identifier, service, injector):
+        """
+        Must be called with the condition acquired
+
+        :return: A tuple made of an idle instance and whether a new instance must be built instead
+        :rtype: tuple
+        """
+        self._evict_idle(service, injector)
+        if self._idle:
+            instance, _ = self._idle.pop()
+            self._in_use.add(id(instance))
+            return instance, False
+        if self._size < self._max_size:
+            # Reserve the slot, the instance is built outside of the lock
+            self._size += 1
+            return None, True
+        return None, False
+
+    def _complete_checkout(self, instance, must_build, identifier, service, injector, arguments):
+        if must_build:
+            try:
+                instance = injector._create_instance(identifier, service, arguments)
+            except Exception:
+                with self._condition:
+                    self._size -= 1
+                    self._notify()
+                raise
+            injector._lifecycle.track(identifier, service, instance)
+            with self._condition:
+                self._created += 1
+                self._in_use.add(id(instance))
+
+        scope = injector.get_current_scope()
+        if scope is not None:
+            scope.on_exit(lambda: self.release(instance, service, injector))
+        return instance
+
+    def _evict_idle(self, service, injector):
+        if self._idle_timeout is None:
+            return
+        deadline = time.monotonic() - self._idle_timeout
+        # Idle instances are sorted from the least to the most recently released
+        while self._idle and self._idle[0][1] < deadline:
+            instance, _ = self._idle.pop(0)
+            self._size -= 1
+            self._evicted += 1
+            injector._lifecycle.untrack(instance)
+            injector._lifecycle.dispose(service, instance)
+
+    def _notify(self):
+        self._condition.notify()
+        while self._async_waiters:
+            loop, waiter = self._async_waiters.pop(0)
+            if not waiter.done():
+                loop.call_soon_threadsafe(self._wake, waiter)
+                break
+
+    @staticmethod
+    def _wake(waiter):
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def _get_remaining_time(self, start):
+        if self._timeout is None:
+            return None
+        return self._timeout - (time.monotonic() - start)
+
+    def _record_wait(self, start):
+        wait_time = time.monotonic() - start
+        self._checkouts += 1
+        if wait_time > 0.001:
+            self._waits += 1
+        self._total_wait_time += wait_time
+        self._max_wait_time = max(self._max_wait_time, wait_time)
+
+
+class ThreadLocalLifetime(BaseLifetime):
+    """
+    Keep one instance per thread, or per asyncio task.
+
+    Instances are disposed when their thread exits or their task is done.
+    """
+
+    def __init__(self, per_task=False):
+        """
+        :param per_task: Whether instances retrieved within an asyncio task are bound to the task
+            instead of the thread
+        :type per_task: bool
+        """
+        self._per_task = per_task
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._finalizers = set()
+        self._tasks = weakref.WeakKeyDictionary()
+
+    def get(self, identifier, service, injector, arguments=None):
+        if self._per_task:
+            task = self._get_current_task()
+            if task is not None:
+                return self._get_task_instance(task, identifier, service, injector, arguments)
+
+        holder = getattr(self._local, 'holder', None)
+        if holder is not None:
+            return holder.instance
+        instance = injector._create_instance(identifier, service, arguments)
+        injector._lifecycle.track(identifier, service, instance)
+        holder = _InstanceHolder(instance)
+        # The holder is only referenced by the thread local storage,
+        # it is collected as soon as the thread exits
+        finalizer = weakref.finalize(holder, self._dispose, service, injector, instance)
+        with self._lock:
+            self._finalizers = set(alive for alive in self._finalizers if alive.alive)
+            self._finalizers.add(finalizer)
+        self._local.holder = holder
+        return instance
+
+    def reset(self):
+        with self._lock:
+            for finalizer in self._finalizers:
+                finalizer.detach()
+            self._finalizers = set()
+            self._local = threading.local()
+            self._tasks = weakref.WeakKeyDictionary()
+
+    def _get_task_instance(self, task, identifier, service, injector, arguments):
+        with self._lock:
+            if task in self._tasks:
+                return self._tasks[task]
+        instance = injector._create_instance(identifier, service, arguments)
+        injector._lifecycle.track(identifier, service, instance)
+        with self._lock:
+            self._tasks[task] = instance
+        task.add_done_callback(lambda done_task: self._on_task_done(done_task, service, injector))
+        return instance
+
+    def _on_task_done(self, task, service, injector):
+        with self._lock:
+            instance = self._tasks.pop(task, None)
+        if instance is not None:
+            self._dispose(service, injector, instance)
+
+    @staticmethod
+    def _dispose(service, injector, instance):
+        injector._lifecycle.untrack(instance)
+        injector._lifecycle.dispose(service, instance)
+
+    @staticmethod
+    def _get_current_task():
+        try:
+            return asyncio.current_task()
+        except RuntimeError:
+            return None
+
+
+class MultitonLifetime(BaseLifetime):
+    """
+    Keep one instance per set of runtime arguments, e.g. one per tenant.
+
+    Instances are evicted from the least recently used one when the cache is full
+    and rebuilt once their time to live has expired.
+    """
+
+    def __init__(self, max_size=None, ttl=None):
+        """
+        :param max_size: Maximum number of cached instances
+        :type max_size: int
+        :param ttl: Seconds after which an instance is rebuilt
+        :type ttl: float
+        """
+        self._max_size = max_size
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._instances = collections.OrderedDict()
+        # Locks making sure the instance of a key is only built once when several threads miss it
+        self._key_locks = dict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, identifier, service, injector, arguments=None):
+        # Runtime arguments must be hashable
+        key = tuple(sorted((arguments or dict()).items()))
+        with self._lock:
+            instance = self._get_cached(key)
+            if instance is not None:
+                self._hits += 1
+                return instance
+            key_lock = self._key_locks.setdefault(key, threading.RLock())
+
+        with key_lock:
+            with self._lock:
+                # Another thread may have built the instance meanwhile
+                instance = self._get_cached(key)
+                if instance is not None:
+                    self._hits += 1
+                    return instance
+                self._misses += 1
+            instance = injector._create_instance(identifier, service, arguments)
+            evicted = list()
+            with self._lock:
+                cached = self._get_cached(key)
+                if cached is not None:
+                    # Built meanwhile by a thread holding a newer lock of the key
+                    evicted.append(instance)
+                    instance = cached
+                else:
+                    injector._lifecycle.track(identifier, service, instance)
+                    # Only an expired instance may still be cached under the key
+                    previous = self._instances.pop(key, None)
+                    if previous is not None:
+                        evicted.append(previous[0])
+                    self._instances[key] = (instance, time.monotonic())
+                while self._max_size is not None and len(self._instances) > self._max_size:
+                    evicted.append(self._instances.popitem(last=False)[1][0])
+                    self._evictions += 1
+                self._key_locks.pop(key, None)
+        for evicted_instance in evicted:
+            injector._lifecycle.untrack(evicted_instance)
+            injector._lifecycle.dispose(service, evicted_instance)
+        return instance
+
+    def stats(self):
+        """
+        Return the hit and miss counters of the cache
+
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                'size': len(self._instances),
+                'max_size': self._max_size,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+            }
+
+    def reset(self):
+        with self._lock:
+            self._instances = collections.OrderedDict()
+
+    def _get_cached(self, key):
+        """
+        Return the cached instance if it hasn't expired, must be called with the lock acquired
+        """
+        entry = self._instances.get(key)
+        if entry is None or (self._ttl is not None and time.monotonic() - entry[1] >= self._ttl):
+            return None
+        self._instances.move_to_end(key)
+        return entry[0]
+
+
+class RefreshingLifetime(BaseLifetime):
+    """
+    Keep a single instance rebuilt in the background once its time to live has expired.
+
+    The previous instance is returned until the new one has been built,
+    so retrieving the service never waits for a rebuild once the first instance exists.
+    Only one rebuild runs at a time.
+    """
+
+    def __init__(self, ttl, refresh_ahead=0, retry_interval=1.0):
+        """
+        :param ttl: Seconds after which the instance is rebuilt
+        :type ttl: float
+        :param refresh_ahead: Seconds before the expiration at which the rebuild starts
+        :type refresh_ahead: float
+        :param retry_interval: Seconds to wait before rebuilding again after a failure
+        :type retry_interval: float
+        """
+        self._logger = logging.getLogger(__name__)
+        self._ttl = ttl
+        self._refresh_ahead = refresh_ahead
+        self._retry_interval = retry_interval
+        self._lock = threading.RLock()
+        # (instance, refresh time) swapped at once so that readers need no lock
+        self._entry = None
+        self._refresh_thread = None
+        self._generation = 0
+
+    def get(self, identifier, service, injector, arguments=None):
+        entry = self._entry
+        if entry is not None:
+            if time.monotonic() >= entry[1]:
+                self._start_refresh(identifier, service, injector)
+            return entry[0]
+
+        # A circular dependency must be detected before waiting for the lock
+        injector._check_circular_dependency(identifier, injector._get_resolution_stack())
+        with self._lock:
+            # Another thread may have built the first instance meanwhile
+            if self._entry is not None:
+                return self._entry[0]
+            instance = injector._create_instance(identifier, service, arguments)
+            injector._lifecycle.track(identifier, service, instance)
+            self._set_instance(instance)
+        return instance
+
+    def reset(self):
+        with self._lock:
+            self._entry = None
+            self._generation += 1
+
+    def _start_refresh(self, identifier, service, injector):
+        with self._lock:
+            entry = self._entry
+            if self._refresh_thread is not None or entry is None or time.monotonic() < entry[1]:
+                return
+            self._refresh_thread = threading.Thread(
+                target=self._refresh,
+                args=(identifier, service, injector, self._generation),
+                name='pyjection-refresh-{0}'.format(identifier),
+                daemon=True
+            )
+            self._refresh_thread.start()
+
+    def _refresh(self, identifier, service, injector, generation):
+        try:
+            instance = injector._create_instance(identifier, service)
+        except Exception:
+            self._logger.exception("Error while refreshing the service with ID %s", identifier)
+            with self._lock:
+                if self._entry is not None:
+                    self._entry = (self._entry[0], time.monotonic() + self._retry_interval)
+                self._refresh_thread = None
+            return
+
+        injector._lifecycle.track(identifier, service, instance)
+        with self._lock:
+            self._refresh_thread = None
+            if generation != self._generation or self._entry is None:
+                # The lifetime has been reset while rebuilding
+                previous = instance
+            else:
+                previous = self._entry[0]
+                self._set_instance(instance)
+        if previous is not None:
+            injector._lifecycle.untrack(previous)
+            injector._lifecycle.dispose(service, previous)
+        self._logger.debug("Service with ID %s refreshed", identifier)
+
+    def _set_instance(self, instance):
+        """
+        Must be called with the lock acquired
+        """
+        self._entry = (instance, time.monotonic() + max(self._ttl - self._refresh_ahead, 0))
+
+
+class WeakLifetime(BaseLifetime):
+    """
+    Keep a single instance held weakly, rebuilt on demand once it has been garbage collected.
+
+    With an idle timeout, the instance is also held strongly until it hasn't been retrieved
+    for that many seconds. Instances are not disposed on shutdown since the dependency injector
+    doesn't keep them alive.
+    """
+
+    def __init__(self, idle_timeout=None):
+        """
+        :param idle_timeout: Seconds during which the instance is kept alive after being retrieved
+        :type idle_timeout: float
+        """
+        self._logger = logging.getLogger(__name__)
+        self._idle_timeout = idle_timeout
+        self._lock = threading.RLock()
+        self._reference = None
+        self._strong_reference = None
+        self._last_used = 0.0
+        self._timer = None
+        self._builds = 0
+
+    def get(self, identifier, service, injector, arguments=None):
+        reference = self._reference
+        if reference is not None:
+            instance = reference()
+            if instance is not None:
+                self._keep_alive(instance)
+                return instance
+
+        # A circular dependency must be detected before waiting for the lock
+        injector._check_circular_dependency(identifier, injector._get_resolution_stack())
+        with self._lock:
+            # Another thread may have built the instance meanwhile
+            instance = self._reference() if self._reference is not None else None
+            if instance is None:
+                instance = injector._create_instance(identifier, service, arguments)
+                self._builds += 1
+                try:
+                    self._reference = weakref.ref(instance)
+                except TypeError:
+                    self._logger.warning(
+                        "Instances of the service with ID %s can't be weakly referenced, "
+                        "it is held strongly",
+                        identifier
+                    )
+                    self._reference = _StrongReference(instance)
+        self._keep_alive(instance)
+        return instance
+
+    def stats(self):
+        """
+        Return the number of times the instance has been built and whether it is alive
+
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                'builds': self._builds,
+                'alive': self._reference is not None and self._reference() is not None,
+                'held': self._strong_reference is not None,
+            }
+
+    def reset(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = None
+            self._reference = None
+            self._strong_reference = None
+
+    def _keep_alive(self, instance):
+        if self._idle_timeout is None:
+            return
+        self._last_used = time.monotonic()
+        if self._strong_reference is not None:
+            return
+        with self._lock:
+            self._strong_reference = instance
+            if self._timer is None:
+                self._schedule_release(self._idle_timeout)
+
+    def _release(self):
+        with self._lock:
+            idle_time = time.monotonic() - self._last_used
+            if idle_time < self._idle_timeout:
+                self._schedule_release(self._idle_timeout - idle_time)
+                return
+            self._timer = None
+            self._strong_reference = None
+
+    def _schedule_release(self, delay):
+        """
+        Must be called with the lock acquired
+        """
+        self._timer = threading.Timer(delay, self._release)
+        self._timer.daemon = True
+        self._timer.start()
+
+
+class _StrongReference(object):
+    """
+    Callable returning an instance that can't be weakly referenced, like a weak reference would
+    """
+
+    def __init__(self, instance):
+        self._instance = instance
+
+    def __call__(self):
+        return self._instance
+
+
+class _InstanceHolder(object):
+    """
+    Weak referenceable container of an instance
+    """
+
+    def __init__(self, instance):
+        self.instance = instance
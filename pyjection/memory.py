@@ -0,0 +1,124 @@
+"""
+Module that accounts for the memory used by the instances built by the dependency injector.
+
+The tracker counts the instances of each service that are still alive through weak references
+and may measure the memory allocated by each construction with ``tracemalloc``.
+"""
+import threading
+import tracemalloc
+import weakref
+from collections import namedtuple
+
+ServiceMemory = namedtuple(
+    'ServiceMemory',
+    ['created', 'live', 'untracked', 'allocated', 'max_allocated']
+)
+ServiceMemory.__doc__ = """
+Memory accounting of a service.
+
+``live`` counts the instances that haven't been garbage collected yet,
+``untracked`` the instances that can't be weakly referenced hence can't be counted as live.
+``allocated`` is the total number of bytes allocated by the constructions of the service
+and ``max_allocated`` the biggest of them; both are 0 when allocations are not traced.
+"""
+
+
+class MemoryTracker(object):
+    """
+    Record the live instances and the allocations of each service
+    """
+
+    def __init__(self, trace_allocations=False):
+        """
+        :param trace_allocations: Whether the memory allocated by each construction is measured,
+            ``tracemalloc`` is started if it isn't tracing yet
+        :type trace_allocations: bool
+        """
+        # Weak reference callbacks may run on any thread, within a locked section
+        self._lock = threading.RLock()
+        self._trace_allocations = trace_allocations
+        self._started_tracing = False
+        self._counters = dict()
+        self._references = set()
+        if trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def construct(self, identifier, subject, arguments):
+        """
+        Instantiate the subject and record the new instance
+
+        Only the allocations of the subject constructor are measured,
+        its dependencies are accounted to their own services.
+
+        :param identifier: Identifier of the service
+        :type identifier: string
+        :param subject: The class to instantiate
+        :type subject: type
+        :param arguments: The constructor arguments
+        :type arguments: dict
+        :return: The new instance
+        """
+        if not self._trace_allocations or not tracemalloc.is_tracing():
+            instance = subject(**arguments)
+            self._record(identifier, instance, 0)
+            return instance
+        before = tracemalloc.get_traced_memory()[0]
+        instance = subject(**arguments)
+        # Allocations made by other threads meanwhile are counted as well
+        allocated = max(tracemalloc.get_traced_memory()[0] - before, 0)
+        self._record(identifier, instance, allocated)
+        return instance
+
+    def snapshot(self):
+        """
+        Return the memory accounting of each service that built at least one instance
+
+        :return: ServiceMemory of each service identifier
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                identifier: ServiceMemory(*counters)
+                for identifier, counters in self._counters.items()
+            }
+
+    def reset(self):
+        """
+        Forget all the recorded instances
+        """
+        with self._lock:
+            self._counters = dict()
+            self._references = set()
+
+    def stop(self):
+        """
+        Stop tracing the allocations, ``tracemalloc`` is only stopped if the tracker started it
+        """
+        self._trace_allocations = False
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _record(self, identifier, instance, allocated):
+        with self._lock:
+            counters = self._counters.get(identifier)
+            if counters is None:
+                # created, live, untracked, allocated, max_allocated
+                counters = self._counters[identifier] = [0, 0, 0, 0, 0]
+            counters[0] += 1
+            counters[3] += allocated
+            counters[4] = max(counters[4], allocated)
+            try:
+                reference = weakref.ref(instance, lambda dead: self._collected(counters, dead))
+            except TypeError:
+                counters[2] += 1
+                return
+            counters[1] += 1
+            self._references.add(reference)
+
+    def _collected(self, counters, reference):
+        with self._lock:
+            if reference in self._references:
+                self._references.discard(reference)
+                counters[1] -= 1
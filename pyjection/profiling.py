@@ -0,0 +1,208 @@
+"""
+Module that captures the resolutions of the dependency injector that are slower than a threshold.
+
+Each construction is timed, as well as the resolution of each argument by the resolvers
+and the call to the constructor, so that a slow resolution can be broken down afterwards.
+The resolution may also be profiled with ``cProfile``.
+"""
+import collections
+import cProfile
+import threading
+import time
+from collections import namedtuple
+
+Sample = namedtuple('Sample', ['identifier', 'duration', 'timestamp', 'constructions', 'profile'])
+Sample.__doc__ = """
+A resolution slower than the threshold.
+
+``constructions`` lists the services built during the resolution in construction order,
+``profile`` is the ``cProfile.Profile`` of the resolution (to give to ``pstats.Stats``) or None.
+"""
+
+Construction = namedtuple(
+    'Construction',
+    ['identifier', 'depth', 'duration', 'constructor_duration', 'arguments']
+)
+Construction.__doc__ = """
+A service built during a sampled resolution.
+
+``duration`` includes the construction of its dependencies,
+``constructor_duration`` only the call to the service constructor
+and ``arguments`` is made of (argument name, resolver name, duration) tuples.
+"""
+
+
+class SlowResolutionSampler(object):
+    """
+    Keep the last resolutions slower than a threshold in a ring buffer
+    """
+
+    def __init__(self, threshold=0.1, max_samples=10, profile=False):
+        """
+        :param threshold: Number of seconds above which a resolution is sampled
+        :type threshold: float
+        :param max_samples: Number of samples kept, the oldest ones are dropped first
+        :type max_samples: int
+        :param profile: Whether resolutions are profiled with cProfile,
+            every resolution is then profiled and the profiles of the fast ones are dropped
+        :type profile: bool
+        """
+        self._threshold = threshold
+        self._profile = profile
+        self._lock = threading.Lock()
+        self._samples = collections.deque(maxlen=max_samples)
+        self._local = threading.local()
+
+    def enter(self, identifier):
+        """
+        Called when the construction of a service starts
+
+        :param identifier: Identifier of the service
+        :type identifier: string
+        """
+        frames = self._get_frames()
+        if not frames:
+            self._local.constructions = list()
+            self._local.profiler = self._start_profiler()
+        # identifier, depth, start, duration, constructor duration, arguments
+        record = [identifier, len(frames), time.perf_counter(), 0.0, 0.0, list()]
+        frames.append(record)
+        self._local.constructions.append(record)
+
+    def exit(self):
+        """
+        Called when the construction of a service ends, successfully or not
+        """
+        frames = self._get_frames()
+        record = frames.pop()
+        record[3] = time.perf_counter() - record[2]
+        if frames:
+            return
+        profiler = self._local.profiler
+        self._local.profiler = None
+        if profiler is not None:
+            profiler.disable()
+        if record[3] < self._threshold:
+            return
+        records = self._local.constructions
+        constructions = tuple(
+            Construction(identifier, depth, duration, constructor_duration, tuple(arguments))
+            for identifier, depth, _, duration, constructor_duration, arguments in records
+        )
+        sample = Sample(record[0], record[3], time.time(), constructions, profiler)
+        with self._lock:
+            self._samples.append(sample)
+
+    def record_argument(self, name, resolver, duration):
+        """
+        Called when an argument of the service being built has been resolved
+
+        :param name: Name of the argument
+        :type name: string
+        :param resolver: The resolver that resolved the argument
+        :type resolver: BaseResolver
+        :param duration: Number of seconds spent resolving the argument
+        :type duration: float
+        """
+        frames = self._get_frames()
+        if frames:
+            frames[-1][5].append((name, type(resolver).__name__, duration))
+
+    def record_constructor(self, duration):
+        """
+        Called when the constructor of the service being built has returned
+
+        :param duration: Number of seconds spent in the constructor
+        :type duration: float
+        """
+        frames = self._get_frames()
+        if frames:
+            frames[-1][4] = duration
+
+    def get_context(self):
+        """
+        Return the constructions being sampled by the current thread,
+        so that another thread continues them with attach
+
+        :rtype: tuple
+        """
+        return list(self._get_frames()), getattr(self._local, 'constructions', None)
+
+    def attach(self, context):
+        """
+        Continue in the current thread (e.g. a worker thread) the constructions of another thread,
+        they are then part of the sample of the other thread
+
+        :param context: The context returned by get_context
+        :type context: tuple
+        """
+        frames, constructions = context
+        self._local.frames = list(frames)
+        self._local.constructions = constructions
+        self._local.profiler = None
+
+    def detach(self):
+        """
+        Forget the constructions attached to the current thread
+        """
+        self._local.frames = list()
+
+    def samples(self):
+        """
+        Return the kept samples, from the oldest to the most recent one
+
+        :rtype: list
+        """
+        with self._lock:
+            return list(self._samples)
+
+    def clear(self):
+        """
+        Drop all the kept samples
+        """
+        with self._lock:
+            self._samples.clear()
+
+    @staticmethod
+    def format(sample):
+        """
+        Describe a sample as an indented tree of constructions
+
+        :param sample: The sample to describe
+        :type sample: Sample
+        :rtype: string
+        """
+        lines = ["{0} resolved in {1:.3f} ms".format(sample.identifier, sample.duration * 1000)]
+        for construction in sample.constructions:
+            indent = '  ' * (construction.depth + 1)
+            lines.append("{0}{1}: {2:.3f} ms, constructor {3:.3f} ms".format(
+                indent,
+                construction.identifier,
+                construction.duration * 1000,
+                construction.constructor_duration * 1000
+            ))
+            for name, resolver, duration in construction.arguments:
+                lines.append("{0}  {1} by {2}: {3:.3f} ms".format(
+                    indent,
+                    name,
+                    resolver,
+                    duration * 1000
+                ))
+        return '\n'.join(lines)
+
+    def _get_frames(self):
+        frames = getattr(self._local, 'frames', None)
+        if frames is None:
+            frames = self._local.frames = list()
+        return frames
+
+    def _start_profiler(self):
+        if not self._profile:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active
+            return None
+        return profiler
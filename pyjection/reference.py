@@ -6,17 +6,21 @@ class Reference(object):
     Base class used when a service needs to register a dependency to another service
     """
 
-    def __init__(self, name, return_class=False):
+    def __init__(self, name, return_class=False, multi=False):
         """
         :param name: Name of the reference or a class
         :type name: mixed
         :param return_class: Whether the reference is on an instance of the other service or a class
         :type return_class: bool
+        :param multi: Whether the reference is on all the services registered
+            under the name as a tag
+        :type multi: bool
         """
         self._name = name
         if isinstance(name, str) is False:
             self._name = get_service_subject_identifier(name)
         self._return_class = return_class
+        self._multi = multi
 
     @property
     def name(self):
@@ -25,3 +29,7 @@ class Reference(object):
     @property
     def return_class(self):
         return self._return_class
+
+    @property
+    def multi(self):
+        return self._multi
@@ -4,11 +4,38 @@ Module that contains all the resolvers.
 A resolver is a class that is able to retrieve a dependency to inject.
 """
 import builtins
+import collections.abc
 import inspect
 import typing
+from collections import namedtuple
+from inspect import Parameter
 
+from pyjection.helper import get_service_subject_identifier, unwrap_annotation
 from pyjection.reference import Reference
 
+# Kinds of static resolutions
+VALUE = 'value'
+SERVICE = 'service'
+CLASS = 'class'
+MULTI = 'multi'
+
+# Annotations injecting all the services registered under a tag
+COLLECTION_TYPES = [
+    list,
+    collections.abc.Sequence,
+    collections.abc.Collection,
+    collections.abc.Iterable,
+]
+
+Resolution = namedtuple('Resolution', ['kind', 'value'])
+Resolution.__doc__ = """
+Static description of how a dependency is resolved.
+
+The value is the raw value to inject for the ``value`` kind,
+the identifier of the service to inject for the ``service`` and ``class`` kinds
+and the tag of the services to inject for the ``multi`` kind.
+"""
+
 
 class BaseResolver(object):
     """
@@ -18,6 +45,15 @@ class BaseResolver(object):
     def resolve(self, method_parameter, service, injector):
         raise NotImplementedError('This method must be implemented')
 
+    def plan(self, method_parameter, service, injector):
+        """
+        Describe how the dependency would be resolved without instantiating anything
+
+        :return: The resolution or None if the resolver can't resolve the dependency
+        :rtype: Resolution
+        """
+        raise NotImplementedError('This resolver does not support static resolution')
+
 
 class ServiceResolver(BaseResolver):
     """
@@ -33,10 +69,25 @@ class ServiceResolver(BaseResolver):
         if not isinstance(value, Reference):
             return value
         # The value references an other dependency service
+        if value.multi is True:
+            return injector.get_all(value.name)
         if value.return_class:
             return injector.get_uninstantiated(value.name)
         return injector.get(value.name)
 
+    def plan(self, method_parameter, service, injector):
+        if method_parameter.name not in service.arguments:
+            return None
+
+        value = service.arguments[method_parameter.name]
+        if not isinstance(value, Reference):
+            return Resolution(VALUE, value)
+        if value.multi is True:
+            return Resolution(MULTI, value.name)
+        if value.return_class:
+            return Resolution(CLASS, value.name)
+        return Resolution(SERVICE, value.name)
+
 
 class NameResolver(BaseResolver):
     """
@@ -50,16 +101,86 @@ class NameResolver(BaseResolver):
         if injector.has_service(method_parameter.name):
             return injector.get(method_parameter.name)
 
+    def plan(self, method_parameter, service, injector):
+        if injector.has_service(method_parameter.name):
+            return Resolution(SERVICE, method_parameter.name)
+
 
 class TypingResolver(BaseResolver):
     """
     Try to resolve the dependency based on the typing of the parameter.
+
+    ``Optional``, unions with ``None`` and ``Annotated`` are unwrapped,
+    a string metadata of ``Annotated`` being the identifier of the service to inject.
+    Collections like ``List[Plugin]`` or ``Sequence[Plugin]`` inject all the services
+    registered under the ``Plugin`` tag.
     """
 
+    def __init__(self):
+        self._identifiers = dict()
+
     def resolve(self, method_parameter, service, injector):
-        annotation = method_parameter.annotation
-        # Ignore typing annotation like `List` or builtins like `str`
-        if inspect.getmodule(annotation) in [typing, builtins]:
+        identifier, multi = self._get_identifier(method_parameter.annotation)
+        if identifier is None:
             return None
-        if injector.has_service(annotation):
-            return injector.get(annotation)
+        if multi:
+            if injector.has_tag(identifier):
+                return injector.get_all(identifier)
+        elif injector.has_service(identifier):
+            return injector.get(identifier)
+
+    def plan(self, method_parameter, service, injector):
+        identifier, multi = self._get_identifier(method_parameter.annotation)
+        if identifier is None:
+            return None
+        if multi:
+            if injector.has_tag(identifier):
+                return Resolution(MULTI, get_service_subject_identifier(identifier))
+        elif injector.has_service(identifier):
+            if not isinstance(identifier, str):
+                identifier = get_service_subject_identifier(identifier)
+            return Resolution(SERVICE, identifier)
+
+    def _get_identifier(self, annotation):
+        """
+        Return the class or the qualifier to look for in the dependency injector
+
+        Annotations are only unwrapped once.
+
+        :param annotation: The parameter annotation
+        :type annotation: mixed
+        :return: Tuple made of the class, the qualifier or None
+            and whether the annotation is a collection of services
+        :rtype: tuple
+        """
+        try:
+            return self._identifiers[annotation]
+        except KeyError:
+            identifier = self._unwrap(annotation)
+            self._identifiers[annotation] = identifier
+            return identifier
+        except TypeError:
+            # Unhashable annotation
+            return self._unwrap(annotation)
+
+    @classmethod
+    def _unwrap(cls, annotation):
+        # Ignore missing annotations and annotations that couldn't be evaluated
+        if annotation is Parameter.empty or isinstance(annotation, str):
+            return None, False
+        target, qualifier = unwrap_annotation(annotation)
+        if qualifier is not None:
+            return qualifier, False
+        if typing.get_origin(target) in COLLECTION_TYPES:
+            arguments = typing.get_args(target)
+            if len(arguments) == 1 and cls._is_service_type(arguments[0]):
+                return arguments[0], True
+            return None, False
+        if not cls._is_service_type(target):
+            return None, False
+        return target, False
+
+    @staticmethod
+    def _is_service_type(target):
+        # Ignore typing annotation like `List` or builtins like `str`
+        return target is not None and inspect.getmodule(target) not in [typing, builtins]
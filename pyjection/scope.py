@@ -0,0 +1,71 @@
+from pyjection.errors import PyjectionError
+
+
+class Scope(object):
+    """
+    A scope delimits the usage of the instances retrieved from the dependency injector.
+
+    Instances whose lifetime is bound to a scope (e.g. pooled instances)
+    are released when the scope is exited.
+    Scopes can be used as synchronous or asynchronous context managers.
+    """
+
+    def __init__(self, injector):
+        """
+        :param injector: The dependency injector the scope belongs to
+        :type injector: DependencyInjector
+        """
+        self._injector = injector
+        self._callbacks = list()
+        self._token = None
+
+    def get(self, identifier):
+        """
+        Retrieve the service matching this identifier from the dependency injector
+        """
+        return self._injector.get(identifier)
+
+    async def aget(self, identifier):
+        """
+        Asynchronously retrieve the service matching this identifier from the dependency injector
+        """
+        return await self._injector.aget(identifier)
+
+    def on_exit(self, callback):
+        """
+        Register a callback called when the scope is exited
+
+        Callbacks are called in reverse registration order.
+
+        :param callback: Callable without arguments
+        :type callback: callable
+        """
+        self._callbacks.append(callback)
+
+    def close(self):
+        """
+        Call the exit callbacks
+        """
+        errors = list()
+        while self._callbacks:
+            callback = self._callbacks.pop()
+            try:
+                callback()
+            except Exception as error:
+                errors.append(error)
+        if errors:
+            raise PyjectionError("Errors while closing the scope: {0}".format(errors))
+
+    def __enter__(self):
+        self._token = self._injector._current_scope.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._injector._current_scope.reset(self._token)
+        self.close()
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.__exit__(exc_type, exc_value, traceback)
@@ -17,6 +17,9 @@ class Service(object):
         self._subject = subject
         self._arguments = dict()
         self._is_singleton = False
+        self._close_callback = None
+        self._lifetime = None
+        self._interceptors = list()
         self._type = "instance"
         if inspect.isclass(subject) is True:
             self._type = "class"
@@ -39,6 +42,21 @@ class Service(object):
         """
         self._is_singleton = value
 
+    @property
+    def lifetime(self):
+        """
+        Lifetime managing the instances of this service
+
+        None for transient services and singletons
+
+        :rtype: BaseLifetime
+        """
+        return self._lifetime
+
+    @lifetime.setter
+    def lifetime(self, value):
+        self._lifetime = value
+
     @property
     def subject(self):
         """
@@ -49,6 +67,52 @@ class Service(object):
         """
         return self._subject
 
+    @property
+    def close_callback(self):
+        """
+        Callback used to dispose the instances of this service
+
+        :rtype: callable
+        """
+        return self._close_callback
+
+    def on_close(self, callback):
+        """
+        Set the callback used to dispose the instances of this service
+
+        The callback receives the instance to dispose.
+        It may be a coroutine function, in which case the instances
+        have to be disposed with ``DependencyInjector.ashutdown``.
+
+        :param callback: The callback disposing an instance
+        :type callback: callable
+        :return: The service
+        :rtype: Service
+        """
+        self._close_callback = callback
+        return self
+
+    @property
+    def interceptors(self):
+        """
+        Interceptors applied to each new instance of this service, in order
+
+        :rtype: list
+        """
+        return self._interceptors
+
+    def add_interceptor(self, interceptor):
+        """
+        Add an interceptor applied to each new instance of this service
+
+        :param interceptor: The interceptor
+        :type interceptor: BaseInterceptor
+        :return: The service
+        :rtype: Service
+        """
+        self._interceptors.append(interceptor)
+        return self
+
     @property
     def arguments(self):
         """
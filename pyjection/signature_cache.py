@@ -0,0 +1,467 @@
+"""
+Module that contains the signature caches.
+
+A signature cache analyzes the ``__init__`` method of the classes
+registered in the dependency injector and keeps the result so that
+``inspect.signature`` is only called once per class.
+The parameters of dataclasses, attrs classes and named tuples
+are derived from their field metadata instead.
+"""
+import dataclasses
+import hashlib
+import inspect
+import json
+import marshal
+import os
+import sys
+import tempfile
+import typing
+import weakref
+from inspect import Parameter
+from inspect import signature
+
+
+class SignatureCache(object):
+    """
+    In memory cache of the construction parameters of the classes
+    """
+
+    def __init__(self):
+        self._parameters = dict()
+        # Functions are held weakly, e.g. closures created for each request
+        self._callable_parameters = weakref.WeakKeyDictionary()
+
+    def get_parameters(self, subject):
+        """
+        Return the parameters required to instantiate the subject
+
+        The first parameter of the ``__init__`` method (the class instance) is not returned.
+
+        :param subject: The class we need the parameters for
+        :type subject: type
+        :return: The parameters of the subject ``__init__`` method
+        :rtype: tuple
+        """
+        try:
+            return self._parameters[subject]
+        except KeyError:
+            pass
+        parameters = self._analyze(subject)
+        self._parameters[subject] = parameters
+        return parameters
+
+    def get_callable_parameters(self, function):
+        """
+        Return the parameters of a function or a method
+
+        The first parameter of bound methods is not returned.
+
+        :param function: The function or method we need the parameters for
+        :type function: callable
+        :return: The parameters of the callable
+        :rtype: tuple
+        """
+        key = getattr(function, '__func__', function)
+        is_method = inspect.ismethod(function)
+        try:
+            return self._callable_parameters[key][is_method]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable callable object or without weak reference support
+            return self._analyze_callable(function)
+        parameters = self._analyze_callable(function)
+        self._callable_parameters.setdefault(key, dict())[is_method] = parameters
+        return parameters
+
+    def clear(self):
+        """
+        Remove all the analyzed signatures from the cache
+        """
+        self._parameters.clear()
+        self._callable_parameters.clear()
+
+    def _analyze(self, subject):
+        """
+        Analyze the construction parameters of the subject
+
+        :param subject: The class to analyze
+        :type subject: type
+        :rtype: tuple
+        """
+        fields = self._get_fields(subject)
+        if fields is not None:
+            return self._analyze_fields(subject, fields)
+        return self._analyze_init(subject)
+
+    def _analyze_init(self, subject):
+        """
+        Analyze the ``__init__`` signature of the subject
+
+        :param subject: The class to analyze
+        :type subject: type
+        :rtype: tuple
+        """
+        # We can't use signature on class object __init__
+        if self._is_object_init(subject):
+            return tuple()
+        sig = signature(subject.__init__)
+        # Skip the first param since it's the self class instance
+        parameters = tuple(sig.parameters.values())[1:]
+        return self._evaluate_annotations(subject.__init__, parameters, {subject.__name__: subject})
+
+    def _analyze_fields(self, subject, fields):
+        """
+        Build the parameters of the subject from its field metadata
+
+        :param subject: The class to analyze
+        :type subject: type
+        :param fields: (attribute name, parameter name, kind, default, annotation) tuples
+        :type fields: list
+        :rtype: tuple
+        """
+        hints = None
+        parameters = list()
+        for attribute_name, name, kind, default, annotation in fields:
+            if isinstance(annotation, str):
+                if hints is None:
+                    hints = self._get_class_hints(subject)
+                annotation = hints.get(attribute_name, annotation)
+            parameters.append(Parameter(name, kind, default=default, annotation=annotation))
+        return tuple(parameters)
+
+    @classmethod
+    def _get_fields(cls, subject):
+        """
+        Return the fields initialized by the generated constructor of
+        a dataclass, an attrs class or a named tuple
+
+        :param subject: The class to analyze
+        :type subject: type
+        :return: The fields or None if the constructor isn't generated from fields
+        :rtype: list
+        """
+        if not inspect.isclass(subject):
+            return None
+        if dataclasses.is_dataclass(subject):
+            fields = cls._get_dataclass_fields(subject)
+            constructor = subject.__init__
+        elif getattr(subject, '__attrs_attrs__', None) is not None:
+            fields = cls._get_attrs_fields(subject)
+            constructor = subject.__init__
+        elif issubclass(subject, tuple) and hasattr(subject, '_fields'):
+            fields = cls._get_named_tuple_fields(subject)
+            constructor = subject.__new__
+        else:
+            return None
+        # A constructor written by hand or init only variables make the fields unreliable
+        code = getattr(constructor, '__code__', None)
+        if code is None:
+            return None
+        names = code.co_varnames[1:code.co_argcount + code.co_kwonlyargcount]
+        if names != tuple(field[1] for field in fields):
+            return None
+        return fields
+
+    @staticmethod
+    def _get_dataclass_fields(subject):
+        fields = list()
+        for field in dataclasses.fields(subject):
+            if not field.init:
+                continue
+            if field.default is not dataclasses.MISSING:
+                default = field.default
+            elif field.default_factory is not dataclasses.MISSING:
+                default = _FactoryDefault
+            else:
+                default = Parameter.empty
+            kind = Parameter.POSITIONAL_OR_KEYWORD
+            if getattr(field, 'kw_only', False) is True:
+                kind = Parameter.KEYWORD_ONLY
+            fields.append((field.name, field.name, kind, default, field.type))
+        # Keyword only fields are moved at the end of the generated __init__
+        return sorted(fields, key=lambda field: field[2] == Parameter.KEYWORD_ONLY)
+
+    @staticmethod
+    def _get_attrs_fields(subject):
+        import attr
+        fields = list()
+        for attribute in subject.__attrs_attrs__:
+            if not attribute.init:
+                continue
+            if attribute.default is attr.NOTHING:
+                default = Parameter.empty
+            elif isinstance(attribute.default, attr.Factory):
+                default = _FactoryDefault
+            else:
+                default = attribute.default
+            # Private attributes are initialized without their leading underscores
+            name = getattr(attribute, 'alias', None) or attribute.name.lstrip('_')
+            kind = Parameter.KEYWORD_ONLY if attribute.kw_only else Parameter.POSITIONAL_OR_KEYWORD
+            annotation = Parameter.empty if attribute.type is None else attribute.type
+            fields.append((attribute.name, name, kind, default, annotation))
+        return sorted(fields, key=lambda field: field[2] == Parameter.KEYWORD_ONLY)
+
+    @staticmethod
+    def _get_named_tuple_fields(subject):
+        annotations = getattr(subject, '__annotations__', dict())
+        defaults = getattr(subject, '_field_defaults', dict())
+        return [
+            (
+                name,
+                name,
+                Parameter.POSITIONAL_OR_KEYWORD,
+                defaults.get(name, Parameter.empty),
+                annotations.get(name, Parameter.empty),
+            )
+            for name in subject._fields
+        ]
+
+    @staticmethod
+    def _get_class_hints(subject):
+        try:
+            return typing.get_type_hints(
+                subject,
+                localns={subject.__name__: subject},
+                include_extras=True
+            )
+        except Exception:
+            return dict()
+
+    def _analyze_callable(self, function):
+        """
+        Analyze the signature of a function or a method
+
+        :param function: The callable to analyze
+        :type function: callable
+        :rtype: tuple
+        """
+        if inspect.ismethod(function):
+            parameters = tuple(signature(function.__func__).parameters.values())[1:]
+            return self._evaluate_annotations(function.__func__, parameters, dict())
+        parameters = tuple(signature(function).parameters.values())
+        return self._evaluate_annotations(function, parameters, dict())
+
+    @staticmethod
+    def _evaluate_annotations(function, parameters, localns):
+        """
+        Evaluate the string annotations (postponed annotations or forward references)
+
+        Annotations that can't be evaluated are kept as strings.
+
+        :param function: The analyzed function
+        :param parameters: The parameters of the function
+        :param localns: Local namespace used to evaluate the annotations
+        :type function: function
+        :type parameters: tuple
+        :type localns: dict
+        :rtype: tuple
+        """
+        if not any(isinstance(parameter.annotation, str) for parameter in parameters):
+            return parameters
+
+        try:
+            hints = typing.get_type_hints(function, localns=localns, include_extras=True)
+        except Exception:
+            # Evaluate each annotation on its own so that a single unknown name
+            # does not prevent the other ones from being evaluated
+            globalns = getattr(function, '__globals__', dict())
+            hints = dict()
+            for parameter in parameters:
+                if not isinstance(parameter.annotation, str):
+                    continue
+                try:
+                    hints[parameter.name] = eval(parameter.annotation, globalns, localns)
+                except Exception:
+                    pass
+        return tuple(
+            parameter.replace(annotation=hints.get(parameter.name, parameter.annotation))
+            if isinstance(parameter.annotation, str) else parameter
+            for parameter in parameters
+        )
+
+    @staticmethod
+    def _is_object_init(subject):
+        """
+        Check if the __init__ method for the object comes from
+        the default object class or has been overridden
+
+        :param subject: The subject we want to check the __init__ for
+        :type subject: mixed
+
+        :return: Whether the __init__ method is the default on or not
+        :rtype: boolean
+        """
+        if '__objclass__' in dir(subject.__init__) and subject.__init__.__objclass__ == object:
+            return True
+        return False
+
+
+class FileSignatureCache(SignatureCache):
+    """
+    Signature cache persisted in a file between two processes.
+
+    Entries are keyed by the class qualified name and invalidated as soon as
+    the fingerprint of the class ``__init__`` method changes.
+    Classes whose signature can't be described reliably
+    (wrapped ``__init__``, custom ``__signature__``, complex annotations)
+    are analyzed on each start and never persisted.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Path of the cache file
+        :type path: string
+        """
+        super().__init__()
+        self._path = path
+        self._entries = dict()
+        self._dirty = False
+        self._load()
+
+    @property
+    def path(self):
+        return self._path
+
+    def save(self):
+        """
+        Write the cache file if new signatures have been analyzed since it has been loaded
+        """
+        if not self._dirty:
+            return
+        content = {"python": sys.version, "entries": self._entries}
+        directory = os.path.dirname(os.path.abspath(self._path))
+        handle, temporary_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(handle, "w") as cache_file:
+            json.dump(content, cache_file)
+        os.replace(temporary_path, self._path)
+        self._dirty = False
+
+    def _load(self):
+        try:
+            with open(self._path) as cache_file:
+                content = json.load(cache_file)
+        except (OSError, ValueError):
+            return
+        # Bytecode is not stable from one interpreter version to another
+        if not isinstance(content, dict) or content.get("python") != sys.version:
+            return
+        self._entries = content.get("entries", dict())
+
+    def _analyze(self, subject):
+        key = self._get_key(subject)
+        fingerprint = self._get_fingerprint(subject)
+        if key is None or fingerprint is None:
+            return super()._analyze(subject)
+
+        entry = self._entries.get(key)
+        if entry is not None and entry["fingerprint"] == fingerprint:
+            parameters = self._load_parameters(entry["parameters"])
+            if parameters is not None:
+                return parameters
+
+        parameters = super()._analyze(subject)
+        dumped_parameters = self._dump_parameters(parameters)
+        if dumped_parameters is not None:
+            self._entries[key] = {"fingerprint": fingerprint, "parameters": dumped_parameters}
+            self._dirty = True
+        return parameters
+
+    @staticmethod
+    def _get_key(subject):
+        qualname = getattr(subject, "__qualname__", None)
+        if qualname is None or "<locals>" in qualname:
+            return None
+        return "{0}:{1}".format(subject.__module__, qualname)
+
+    def _get_fingerprint(self, subject):
+        """
+        Compute a fingerprint of the subject ``__init__`` method
+        from its bytecode, its defaults and its annotations
+
+        :return: The fingerprint or None if the subject can't be persisted
+        :rtype: string
+        """
+        if '__signature__' in dir(subject) or self._get_fields(subject) is not None:
+            # Classes built from fields are analyzed without introspecting their constructor
+            return None
+        if self._is_object_init(subject):
+            return "object"
+        init = subject.__init__
+        if not inspect.isfunction(init) or hasattr(init, '__wrapped__'):
+            return None
+        annotations = sorted(
+            (name, self._get_annotation_identifier(annotation) or repr(annotation))
+            for name, annotation in init.__annotations__.items()
+        )
+        digest = hashlib.sha1(marshal.dumps(init.__code__))
+        digest.update(repr(annotations).encode())
+        digest.update(repr(len(init.__defaults__ or ())).encode())
+        digest.update(repr(sorted(init.__kwdefaults__ or ())).encode())
+        return digest.hexdigest()
+
+    def _dump_parameters(self, parameters):
+        dumped_parameters = list()
+        for parameter in parameters:
+            annotation = None
+            if parameter.annotation is not Parameter.empty:
+                annotation = self._get_annotation_identifier(parameter.annotation)
+                if annotation is None:
+                    return None
+            dumped_parameters.append([
+                parameter.name,
+                int(parameter.kind),
+                parameter.default is not Parameter.empty,
+                annotation,
+            ])
+        return dumped_parameters
+
+    def _load_parameters(self, dumped_parameters):
+        parameters = list()
+        for name, kind, has_default, annotation in dumped_parameters:
+            if annotation is None:
+                annotation = Parameter.empty
+            else:
+                annotation = self._import_annotation(annotation)
+                if annotation is None:
+                    return None
+            # The actual default value is never injected, only its presence matters
+            default = _CachedDefault if has_default else Parameter.empty
+            parameters.append(
+                Parameter(
+                    name,
+                    inspect._ParameterKind(kind),
+                    default=default,
+                    annotation=annotation
+                )
+            )
+        return tuple(parameters)
+
+    @staticmethod
+    def _get_annotation_identifier(annotation):
+        if not inspect.isclass(annotation):
+            return None
+        qualname = getattr(annotation, "__qualname__", "")
+        if "<locals>" in qualname or getattr(annotation, "__args__", None):
+            return None
+        return "{0}:{1}".format(annotation.__module__, qualname)
+
+    @staticmethod
+    def _import_annotation(identifier):
+        module_name, qualname = identifier.split(":", 1)
+        annotation = sys.modules.get(module_name)
+        for attribute in qualname.split("."):
+            annotation = getattr(annotation, attribute, None)
+        return annotation
+
+
+class _CachedDefault(object):
+    """
+    Placeholder for the default value of a parameter loaded from a cache file
+    """
+
+
+class _FactoryDefault(object):
+    """
+    Placeholder for the default value of a field built by a factory
+    """
@@ -0,0 +1,248 @@
+"""
+Module that traces the resolutions of the dependency injector.
+
+Each call to ``DependencyInjector.get``, including the ones made to build the dependencies
+of a service, emits a span. Spans are nested following the dependency tree
+and handed to an exporter once they end, e.g. to render flame graphs.
+"""
+import copy
+import itertools
+import json
+import threading
+import time
+
+from pyjection.helper import convert_camel_to_snake
+
+
+class Span(object):
+    """
+    Retrieval of a service by the dependency injector
+    """
+
+    def __init__(self, span_id, parent_id, identifier, lifetime, resolver):
+        """
+        :param span_id: Identifier of the span
+        :type span_id: int
+        :param parent_id: Identifier of the span of the service depending on this one
+        :type parent_id: int
+        :param identifier: Identifier of the retrieved service
+        :type identifier: string
+        :param lifetime: Lifetime of the service, e.g. transient or singleton
+        :type lifetime: string
+        :param resolver: Name of the resolver that resolved the service as a dependency
+        :type resolver: string
+        """
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.identifier = identifier
+        self.lifetime = lifetime
+        self.resolver = resolver
+        self.cache_hit = True
+        self.error = None
+        self.start = time.time()
+        self.end = None
+        self._perf_start = time.perf_counter()
+        # Resolver currently resolving an argument of the service
+        self._current_resolver = None
+
+    @property
+    def duration(self):
+        if self.end is None:
+            return None
+        return self.end - self.start
+
+    def to_dict(self):
+        return {
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'identifier': self.identifier,
+            'lifetime': self.lifetime,
+            'resolver': self.resolver,
+            'cache_hit': self.cache_hit,
+            'error': self.error,
+            'start': self.start,
+            'end': self.end,
+        }
+
+
+class BaseExporter(object):
+    """
+    Base class for the span exporters
+    """
+
+    def export(self, span):
+        """
+        Called once the span has ended
+
+        :param span: The ended span
+        :type span: Span
+        """
+        raise NotImplementedError('This method must be implemented')
+
+    def close(self):
+        """
+        Release the resources used by the exporter
+        """
+        pass
+
+
+class InMemoryExporter(BaseExporter):
+    """
+    Keep the ended spans in a list
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans = list()
+
+    @property
+    def spans(self):
+        with self._lock:
+            return list(self._spans)
+
+    def export(self, span):
+        with self._lock:
+            self._spans.append(span)
+
+    def clear(self):
+        with self._lock:
+            self._spans = list()
+
+
+class JsonLinesExporter(BaseExporter):
+    """
+    Append each ended span to a file as a JSON object per line
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Path of the file the spans are appended to
+        :type path: string
+        """
+        self._lock = threading.Lock()
+        self._file = open(path, 'a')
+
+    def export(self, span):
+        line = json.dumps(span.to_dict())
+        with self._lock:
+            self._file.write(line + '\n')
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class Tracer(object):
+    """
+    Emit the spans of the resolutions of a dependency injector
+    """
+
+    def __init__(self, exporter):
+        """
+        :param exporter: The exporter receiving the ended spans
+        :type exporter: BaseExporter
+        """
+        self._exporter = exporter
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+
+    def start_span(self, identifier, service):
+        """
+        Start the span of the retrieval of a service, as a child of the current span
+
+        :param identifier: Identifier of the service
+        :type identifier: string
+        :param service: The service
+        :type service: Service
+        :rtype: Span
+        """
+        spans = self._get_spans()
+        parent = spans[-1] if spans else None
+        span = Span(
+            next(self._ids),
+            parent.span_id if parent is not None else None,
+            identifier,
+            self._get_lifetime_name(service),
+            parent._current_resolver if parent is not None else None,
+        )
+        spans.append(span)
+        return span
+
+    def end_span(self, span, error=None):
+        """
+        End the span and export it
+
+        :param span: The current span
+        :type span: Span
+        :param error: The exception raised while retrieving the service
+        :type error: Exception
+        """
+        span.end = span.start + (time.perf_counter() - span._perf_start)
+        if error is not None:
+            span.error = type(error).__name__
+        self._get_spans().pop()
+        self._exporter.export(span)
+
+    def resolving(self, resolver):
+        """
+        Called before a resolver tries to resolve an argument of the service being built
+
+        :param resolver: The resolver
+        :type resolver: BaseResolver
+        """
+        spans = self._get_spans()
+        if spans:
+            spans[-1]._current_resolver = type(resolver).__name__
+
+    def constructed(self):
+        """
+        Called when a new instance of the current service is built
+        """
+        spans = self._get_spans()
+        if spans:
+            spans[-1].cache_hit = False
+
+    def get_context(self):
+        """
+        Return the spans being recorded by the current thread,
+        so that another thread continues them with attach
+
+        :rtype: list
+        """
+        return list(self._get_spans())
+
+    def attach(self, context):
+        """
+        Continue in the current thread (e.g. a worker thread) the spans of another thread
+
+        :param context: The spans returned by get_context
+        :type context: list
+        """
+        spans = list(context)
+        if spans:
+            # Each thread sets the resolver of the parent span on its own copy
+            spans[-1] = copy.copy(spans[-1])
+        self._local.spans = spans
+
+    def detach(self):
+        """
+        Forget the spans attached to the current thread
+        """
+        self._local.spans = list()
+
+    def _get_spans(self):
+        spans = getattr(self._local, 'spans', None)
+        if spans is None:
+            spans = self._local.spans = list()
+        return spans
+
+    @staticmethod
+    def _get_lifetime_name(service):
+        if service.type == 'instance':
+            return 'instance'
+        if service.lifetime is not None:
+            name = type(service.lifetime).__name__
+            if name.endswith('Lifetime'):
+                name = name[:-len('Lifetime')]
+            return convert_camel_to_snake(name)
+        return 'singleton' if service.is_singleton else 'transient'
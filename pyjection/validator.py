@@ -0,0 +1,198 @@
+"""
+Static validation of a dependency injector.
+
+The validator analyzes the ``__init__`` signature of every registered service
+against the registry and the resolvers, without instantiating anything.
+It reports the required parameters that can't be resolved, the circular dependencies
+and the depth and fan-out of each service in the dependency graph.
+"""
+import logging
+from collections import namedtuple
+from inspect import Parameter
+
+from pyjection.lifetimes import MultitonLifetime
+from pyjection.resolvers import SERVICE, CLASS, MULTI
+
+ServiceMetrics = namedtuple('ServiceMetrics', ['depth', 'fan_out', 'fan_in'])
+ServiceMetrics.__doc__ = """
+Position of a service in the dependency graph.
+
+The depth is the length of the longest chain of dependencies below the service,
+the fan-out the number of services it directly depends on
+and the fan-in the number of services directly depending on it.
+"""
+
+Problem = namedtuple('Problem', ['identifier', 'message'])
+
+
+class ValidationReport(object):
+    """
+    Result of the validation of a dependency injector
+    """
+
+    def __init__(self):
+        self.errors = list()
+        self.warnings = list()
+        self.cycles = list()
+        self.metrics = dict()
+
+    @property
+    def is_valid(self):
+        return not self.errors and not self.cycles
+
+
+class ContainerValidator(object):
+    """
+    Validate the wiring of a dependency injector without instantiating any service
+    """
+
+    def __init__(self, injector):
+        """
+        :param injector: The dependency injector to validate
+        :type injector: DependencyInjector
+        """
+        self._logger = logging.getLogger(__name__)
+        self._injector = injector
+
+    def validate(self):
+        """
+        Analyze every registered service
+
+        :rtype: ValidationReport
+        """
+        report = ValidationReport()
+        identifiers = self._injector.get_identifiers()
+        dependencies = dict()
+        for identifier in identifiers:
+            dependencies[identifier] = self._get_dependencies(identifier, report)
+
+        report.cycles = self._find_cycles(identifiers, dependencies)
+        depths = dict()
+        for identifier in identifiers:
+            self._get_depth(identifier, dependencies, depths, list())
+        for identifier in identifiers:
+            report.metrics[identifier] = ServiceMetrics(
+                depth=depths[identifier],
+                fan_out=len(dependencies[identifier]),
+                fan_in=sum(1 for dependents in dependencies.values() if identifier in dependents),
+            )
+        self._logger.debug(
+            "%d services validated: %d errors, %d cycles",
+            len(identifiers),
+            len(report.errors),
+            len(report.cycles)
+        )
+        return report
+
+    def _get_dependencies(self, identifier, report):
+        """
+        Resolve statically each parameter of the service and return the services it depends on
+
+        :param identifier: The service identifier
+        :type identifier: string
+        :param report: The report to add the problems to
+        :type report: ValidationReport
+        :rtype: list
+        """
+        service = self._injector.get_service(identifier)
+        try:
+            parameters = self._injector.get_parameters(identifier)
+        except (TypeError, ValueError) as error:
+            report.errors.append(Problem(
+                identifier,
+                "Signature can't be analyzed: {0}".format(error)
+            ))
+            return list()
+
+        dependencies = list()
+        for method_parameter in parameters:
+            try:
+                resolution = self._injector.get_resolution(identifier, method_parameter)
+            except NotImplementedError as error:
+                report.warnings.append(Problem(
+                    identifier,
+                    "Argument {0} can't be validated: {1}".format(method_parameter.name, error)
+                ))
+                continue
+            if resolution is None:
+                self._check_unresolved(identifier, service, method_parameter, report)
+            elif resolution.kind in (SERVICE, CLASS):
+                dependency = self._injector.resolve_identifier(resolution.value)
+                if not self._injector.has_service(dependency):
+                    report.errors.append(Problem(
+                        identifier,
+                        "Argument {0} references an unknown service: {1}".format(
+                            method_parameter.name,
+                            dependency
+                        )
+                    ))
+                elif resolution.kind == SERVICE and dependency not in dependencies:
+                    dependencies.append(dependency)
+            elif resolution.kind == MULTI:
+                for dependency in self._injector.get_tagged_identifiers(resolution.value):
+                    if dependency not in dependencies:
+                        dependencies.append(dependency)
+        return dependencies
+
+    @staticmethod
+    def _check_unresolved(identifier, service, method_parameter, report):
+        if (method_parameter.kind in [Parameter.VAR_POSITIONAL, Parameter.VAR_KEYWORD] or
+                method_parameter.default is not Parameter.empty):
+            return
+        if isinstance(service.lifetime, MultitonLifetime):
+            # Parameterized services receive their missing arguments at runtime
+            report.warnings.append(Problem(
+                identifier,
+                "Argument {0} must be given at runtime".format(method_parameter.name)
+            ))
+            return
+        report.errors.append(Problem(
+            identifier,
+            "A required argument is not set: {0}".format(method_parameter.name)
+        ))
+
+    @staticmethod
+    def _find_cycles(identifiers, dependencies):
+        """
+        Return each elementary cycle found by a depth first traversal of the graph
+
+        :rtype: list
+        """
+        cycles = list()
+        seen = set()
+        visited = set()
+
+        def visit(identifier, path):
+            if identifier in path:
+                cycle = path[path.index(identifier):]
+                # Cycles are reported once whatever the service they are entered by
+                key = frozenset(cycle)
+                if key not in seen:
+                    seen.add(key)
+                    cycles.append(cycle + [identifier])
+                return
+            if identifier in visited:
+                return
+            path.append(identifier)
+            for dependency in dependencies.get(identifier, list()):
+                visit(dependency, path)
+            path.pop()
+            visited.add(identifier)
+
+        for identifier in identifiers:
+            visit(identifier, list())
+        return cycles
+
+    def _get_depth(self, identifier, dependencies, depths, path):
+        if identifier in depths:
+            return depths[identifier]
+        if identifier in path:
+            # Edges closing a cycle do not add to the depth
+            return -1
+        path.append(identifier)
+        depth = 0
+        for dependency in dependencies.get(identifier, list()):
+            depth = max(depth, self._get_depth(dependency, dependencies, depths, path) + 1)
+        path.pop()
+        depths[identifier] = depth
+        return depth
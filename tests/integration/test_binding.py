@@ -0,0 +1,87 @@
+from abc import ABC, abstractmethod
+from unittest import TestCase
+
+from pyjection.dependency_injector import DependencyInjector
+from pyjection.errors import ArgumentNotFoundError
+
+
+class Repository(ABC):
+
+    @abstractmethod
+    def find(self):
+        pass
+
+
+class SqlRepository(Repository):
+
+    def find(self):
+        return 'sql'
+
+
+class MemoryRepository(Repository):
+
+    def find(self):
+        return 'memory'
+
+
+class Consumer(object):
+
+    def __init__(self, repo: Repository):
+        self.repo = repo
+
+
+class TestBinding(TestCase):
+
+    def setUp(self):
+        self._container = DependencyInjector()
+        self._container.register(SqlRepository)
+        self._container.register(MemoryRepository)
+        self._container.register(Consumer)
+
+    def test_unbound(self):
+        with self.assertRaises(ArgumentNotFoundError):
+            self._container.get(Consumer)
+
+    def test_bind(self):
+        self._container.bind(Repository, MemoryRepository)
+        consumer = self._container.get(Consumer)
+        self.assertIsInstance(consumer.repo, MemoryRepository)
+
+    def test_get_interface(self):
+        self._container.bind(Repository, 'sql_repository')
+        self.assertIsInstance(self._container.get(Repository), SqlRepository)
+        self.assertTrue(self._container.has_service(Repository))
+
+    def test_registered_service_takes_precedence(self):
+        self._container.bind(Repository, MemoryRepository)
+        self._container.register(SqlRepository, 'repository')
+        self.assertIsInstance(self._container.get(Repository), SqlRepository)
+
+
+class TestMroIndex(TestCase):
+
+    def setUp(self):
+        self._container = DependencyInjector(index_mro=True)
+        self._container.register(SqlRepository)
+        self._container.register(Consumer)
+
+    def test_single_implementation(self):
+        consumer = self._container.get(Consumer)
+        self.assertIsInstance(consumer.repo, SqlRepository)
+
+    def test_ambiguous_implementations(self):
+        self._container.register(MemoryRepository)
+        with self.assertRaises(ArgumentNotFoundError):
+            self._container.get(Consumer)
+
+    def test_explicit_binding_resolves_ambiguity(self):
+        self._container.register(MemoryRepository)
+        self._container.bind(Repository, MemoryRepository)
+        consumer = self._container.get(Consumer)
+        self.assertIsInstance(consumer.repo, MemoryRepository)
+
+    def test_registered_again(self):
+        self._container.register(MemoryRepository)
+        self._container.register(Consumer, 'memory_repository')
+        consumer = self._container.get(Consumer)
+        self.assertIsInstance(consumer.repo, SqlRepository)
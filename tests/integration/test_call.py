@@ -0,0 +1,111 @@
+import gc
+from unittest import TestCase
+
+from pyjection.dependency_injector import DependencyInjector
+from pyjection.errors import ArgumentNotFoundError
+from pyjection.resolvers import BaseResolver, NameResolver
+
+
+class Repository(object):
+    pass
+
+
+class Handler(object):
+
+    def handle(self, request, repository: Repository):
+        return request, repository
+
+
+def handler(request, repository, optional=None, *args, **kwargs):
+    return request, repository, optional
+
+
+def typed_handler(request, repo: Repository):
+    return request, repo
+
+
+def variadic_handler(request, *args, repo: Repository):
+    return request, args, repo
+
+
+class DynamicResolver(BaseResolver):
+
+    def resolve(self, method_parameter, service, injector):
+        if method_parameter.name == 'request':
+            return 'dynamic'
+
+
+class TestCall(TestCase):
+
+    def setUp(self):
+        self._container = DependencyInjector()
+        self._container.register(Repository)
+
+    def test_call(self):
+        request, repository, optional = self._container.call(handler, 'request')
+        self.assertEqual(request, 'request')
+        self.assertIsInstance(repository, Repository)
+        self.assertIsNone(optional)
+
+    def test_call_explicit(self):
+        explicit = Repository()
+        _, repository, optional = self._container.call(
+            handler,
+            request='request',
+            repository=explicit
+        )
+        self.assertIs(repository, explicit)
+
+    def test_call_typed(self):
+        _, repo = self._container.call(typed_handler, 'request')
+        self.assertIsInstance(repo, Repository)
+
+    def test_call_method(self):
+        _, repository = self._container.call(Handler().handle, 'request')
+        self.assertIsInstance(repository, Repository)
+
+    def test_call_keyword_only_after_var_positional(self):
+        request, args, repo = self._container.call(variadic_handler, 1, 2, 3)
+        self.assertEqual((request, args), (1, (2, 3)))
+        self.assertIsInstance(repo, Repository)
+
+    def test_missing_argument(self):
+        with self.assertRaises(ArgumentNotFoundError):
+            self._container.call(handler)
+
+    def test_plan_cached(self):
+        self._container.call(handler, 'request')
+        plan = self._container._get_call_plan(handler)
+        self.assertIs(plan, self._container._get_call_plan(handler))
+
+    def test_plan_released_with_function(self):
+        def closure(repository):
+            return repository
+
+        self._container.call(closure)
+        self.assertEqual(len(self._container._call_plans), 1)
+        del closure
+        gc.collect()
+        self.assertEqual(len(self._container._call_plans), 0)
+        self.assertEqual(len(self._container._signature_cache._callable_parameters), 0)
+
+    def test_plan_invalidated_on_register(self):
+        with self.assertRaises(ArgumentNotFoundError):
+            self._container.call(handler)
+        self._container.register('registered', 'request')
+        request, _, _ = self._container.call(handler)
+        self.assertEqual(request, 'registered')
+
+    def test_inject(self):
+        decorated = self._container.inject(handler)
+        request, repository, _ = decorated('request')
+        self.assertEqual(request, 'request')
+        self.assertIsInstance(repository, Repository)
+        self.assertEqual(decorated.__name__, 'handler')
+
+    def test_dynamic_resolver(self):
+        container = DependencyInjector([DynamicResolver(), NameResolver()])
+        container.register(Repository)
+        request, repository, _ = container.call(handler)
+        self.assertEqual(request, 'dynamic')
+        self.assertIsInstance(repository, Repository)
@@ -0,0 +1,119 @@
+from unittest import TestCase
+
+from pyjection.dependency_injector import DependencyInjector
+from pyjection.memory import MemoryTracker
+from pyjection.reference import Reference
+
+
+class Repository(object):
+    pass
+
+
+class Clock(object):
+    pass
+
+
+class FakeClock(object):
+    pass
+
+
+class RequestContext(object):
+    pass
+
+
+class RequestHandler(object):
+
+    def __init__(self, repository: Repository, clock, context: RequestContext, user_id, timeout=10):
+        self.repository = repository
+        self.clock = clock
+        self.context = context
+        self.user_id = user_id
+        self.timeout = timeout
+
+
+class User(object):
+    pass
+
+
+class Handler(object):
+
+    def __init__(self, repository: Repository, request_context, user):
+        self.repository = repository
+        self.request_context = request_context
+        self.user = user
+
+
+class TestFactory(TestCase):
+
+    def setUp(self):
+        self._container = DependencyInjector()
+        self._container.register_singleton(Repository)
+        self._container.register(Clock)
+
+    def test_runtime_arguments(self):
+        create_handler = self._container.factory_for(RequestHandler)
+        context = RequestContext()
+        handler = create_handler(context, user_id=3)
+        self.assertIs(handler.context, context)
+        self.assertEqual(handler.user_id, 3)
+        self.assertEqual(handler.timeout, 10)
+        self.assertIs(handler.repository, self._container.get(Repository))
+        self.assertIsInstance(handler.clock, Clock)
+
+    def test_dependencies_follow_their_lifetime(self):
+        create_handler = self._container.factory_for(RequestHandler)
+        handler1 = create_handler(RequestContext(), 1)
+        handler2 = create_handler(RequestContext(), 2)
+        self.assertIs(handler1.repository, handler2.repository)
+        self.assertIsNot(handler1.clock, handler2.clock)
+
+    def test_explicit_runtime_parameters(self):
+        self._container.register(RequestContext)
+        create_handler = self._container.factory_for(RequestHandler, runtime=['user_id', 'timeout'])
+        handler = create_handler(5, 20)
+        self.assertIsInstance(handler.context, RequestContext)
+        self.assertEqual(handler.timeout, 20)
+
+    def test_injected_argument_overridden(self):
+        clock = Clock()
+        handler = self._container.factory_for(RequestHandler)(RequestContext(), 1, clock=clock)
+        self.assertIs(handler.clock, clock)
+
+    def test_registered_service_arguments(self):
+        self._container.register(RequestHandler).add_argument('clock', Reference('repository'))
+        handler = self._container.factory_for('request_handler')(RequestContext(), 1)
+        self.assertIs(handler.clock, self._container.get(Repository))
+
+    def test_plan_updated_on_registration(self):
+        create_handler = self._container.factory_for(RequestHandler, runtime=['user_id'])
+        self._container.register(RequestContext)
+        handler = create_handler(1)
+        self.assertIsInstance(handler.context, RequestContext)
+
+    def test_class_argument_follows_override(self):
+        self._container.register(RequestHandler).add_argument(
+            'clock', Reference('clock', return_class=True)
+        )
+        create_handler = self._container.factory_for('request_handler')
+        self.assertIs(create_handler(RequestContext(), 1).clock, Clock)
+        with self._container.override(Clock, FakeClock):
+            self.assertIs(create_handler(RequestContext(), 1).clock, FakeClock)
+        self.assertIs(create_handler(RequestContext(), 1).clock, Clock)
+
+    def test_too_many_arguments(self):
+        create_handler = self._container.factory_for(RequestHandler)
+        with self.assertRaises(TypeError):
+            create_handler(RequestContext(), 1, 2)
+
+    def test_runtime_parameters_fixed_on_creation(self):
+        create_handler = self._container.factory_for(Handler)
+        self._container.register(User)
+        handler = create_handler('ctx', 'alice')
+        self.assertEqual((handler.request_context, handler.user), ('ctx', 'alice'))
+
+    def test_construction_recorded(self):
+        tracker = MemoryTracker()
+        container = DependencyInjector(memory_tracker=tracker)
+        container.register(Repository)
+        container.factory_for(Handler)('ctx', 'alice')
+        self.assertEqual(tracker.snapshot()['handler'].created, 1)
@@ -0,0 +1,114 @@
+import time
+from unittest import TestCase
+
+from pyjection.compiler import ContainerCompiler
+from pyjection.dependency_injector import DependencyInjector
+from pyjection.interceptors import BaseInterceptor, MemoizingInterceptor
+
+
+class Repository(object):
+
+    def __init__(self):
+        self.calls = 0
+
+    def find(self, key, default=None):
+        self.calls += 1
+        return [key, default]
+
+    def count(self):
+        self.calls += 1
+        return self.calls
+
+
+class SlotsRepository(object):
+    __slots__ = ()
+
+    def find(self, key):
+        return key
+
+
+class Tagging(BaseInterceptor):
+
+    def intercept(self, identifier, instance):
+        instance.tag = identifier
+        return instance
+
+
+class TestInterceptors(TestCase):
+
+    def setUp(self):
+        self._interceptor = MemoizingInterceptor(['find'], max_size=2)
+        self._container = DependencyInjector()
+        self._container.register(Repository, interceptors=[self._interceptor])
+
+    def test_cached(self):
+        repository = self._container.get('repository')
+        self.assertEqual(repository.find('a'), ['a', None])
+        self.assertIs(repository.find('a'), repository.find('a'))
+        self.assertEqual(repository.find('a', default=1), ['a', 1])
+        self.assertEqual(repository.calls, 2)
+        stats = self._interceptor.stats()['find']
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_factory_cached(self):
+        repository = self._container.factory_for(Repository)()
+        repository.find('a')
+        repository.find('a')
+        self.assertEqual(repository.calls, 1)
+
+    def test_compiled_through_injector(self):
+        source = ContainerCompiler(self._container, 'module:injector').compile()
+        self.assertIn("return _injector.get('repository')", source)
+
+    def test_other_methods_not_cached(self):
+        repository = self._container.get('repository')
+        self.assertEqual(repository.count(), 1)
+        self.assertEqual(repository.count(), 2)
+
+    def test_cache_per_instance(self):
+        repository1 = self._container.get('repository')
+        repository2 = self._container.get('repository')
+        repository1.find('a')
+        repository2.find('a')
+        self.assertEqual(repository2.calls, 1)
+
+    def test_eviction(self):
+        repository = self._container.get('repository')
+        for key in ['a', 'b', 'c', 'a']:
+            repository.find(key)
+        self.assertEqual(repository.calls, 4)
+        self.assertEqual(self._interceptor.stats()['find']['evictions'], 2)
+
+    def test_ttl(self):
+        interceptor = MemoizingInterceptor(['find'], ttl=0.01)
+        self._container.register(Repository, 'expiring', interceptors=[interceptor])
+        repository = self._container.get('expiring')
+        repository.find('a')
+        time.sleep(0.02)
+        repository.find('a')
+        self.assertEqual(repository.calls, 2)
+
+    def test_keyword_arguments_distinct_from_positional(self):
+        repository = self._container.get('repository')
+        self.assertEqual(repository.find(key='a'), ['a', None])
+        self.assertEqual(repository.find((), (('key', 'a'),)), [(), (('key', 'a'),)])
+        self.assertEqual(repository.calls, 2)
+
+    def test_unhashable_arguments(self):
+        repository = self._container.get('repository')
+        repository.find(['a'])
+        repository.find(['a'])
+        self.assertEqual(repository.calls, 2)
+        self.assertEqual(self._interceptor.stats()['find']['uncacheable'], 2)
+
+    def test_slots(self):
+        self._container.register(SlotsRepository, interceptors=[MemoizingInterceptor(['find'])])
+        with self.assertLogs('pyjection.interceptors', 'WARNING'):
+            repository = self._container.get('slots_repository')
+        self.assertEqual(repository.find('a'), 'a')
+
+    def test_custom_interceptor(self):
+        self._container.register_singleton(Repository, 'tagged').add_interceptor(Tagging())
+        self.assertEqual(self._container.get('tagged').tag, 'tagged')
@@ -0,0 +1,113 @@
+import asyncio
+from unittest import TestCase
+
+from pyjection.dependency_injector import DependencyInjector
+from pyjection.errors import CircularDependencyError
+
+
+closed = list()
+
+
+class Connection(object):
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        closed.append('connection')
+
+
+class Repository(object):
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def close(self):
+        closed.append('repository')
+
+
+class Client(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        closed.append('client')
+
+
+class AsyncClient(object):
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        closed.append('async_client')
+
+
+class LoopClass(object):
+
+    def __init__(self, loop_class):
+        self.loop_class = loop_class
+
+
+class TestLifecycle(TestCase):
+
+    def setUp(self):
+        del closed[:]
+        self._container = DependencyInjector()
+        self._container.register_singleton(Connection)
+        self._container.register_singleton(Repository).on_close(Repository.close)
+        self._container.register_singleton(Client)
+
+    def test_reverse_dependency_order(self):
+        self._container.get('repository')
+        self._container.get('client')
+        self._container.shutdown()
+        self.assertEqual(closed, ['client', 'repository', 'connection'])
+
+    def test_concurrent(self):
+        self._container.get('repository')
+        self._container.get('client')
+        self._container.shutdown(concurrent=True)
+        self.assertEqual(len(closed), 3)
+        self.assertLess(closed.index('repository'), closed.index('connection'))
+
+    def test_not_created_not_disposed(self):
+        self._container.get('client')
+        self._container.shutdown()
+        self.assertEqual(closed, ['client'])
+
+    def test_singleton_recreated_after_shutdown(self):
+        client1 = self._container.get('client')
+        self._container.shutdown()
+        client2 = self._container.get('client')
+        self.assertIsNot(client1, client2)
+
+    def test_transient_not_disposed(self):
+        self._container.register(Client, 'transient_client')
+        self._container.get('transient_client')
+        self._container.shutdown()
+        self.assertEqual(closed, [])
+
+    def test_registered_instance_with_callback(self):
+        service = self._container.register(Client(), 'instance')
+        service.on_close(lambda instance: closed.append('instance'))
+        self._container.register(Client(), 'other_instance')
+        self._container.get('client')
+        self._container.shutdown()
+        self.assertEqual(closed, ['client', 'instance'])
+
+    def test_ashutdown(self):
+        self._container.register_singleton(AsyncClient)
+        self._container.get('async_client')
+        self._container.get('repository')
+        asyncio.run(self._container.ashutdown())
+        self.assertEqual(closed, ['repository', 'connection', 'async_client'])
+
+    def test_ashutdown_concurrent(self):
+        async def close(instance):
+            closed.append('async_callback')
+        self._container.register_singleton(AsyncClient).on_close(close)
+        self._container.get('async_client')
+        self._container.get('repository')
+        asyncio.run(self._container.ashutdown(concurrent=True))
+        self.assertEqual(sorted(closed), ['async_callback', 'connection', 'repository'])
+
+    def test_circular_dependency(self):
+        self._container.register(LoopClass)
+        with self.assertRaises(CircularDependencyError):
+            self._container.get('loop_class')
@@ -0,0 +1,75 @@
+import gc
+from unittest import TestCase
+
+from pyjection.dependency_injector import DependencyInjector
+from pyjection.memory import MemoryTracker
+
+
+class Buffer(object):
+
+    def __init__(self):
+        self.data = bytearray(100000)
+
+
+class Consumer(object):
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+
+
+class Number(int):
+    __slots__ = ()
+
+
+class TestMemoryTracker(TestCase):
+
+    def setUp(self):
+        self._tracker = MemoryTracker()
+        self._container = DependencyInjector(memory_tracker=self._tracker)
+        self._container.register(Buffer)
+        self._container.register(Consumer)
+
+    def tearDown(self):
+        self._tracker.stop()
+
+    def test_live_instances(self):
+        retained = [self._container.get('consumer') for _ in range(3)]
+        self._container.get('buffer')
+        gc.collect()
+        snapshot = self._tracker.snapshot()
+        self.assertEqual(snapshot['buffer'].created, 4)
+        self.assertEqual(snapshot['buffer'].live, 3)
+        self.assertEqual(snapshot['consumer'].live, 3)
+        del retained[:]
+        gc.collect()
+        self.assertEqual(self._tracker.snapshot()['consumer'].live, 0)
+
+    def test_untracked(self):
+        self._container.register(Number)
+        self._container.get('number')
+        snapshot = self._tracker.snapshot()
+        self.assertEqual(snapshot['number'].untracked, 1)
+        self.assertEqual(snapshot['number'].live, 0)
+
+    def test_registered_instance_not_recorded(self):
+        self._container.register(Buffer(), 'instance')
+        self._container.get('instance')
+        self.assertNotIn('instance', self._tracker.snapshot())
+
+    def test_allocations(self):
+        self._tracker.stop()
+        self._tracker = MemoryTracker(trace_allocations=True)
+        self._container = DependencyInjector(memory_tracker=self._tracker)
+        self._container.register(Buffer)
+        self._container.register(Consumer)
+        consumer = self._container.get('consumer')
+        snapshot = self._tracker.snapshot()
+        self.assertGreaterEqual(snapshot['buffer'].allocated, 100000)
+        # The buffer is accounted to its own service
+        self.assertLess(snapshot['consumer'].allocated, 100000)
+        self.assertIsInstance(consumer.buffer, Buffer)
+
+    def test_reset(self):
+        self._container.get('buffer')
+        self._tracker.reset()
+        self.assertEqual(self._tracker.snapshot(), dict())
@@ -0,0 +1,82 @@
+from typing import List, Sequence
+from unittest import TestCase
+
+from pyjection.compiler import ContainerCompiler
+from pyjection.dependency_injector import DependencyInjector
+from pyjection.reference import Reference
+
+
+class Plugin(object):
+    pass
+
+
+class FirstPlugin(Plugin):
+    pass
+
+
+class SecondPlugin(Plugin):
+    pass
+
+
+class Dispatcher(object):
+
+    def __init__(self, plugins: List[Plugin]):
+        self.plugins = plugins
+
+
+class SequenceDispatcher(object):
+
+    def __init__(self, plugins: Sequence[Plugin]):
+        self.plugins = plugins
+
+
+class ReferenceDispatcher(object):
+
+    def __init__(self, plugins):
+        self.plugins = plugins
+
+
+class TestMultiBinding(TestCase):
+
+    def setUp(self):
+        self._container = DependencyInjector()
+        self._container.register_singleton(FirstPlugin, tags=[Plugin])
+        self._container.register(SecondPlugin, tags=['plugin'])
+        self._container.register(Dispatcher)
+        self._container.register(SequenceDispatcher)
+        service = self._container.register(ReferenceDispatcher)
+        service.add_argument('plugins', Reference(Plugin, multi=True))
+
+    def test_get_all(self):
+        plugins = self._container.get_all(Plugin)
+        self.assertEqual([type(plugin) for plugin in plugins], [FirstPlugin, SecondPlugin])
+
+    def test_get_all_unknown_tag(self):
+        self.assertEqual(self._container.get_all('unknown'), [])
+
+    def test_singleton_member_reused(self):
+        plugins1 = self._container.get_all('plugin')
+        plugins2 = self._container.get_all('plugin')
+        self.assertIs(plugins1[0], plugins2[0])
+        self.assertIsNot(plugins1[1], plugins2[1])
+
+    def test_list_annotation(self):
+        dispatcher = self._container.get(Dispatcher)
+        plugin_types = [type(plugin) for plugin in dispatcher.plugins]
+        self.assertEqual(plugin_types, [FirstPlugin, SecondPlugin])
+
+    def test_sequence_annotation(self):
+        dispatcher = self._container.get(SequenceDispatcher)
+        self.assertEqual(len(dispatcher.plugins), 2)
+
+    def test_reference(self):
+        dispatcher = self._container.get(ReferenceDispatcher)
+        self.assertEqual(len(dispatcher.plugins), 2)
+
+    def test_registered_again(self):
+        self._container.register(SecondPlugin)
+        self.assertEqual(self._container.get_tagged_identifiers(Plugin), ['first_plugin'])
+
+    def test_compiled(self):
+        source = ContainerCompiler(self._container, 'module:injector').compile()
+        self.assertIn('plugins=[_build_0(), _build_1()]', source)
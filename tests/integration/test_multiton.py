@@ -0,0 +1,115 @@
+import threading
+import time
+from unittest import TestCase
+
+from pyjection.dependency_injector import DependencyInjector
+
+
+class Settings(object):
+    pass
+
+
+class Database(object):
+
+    def __init__(self, settings, shard, timeout=10):
+        self.settings = settings
+        self.shard = shard
+        self.timeout = timeout
+        self.closed = False
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.closed = True
+
+
+class SlowDatabase(Database):
+
+    created = 0
+
+    def __init__(self, settings, shard):
+        SlowDatabase.created += 1
+        time.sleep(0.05)
+        super().__init__(settings, shard)
+
+
+class TestRuntimeArguments(TestCase):
+
+    def setUp(self):
+        self._container = DependencyInjector()
+        self._container.register(Settings)
+        self._container.register(Database).add_arguments(shard=0, timeout=5)
+
+    def test_service_arguments(self):
+        database = self._container.get(Database)
+        self.assertEqual((database.shard, database.timeout), (0, 5))
+
+    def test_runtime_arguments_take_precedence(self):
+        database = self._container.get(Database, shard=3)
+        self.assertEqual((database.shard, database.timeout), (3, 5))
+        self.assertIsInstance(database.settings, Settings)
+
+
+class TestMultiton(TestCase):
+
+    def setUp(self):
+        self._container = DependencyInjector()
+        self._container.register(Settings)
+        self._service = self._container.register_multiton(Database, max_size=2)
+
+    def test_same_arguments(self):
+        database1 = self._container.get(Database, shard=1)
+        database2 = self._container.get(Database, shard=1)
+        self.assertIs(database1, database2)
+
+    def test_different_arguments(self):
+        database1 = self._container.get(Database, shard=1)
+        database2 = self._container.get(Database, shard=2)
+        self.assertIsNot(database1, database2)
+
+    def test_lru_eviction(self):
+        database1 = self._container.get(Database, shard=1)
+        self._container.get(Database, shard=2)
+        self._container.get(Database, shard=1)
+        database3 = self._container.get(Database, shard=3)
+        self.assertFalse(database1.closed)
+        self.assertIs(self._container.get(Database, shard=1), database1)
+        self.assertIsNot(self._container.get(Database, shard=2), database3)
+        self.assertEqual(self._service.lifetime.stats()['evictions'], 2)
+
+    def test_ttl(self):
+        self._service.lifetime._ttl = 0.001
+        database1 = self._container.get(Database, shard=1)
+        time.sleep(0.01)
+        database2 = self._container.get(Database, shard=1)
+        self.assertIsNot(database1, database2)
+        self.assertTrue(database1.closed)
+
+    def test_stats(self):
+        self._container.get(Database, shard=1)
+        self._container.get(Database, shard=1)
+        stats = self._service.lifetime.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (1, 1, 1))
+
+    def test_shutdown(self):
+        database = self._container.get(Database, shard=1)
+        self._container.shutdown()
+        self.assertTrue(database.closed)
+        self.assertEqual(self._service.lifetime.stats()['size'], 0)
+
+    def test_concurrent_misses(self):
+        SlowDatabase.created = 0
+        service = self._container.register_multiton(SlowDatabase)
+        results = list()
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(self._container.get(SlowDatabase, shard=1))
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(SlowDatabase.created, 1)
+        self.assertEqual(len(set(id(database) for database in results)), 1)
+        self.assertFalse(results[0].closed)
+        self.assertEqual(service.lifetime.stats()['misses'], 1)
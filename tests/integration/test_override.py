@@ -0,0 +1,69 @@
+from unittest import TestCase
+
+from pyjection.dependency_injector import DependencyInjector
+
+
+class Repository(object):
+    pass
+
+
+class FakeRepository(object):
+    pass
+
+
+class Service(object):
+
+    def __init__(self, repository):
+        self.repository = repository
+
+
+class Controller(object):
+
+    def __init__(self, service):
+        self.service = service
+
+
+class Unrelated(object):
+    pass
+
+
+def handler(cache):
+    return cache
+
+
+class TestOverride(TestCase):
+
+    def setUp(self):
+        self._container = DependencyInjector()
+        self._container.register_singleton(Repository)
+        self._container.register_singleton(Service)
+        self._container.register_singleton(Controller)
+        self._container.register_singleton(Unrelated)
+        self._controller = self._container.get(Controller)
+        self._unrelated = self._container.get(Unrelated)
+
+    def test_override_instance(self):
+        fake = FakeRepository()
+        with self._container.override(Repository, fake):
+            controller = self._container.get(Controller)
+        self.assertIs(controller.service.repository, fake)
+
+    def test_override_class(self):
+        with self._container.override('repository', FakeRepository):
+            controller = self._container.get(Controller)
+        self.assertIsInstance(controller.service.repository, FakeRepository)
+
+    def test_unrelated_singleton_kept(self):
+        with self._container.override(Repository, FakeRepository()):
+            self.assertIs(self._container.get(Unrelated), self._unrelated)
+
+    def test_restored(self):
+        with self._container.override(Repository, FakeRepository()):
+            self._container.get(Controller)
+        self.assertIs(self._container.get(Controller), self._controller)
+        self.assertIsInstance(self._container.get(Repository), Repository)
+
+    def test_new_service(self):
+        with self._container.override('cache', 'cached'):
+            self.assertEqual(self._container.call(handler), 'cached')
+        self.assertFalse(self._container.has_service('cache'))
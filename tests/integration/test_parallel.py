@@ -0,0 +1,167 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from pyjection.dependency_injector import DependencyInjector
+from pyjection.errors import CircularDependencyError
+from pyjection.profiling import SlowResolutionSampler
+from pyjection.tracing import Tracer, InMemoryExporter
+
+built = list()
+lock = threading.Lock()
+
+
+class SlowClient(object):
+
+    def __init__(self):
+        time.sleep(0.05)
+        with lock:
+            built.append(type(self).__name__)
+
+
+class FirstClient(SlowClient):
+    pass
+
+
+class SecondClient(SlowClient):
+    pass
+
+
+class ThirdClient(SlowClient):
+    pass
+
+
+class Shared(SlowClient):
+    pass
+
+
+class FirstRepository(object):
+
+    def __init__(self, first_client, shared):
+        self.first_client = first_client
+        self.shared = shared
+
+
+class SecondRepository(object):
+
+    def __init__(self, second_client, shared):
+        self.second_client = second_client
+        self.shared = shared
+
+
+class Application(object):
+
+    def __init__(self, first_repository, second_repository, third_client, name='application'):
+        self.first_repository = first_repository
+        self.second_repository = second_repository
+        self.third_client = third_client
+
+
+class First(object):
+
+    def __init__(self, second, third_client):
+        self.second = second
+
+
+class Second(object):
+
+    def __init__(self, first, third_client):
+        self.first = first
+
+
+class Connection(object):
+    pass
+
+
+class Dao(object):
+
+    def __init__(self, connection):
+        self.connection = connection
+
+
+class Report(object):
+
+    def __init__(self, connection, dao, first_client, second_client):
+        self.connection = connection
+        self.dao = dao
+
+
+class TestParallel(TestCase):
+
+    def setUp(self):
+        del built[:]
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        self._container = DependencyInjector(executor=self._executor)
+        for subject in [FirstClient, SecondClient, ThirdClient, Shared]:
+            self._container.register_singleton(subject)
+        self._container.register(FirstRepository)
+        self._container.register(SecondRepository)
+        self._container.register(Application)
+
+    def tearDown(self):
+        self._executor.shutdown()
+
+    def test_concurrent_construction(self):
+        start = time.monotonic()
+        application = self._container.get('application')
+        duration = time.monotonic() - start
+        self.assertLess(duration, 0.2)
+        self.assertIs(application.first_repository.shared, application.second_repository.shared)
+        self.assertEqual(sorted(built), ['FirstClient', 'SecondClient', 'Shared', 'ThirdClient'])
+
+    def test_dependencies_recorded(self):
+        self._container.get('application')
+        self.assertIn('first_client', self._container._dependencies['first_repository'])
+
+    def test_warm(self):
+        start = time.monotonic()
+        self._container.warm()
+        self.assertLess(time.monotonic() - start, 0.15)
+        self.assertEqual(len(built), 4)
+        self._container.get('application')
+        self.assertEqual(len(built), 4)
+
+    def test_circular_dependency(self):
+        self._container.register(First)
+        self._container.register(Second)
+        with self.assertRaises(CircularDependencyError):
+            self._container.get('first')
+
+    def test_thread_local_resolved_in_calling_thread(self):
+        self._container.register_thread_local(Connection)
+        self._container.register(Dao)
+        self._container.register(Report)
+        report = self._container.get('report')
+        connection = self._container.get('connection')
+        self.assertIs(report.connection, connection)
+        self.assertIs(report.dao.connection, connection)
+
+    def test_tracing(self):
+        exporter = InMemoryExporter()
+        container = DependencyInjector(executor=self._executor, tracer=Tracer(exporter))
+        for subject in [FirstClient, SecondClient, ThirdClient, Shared]:
+            container.register_singleton(subject)
+        container.register(FirstRepository)
+        container.register(SecondRepository)
+        container.register(Application)
+        container.get('application')
+        spans = {span.identifier: span for span in exporter.spans}
+        self.assertIsNone(spans['application'].parent_id)
+        for identifier in ['first_repository', 'second_repository']:
+            self.assertEqual(spans[identifier].parent_id, spans['application'].span_id)
+            self.assertEqual(spans[identifier].resolver, 'NameResolver')
+        self.assertEqual(spans['second_client'].parent_id, spans['second_repository'].span_id)
+
+    def test_sampled_in_a_single_sample(self):
+        sampler = SlowResolutionSampler(threshold=0)
+        container = DependencyInjector(executor=self._executor, sampler=sampler)
+        for subject in [FirstClient, SecondClient, ThirdClient, Shared]:
+            container.register_singleton(subject)
+        container.register(FirstRepository)
+        container.register(SecondRepository)
+        container.register(Application)
+        container.get('application')
+        samples = sampler.samples()
+        self.assertEqual(len(samples), 1)
+        self.assertEqual(len(samples[0].constructions), 7)
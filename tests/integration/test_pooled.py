@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import time
+from unittest import TestCase
+
+from pyjection.dependency_injector import DependencyInjector
+from pyjection.errors import PoolTimeoutError
+
+
+class Client(object):
+
+    def __init__(self):
+        self.closed = False
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.closed = True
+
+
+class TestPooled(TestCase):
+
+    def setUp(self):
+        self._container = DependencyInjector()
+        self._service = self._container.register_pooled(Client, max_size=2, timeout=0.05)
+
+    def test_reused_after_scope(self):
+        with self._container.scope() as scope:
+            client1 = scope.get('client')
+        with self._container.scope():
+            client2 = self._container.get('client')
+        self.assertIs(client1, client2)
+
+    def test_distinct_within_scope(self):
+        with self._container.scope():
+            client1 = self._container.get('client')
+            client2 = self._container.get('client')
+        self.assertIsNot(client1, client2)
+
+    def test_timeout(self):
+        with self._container.scope():
+            self._container.get('client')
+            self._container.get('client')
+            with self.assertRaises(PoolTimeoutError):
+                self._container.get('client')
+
+    def test_release(self):
+        client1 = self._container.get('client')
+        self._container.release('client', client1)
+        client2 = self._container.get('client')
+        self.assertIs(client1, client2)
+
+    def test_wait_for_release(self):
+        self._service.lifetime._timeout = 1
+        client1 = self._container.get('client')
+        self._container.get('client')
+        timer = threading.Timer(0.01, self._container.release, ['client', client1])
+        timer.start()
+        client3 = self._container.get('client')
+        timer.join()
+        self.assertIs(client1, client3)
+        self.assertEqual(self._service.lifetime.stats()['waits'], 1)
+
+    def test_async_wait_for_release(self):
+        self._service.lifetime._timeout = 1
+
+        async def run():
+            async with self._container.scope():
+                client1 = await self._container.aget('client')
+                await self._container.aget('client')
+                loop = asyncio.get_running_loop()
+                loop.call_later(0.01, self._container.release, 'client', client1)
+                client3 = await self._container.aget('client')
+            return client1, client3
+
+        client1, client3 = asyncio.run(run())
+        self.assertIs(client1, client3)
+
+    def test_async_timeout(self):
+        async def run():
+            async with self._container.scope() as scope:
+                await scope.aget('client')
+                await scope.aget('client')
+                await scope.aget('client')
+
+        with self.assertRaises(PoolTimeoutError):
+            asyncio.run(run())
+
+    def test_idle_timeout(self):
+        self._service.lifetime._idle_timeout = 0.001
+        with self._container.scope():
+            client1 = self._container.get('client')
+        time.sleep(0.01)
+        client2 = self._container.get('client')
+        self.assertIsNot(client1, client2)
+        self.assertTrue(client1.closed)
+
+    def test_stats(self):
+        with self._container.scope():
+            self._container.get('client')
+            stats = self._service.lifetime.stats()
+        self.assertEqual(stats['in_use'], 1)
+        self.assertEqual(stats['utilization'], 0.5)
+        self.assertEqual(stats['created'], 1)
+        self.assertEqual(stats['checkouts'], 1)
+
+    def test_shutdown(self):
+        with self._container.scope():
+            client1 = self._container.get('client')
+        self._container.shutdown()
+        client2 = self._container.get('client')
+        self.assertTrue(client1.closed)
+        self.assertIsNot(client1, client2)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import dataclasses
+from unittest import TestCase
+
+from pyjection.dependency_injector import DependencyInjector
+from pyjection.errors import ArgumentNotFoundError
+
+
+class OuterClass(object):
+
+    def __init__(self, inner: InnerClass):
+        self.inner = inner
+
+
+class BrokenClass(object):
+
+    def __init__(self, inner: InnerClass, unknown: UnknownClass = None):
+        self.inner = inner
+
+
+class UnknownAnnotationClass(object):
+
+    def __init__(self, inner_class: UnknownClass):
+        self.inner_class = inner_class
+
+
+@dataclasses.dataclass
+class DataClass(object):
+    inner: InnerClass
+    foo: str = 'foo'
+
+
+class InnerClass(object):
+    pass
+
+
+class TestPostponedAnnotations(TestCase):
+
+    def setUp(self):
+        self._container = DependencyInjector()
+        self._container.register(InnerClass)
+        self._container.register(OuterClass)
+        self._container.register(BrokenClass)
+        self._container.register(UnknownAnnotationClass)
+        self._container.register(DataClass)
+
+    def test_forward_reference(self):
+        outer = self._container.get(OuterClass)
+        self.assertIsInstance(outer.inner, InnerClass)
+
+    def test_partially_evaluated(self):
+        broken = self._container.get(BrokenClass)
+        self.assertIsInstance(broken.inner, InnerClass)
+
+    def test_unknown_annotation_falls_back_to_name(self):
+        instance = self._container.get(UnknownAnnotationClass)
+        self.assertIsInstance(instance.inner_class, InnerClass)
+
+    def test_string_annotation_is_not_an_identifier(self):
+        self._container.register(InnerClass, 'UnknownClass')
+        del self._container._services['inner_class']
+        with self.assertRaises(ArgumentNotFoundError):
+            self._container.get(UnknownAnnotationClass)
+
+    def test_dataclass(self):
+        instance = self._container.get(DataClass)
+        self.assertIsInstance(instance.inner, InnerClass)
+        self.assertEqual(instance.foo, 'foo')
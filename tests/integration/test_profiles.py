@@ -0,0 +1,87 @@
+import os
+from unittest import TestCase, mock
+
+from pyjection.dependency_injector import DependencyInjector
+from pyjection.errors import ServiceNotFoundError
+
+
+class Mailer(object):
+    pass
+
+
+class SmtpMailer(Mailer):
+    pass
+
+
+class FakeMailer(Mailer):
+    pass
+
+
+class TestProfiles(TestCase):
+
+    def setUp(self):
+        self._container = DependencyInjector()
+        self._container.register(FakeMailer, 'mailer')
+        self._container.register(SmtpMailer, 'mailer', profiles={'prod'})
+
+    def test_active_profile(self):
+        self._container.finalize({'prod'})
+        self.assertIsInstance(self._container.get('mailer'), SmtpMailer)
+
+    def test_inactive_profile(self):
+        self._container.finalize({'dev'})
+        self.assertIsInstance(self._container.get('mailer'), FakeMailer)
+
+    def test_not_registered_before_finalize(self):
+        self._container.register_singleton(SmtpMailer, 'smtp', profiles={'prod'})
+        self.assertNotIn('smtp', self._container._services)
+        self._container.finalize({'prod'})
+        self.assertIn('smtp', self._container.get_identifiers())
+
+    def test_condition_evaluated_once(self):
+        condition = mock.Mock(return_value=True)
+        self._container.register(SmtpMailer, 'smtp', condition=condition)
+        self._container.finalize(set())
+        self._container.get('smtp')
+        self._container.get('smtp')
+        condition.assert_called_once_with()
+
+    def test_condition_not_fulfilled(self):
+        self._container.register(SmtpMailer, 'smtp', condition=lambda: False)
+        self._container.finalize(set())
+        with self.assertRaises(ServiceNotFoundError):
+            self._container.get('smtp')
+
+    def test_registered_after_finalize(self):
+        self._container.finalize({'prod'})
+        self._container.register(FakeMailer, 'fake', profiles={'dev'})
+        self._container.register(SmtpMailer, 'smtp', profiles={'prod'})
+        self.assertFalse(self._container.has_service('fake'))
+        self.assertTrue(self._container.has_service('smtp'))
+
+    def test_finalized_from_environment(self):
+        self._container.register(SmtpMailer, 'smtp', profiles={'prod'})
+        with mock.patch.dict(os.environ, {'PYJECTION_PROFILES': 'staging, prod'}):
+            smtp = self._container.get('smtp')
+        self.assertIsInstance(smtp, SmtpMailer)
+        self.assertIsInstance(self._container.get('mailer'), SmtpMailer)
+
+    @mock.patch.dict(os.environ, {'PYJECTION_PROFILES': 'prod'})
+    def test_finalized_before_first_retrieval(self):
+        self.assertIsInstance(self._container.get('mailer'), SmtpMailer)
+        with self.assertRaises(ServiceNotFoundError):
+            self._container.get('unknown')
+        self.assertIsInstance(self._container.get('mailer'), SmtpMailer)
+
+    @mock.patch.dict(os.environ, {'PYJECTION_PROFILES': 'prod'})
+    def test_finalized_before_listing(self):
+        self._container.register(SmtpMailer, 'smtp', tags=['mailers'], profiles={'prod'})
+        self.assertIn('smtp', self._container.get_identifiers())
+        self.assertTrue(self._container.has_tag('mailers'))
+        self.assertIs(self._container.get_service('mailer').subject, SmtpMailer)
+
+    def test_inactive_tags_dropped(self):
+        self._container.register(SmtpMailer, 'smtp', tags=['mailers'], profiles={'prod'})
+        self._container.register(FakeMailer, 'fake', tags=['mailers'], profiles={'dev'})
+        self._container.finalize({'dev'})
+        self.assertEqual(self._container.get_tagged_identifiers('mailers'), ['fake'])
@@ -0,0 +1,74 @@
+import pstats
+import time
+from unittest import TestCase
+
+from pyjection.dependency_injector import DependencyInjector
+from pyjection.profiling import SlowResolutionSampler
+
+
+class SlowClass(object):
+
+    def __init__(self):
+        time.sleep(0.02)
+
+
+class OuterClass(object):
+
+    def __init__(self, slow_class: SlowClass, fast_class):
+        self.slow_class = slow_class
+
+
+class FastClass(object):
+    pass
+
+
+class TestSlowResolutionSampler(TestCase):
+
+    def setUp(self):
+        self._sampler = SlowResolutionSampler(threshold=0.01, max_samples=2)
+        self._container = DependencyInjector(sampler=self._sampler)
+        self._container.register(SlowClass)
+        self._container.register(OuterClass)
+        self._container.register(FastClass)
+
+    def test_fast_resolution_not_sampled(self):
+        self._container.get('fast_class')
+        self.assertEqual(self._sampler.samples(), [])
+
+    def test_slow_resolution_sampled(self):
+        self._container.get('outer_class')
+        samples = self._sampler.samples()
+        self.assertEqual(len(samples), 1)
+        sample = samples[0]
+        self.assertEqual(sample.identifier, 'outer_class')
+        self.assertGreaterEqual(sample.duration, 0.02)
+        self.assertEqual(
+            [
+                (construction.identifier, construction.depth)
+                for construction in sample.constructions
+            ],
+            [('outer_class', 0), ('slow_class', 1), ('fast_class', 1)]
+        )
+        slow_construction = sample.constructions[1]
+        self.assertGreaterEqual(slow_construction.constructor_duration, 0.02)
+        self.assertEqual(
+            [(name, resolver) for name, resolver, _ in sample.constructions[0].arguments],
+            [('slow_class', 'TypingResolver'), ('fast_class', 'NameResolver')]
+        )
+        self.assertIsNone(sample.profile)
+        self.assertIn('slow_class by TypingResolver', self._sampler.format(sample))
+
+    def test_ring_buffer(self):
+        for _ in range(3):
+            self._container.get('slow_class')
+        self.assertEqual(len(self._sampler.samples()), 2)
+        self._sampler.clear()
+        self.assertEqual(self._sampler.samples(), [])
+
+    def test_profile(self):
+        sampler = SlowResolutionSampler(threshold=0.01, profile=True)
+        container = DependencyInjector(sampler=sampler)
+        container.register(SlowClass)
+        container.get('slow_class')
+        stats = pstats.Stats(sampler.samples()[0].profile)
+        self.assertTrue(any(function[2] == '__init__' for function in stats.stats))
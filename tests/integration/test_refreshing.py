@@ -0,0 +1,106 @@
+import threading
+import time
+from unittest import TestCase
+
+from pyjection.dependency_injector import DependencyInjector
+from pyjection.errors import CircularDependencyError
+
+
+class Credentials(object):
+
+    created = 0
+    started = threading.Event()
+    proceed = threading.Event()
+    failing = False
+
+    def __init__(self):
+        Credentials.created += 1
+        if Credentials.created > 1:
+            Credentials.started.set()
+            Credentials.proceed.wait(1)
+            if Credentials.failing:
+                raise ValueError('Credentials not available')
+        self.closed = False
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.closed = True
+
+
+class Session(object):
+
+    def __init__(self, token):
+        self.token = token
+
+
+class Token(object):
+
+    def __init__(self, session):
+        self.session = session
+
+
+class TestRefreshing(TestCase):
+
+    def setUp(self):
+        Credentials.created = 0
+        Credentials.failing = False
+        Credentials.started.clear()
+        Credentials.proceed.clear()
+        self._container = DependencyInjector()
+        self._service = self._container.register_refreshing(Credentials, ttl=0.01)
+
+    def _wait_for_refresh(self):
+        thread = self._service.lifetime._refresh_thread
+        if thread is not None:
+            thread.join(1)
+
+    def test_same_instance_before_expiration(self):
+        self._service.lifetime._ttl = 60
+        credentials1 = self._container.get('credentials')
+        credentials2 = self._container.get('credentials')
+        self.assertIs(credentials1, credentials2)
+
+    def test_previous_instance_returned_while_refreshing(self):
+        credentials1 = self._container.get('credentials')
+        time.sleep(0.02)
+        self.assertIs(self._container.get('credentials'), credentials1)
+        self.assertTrue(Credentials.started.wait(1))
+        # The rebuild is in progress, no other one is started
+        self.assertIs(self._container.get('credentials'), credentials1)
+        self.assertIs(self._container.get('credentials'), credentials1)
+        Credentials.proceed.set()
+        self._wait_for_refresh()
+        credentials2 = self._container.get('credentials')
+        self.assertIsNot(credentials1, credentials2)
+        self.assertTrue(credentials1.closed)
+        self.assertEqual(Credentials.created, 2)
+
+    def test_failed_refresh_keeps_instance(self):
+        Credentials.failing = True
+        Credentials.proceed.set()
+        credentials1 = self._container.get('credentials')
+        time.sleep(0.02)
+        self._container.get('credentials')
+        self._wait_for_refresh()
+        self.assertIs(self._container.get('credentials'), credentials1)
+        self.assertFalse(credentials1.closed)
+
+    def test_refresh_ahead(self):
+        self._service.lifetime._ttl = 60
+        self._service.lifetime._refresh_ahead = 60
+        Credentials.proceed.set()
+        credentials1 = self._container.get('credentials')
+        self._container.get('credentials')
+        self._wait_for_refresh()
+        self.assertIsNot(self._container.get('credentials'), credentials1)
+
+    def test_shutdown(self):
+        credentials1 = self._container.get('credentials')
+        self._container.shutdown()
+        self.assertTrue(credentials1.closed)
+        Credentials.proceed.set()
+        self.assertIsNot(self._container.get('credentials'), credentials1)
+
+    def test_circular_dependency(self):
+        self._container.register_refreshing(Session)
+        self._container.register_refreshing(Token)
+        self.assertRaises(CircularDependencyError, self._container.get, 'session')
@@ -1,3 +1,5 @@
+import threading
+import time
 from unittest import TestCase
 from pyjection.dependency_injector import DependencyInjector
 
@@ -20,3 +22,33 @@ class TestSingleton(TestCase):
         outer1 = self._container.get("outer_class")
         outer2 = self._container.get("outer_class")
         self.assertIs(outer1, outer2)
+
+    def test_built_once_by_concurrent_threads(self):
+        created = list()
+
+        class SlowClass(object):
+            def __init__(self):
+                created.append(self)
+                time.sleep(0.01)
+
+        self._container.register_singleton(SlowClass)
+        barrier = threading.Barrier(8)
+        results = list()
+
+        def worker():
+            barrier.wait()
+            results.append(self._container.get("slow_class"))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(created), 1)
+        self.assertEqual(len(set(map(id, results))), 1)
+
+    def test_register_does_not_mutate_snapshot(self):
+        services = self._container._services
+        self._container.register(OuterClass, "other_class")
+        self.assertNotIn("other_class", services)
+        self.assertIn("other_class", self._container._services)
@@ -0,0 +1,70 @@
+import asyncio
+import gc
+import threading
+from unittest import TestCase
+
+from pyjection.dependency_injector import DependencyInjector
+
+
+class Parser(object):
+
+    def __init__(self):
+        self.closed = False
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.closed = True
+
+
+class TestThreadLocal(TestCase):
+
+    def setUp(self):
+        self._container = DependencyInjector()
+        self._container.register_thread_local(Parser)
+        self._container.register_thread_local(Parser, 'task_parser', per_task=True)
+
+    def _get_in_thread(self, identifier):
+        results = list()
+        thread = threading.Thread(target=lambda: results.append(self._container.get(identifier)))
+        thread.start()
+        thread.join()
+        del thread
+        gc.collect()
+        return results[0]
+
+    def test_same_thread(self):
+        parser1 = self._container.get('parser')
+        parser2 = self._container.get('parser')
+        self.assertIs(parser1, parser2)
+
+    def test_other_thread(self):
+        parser1 = self._container.get('parser')
+        parser2 = self._get_in_thread('parser')
+        self.assertIsNot(parser1, parser2)
+
+    def test_disposed_on_thread_exit(self):
+        parser = self._get_in_thread('parser')
+        self.assertTrue(parser.closed)
+
+    def test_shutdown(self):
+        parser1 = self._container.get('parser')
+        self._container.shutdown()
+        parser2 = self._container.get('parser')
+        self.assertTrue(parser1.closed)
+        self.assertIsNot(parser1, parser2)
+
+    def test_per_task(self):
+        async def get_twice():
+            return self._container.get('task_parser'), self._container.get('task_parser')
+
+        async def run():
+            return await asyncio.gather(get_twice(), get_twice())
+
+        (parser1, parser2), (parser3, _) = asyncio.run(run())
+        self.assertIs(parser1, parser2)
+        self.assertIsNot(parser1, parser3)
+        self.assertTrue(parser1.closed)
+
+    def test_per_task_outside_task(self):
+        parser1 = self._container.get('task_parser')
+        parser2 = self._container.get('task_parser')
+        self.assertIs(parser1, parser2)
@@ -0,0 +1,88 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from pyjection.dependency_injector import DependencyInjector
+from pyjection.errors import ArgumentNotFoundError
+from pyjection.tracing import Tracer, InMemoryExporter, JsonLinesExporter
+
+
+class Connection(object):
+    pass
+
+
+class Repository(object):
+
+    def __init__(self, connection: Connection):
+        self.connection = connection
+
+
+class Controller(object):
+
+    def __init__(self, repository, connection):
+        self.repository = repository
+
+
+class Broken(object):
+
+    def __init__(self, missing):
+        self.missing = missing
+
+
+class TestTracing(TestCase):
+
+    def setUp(self):
+        self._exporter = InMemoryExporter()
+        self._container = DependencyInjector(tracer=Tracer(self._exporter))
+        self._container.register_singleton(Connection)
+        self._container.register(Repository)
+        self._container.register(Controller)
+
+    def test_nested_spans(self):
+        self._container.get('controller')
+        spans = {span.identifier: span for span in self._exporter.spans[:2]}
+        controller = self._exporter.spans[-1]
+        self.assertEqual(
+            [span.identifier for span in self._exporter.spans],
+            ['connection', 'repository', 'connection', 'controller']
+        )
+        self.assertIsNone(controller.parent_id)
+        self.assertEqual(spans['repository'].parent_id, controller.span_id)
+        self.assertEqual(spans['connection'].parent_id, spans['repository'].span_id)
+        self.assertEqual(spans['connection'].resolver, 'TypingResolver')
+        self.assertEqual(spans['repository'].resolver, 'NameResolver')
+        self.assertLessEqual(controller.start, spans['repository'].start)
+        self.assertGreaterEqual(controller.end, spans['repository'].end)
+
+    def test_cache_hit(self):
+        self._container.get('connection')
+        self._container.get('connection')
+        first, second = self._exporter.spans
+        self.assertEqual(first.lifetime, 'singleton')
+        self.assertFalse(first.cache_hit)
+        self.assertTrue(second.cache_hit)
+
+    def test_lifetime(self):
+        self._container.register_thread_local(Connection, 'local_connection')
+        self._container.get('local_connection')
+        self.assertEqual(self._exporter.spans[0].lifetime, 'thread_local')
+
+    def test_error(self):
+        self._container.register(Broken)
+        with self.assertRaises(ArgumentNotFoundError):
+            self._container.get('broken')
+        self.assertEqual(self._exporter.spans[0].error, 'ArgumentNotFoundError')
+
+    def test_json_lines_exporter(self):
+        path = os.path.join(tempfile.mkdtemp(), 'spans.jsonl')
+        exporter = JsonLinesExporter(path)
+        container = DependencyInjector(tracer=Tracer(exporter))
+        container.register(Repository)
+        container.register(Connection)
+        container.get('repository')
+        exporter.close()
+        with open(path) as spans_file:
+            spans = [json.loads(line) for line in spans_file]
+        self.assertEqual([span['identifier'] for span in spans], ['connection', 'repository'])
+        self.assertEqual(spans[0]['parent_id'], spans[1]['span_id'])
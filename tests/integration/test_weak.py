@@ -0,0 +1,80 @@
+import gc
+import time
+from unittest import TestCase
+
+from pyjection.dependency_injector import DependencyInjector
+from pyjection.errors import CircularDependencyError
+
+
+class Model(object):
+
+    created = 0
+
+    def __init__(self):
+        Model.created += 1
+
+
+class Parent(object):
+
+    def __init__(self, child):
+        self.child = child
+
+
+class Child(object):
+
+    def __init__(self, parent):
+        self.parent = parent
+
+
+class TestWeakSingleton(TestCase):
+
+    def setUp(self):
+        Model.created = 0
+        self._container = DependencyInjector()
+
+    def test_same_instance_while_referenced(self):
+        self._container.register_weak_singleton(Model, 'model')
+        model = self._container.get('model')
+        gc.collect()
+        self.assertIs(model, self._container.get('model'))
+        self.assertEqual(Model.created, 1)
+
+    def test_rebuilt_once_collected(self):
+        service = self._container.register_weak_singleton(Model, 'model')
+        model = self._container.get('model')
+        del model
+        gc.collect()
+        self.assertFalse(service.lifetime.stats()['alive'])
+        self.assertIsInstance(self._container.get('model'), Model)
+        self.assertEqual(Model.created, 2)
+
+    def test_kept_alive_until_idle(self):
+        service = self._container.register_weak_singleton(Model, 'model', idle_timeout=0.05)
+        model_id = id(self._container.get('model'))
+        gc.collect()
+        self.assertEqual(id(self._container.get('model')), model_id)
+        self.assertEqual(Model.created, 1)
+        deadline = time.monotonic() + 2
+        while service.lifetime.stats()['held'] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        gc.collect()
+        self.assertFalse(service.lifetime.stats()['alive'])
+        self._container.get('model')
+        self.assertEqual(Model.created, 2)
+
+    def test_not_weakly_referenceable(self):
+        self._container.register_weak_singleton(dict, 'settings')
+        settings = self._container.get('settings')
+        self.assertIs(self._container.get('settings'), settings)
+
+    def test_reset(self):
+        service = self._container.register_weak_singleton(Model, 'model', idle_timeout=10)
+        model = self._container.get('model')
+        service.lifetime.reset()
+        self.assertFalse(service.lifetime.stats()['held'])
+        self.assertIsNot(self._container.get('model'), model)
+
+    def test_circular_dependency(self):
+        self._container.register_weak_singleton(Parent)
+        self._container.register_weak_singleton(Child)
+        self.assertRaises(CircularDependencyError, self._container.get, 'parent')
@@ -0,0 +1,140 @@
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from pyjection.__main__ import main
+from pyjection.compiler import ContainerCompiler
+from pyjection.dependency_injector import DependencyInjector
+from pyjection.errors import CircularDependencyError, CompilationError, ServiceNotFoundError
+from pyjection.reference import Reference
+from pyjection.resolvers import BaseResolver, NameResolver
+
+
+class InnerClass(object):
+    pass
+
+
+class OuterClass(object):
+
+    def __init__(self, inner_class, foo, bar, inner_type, optional=None):
+        self.inner_class = inner_class
+        self.foo = foo
+        self.bar = bar
+        self.inner_type = inner_type
+        self.optional = optional
+
+
+class BaseStorage(object):
+    pass
+
+
+class Storage(BaseStorage):
+    pass
+
+
+class LoopClass(object):
+
+    def __init__(self, loop_class):
+        self.loop_class = loop_class
+
+
+class DynamicResolver(BaseResolver):
+
+    def resolve(self, method_parameter, service, injector):
+        if method_parameter.name == 'loop_class':
+            return 'dynamic'
+
+
+injector = DependencyInjector()
+injector.register_singleton(InnerClass)
+injector.register(OuterClass).add_arguments(
+    foo='foo',
+    bar=object(),
+    inner_type=Reference(InnerClass, return_class=True),
+)
+injector.register(InnerClass(), 'instance')
+
+interface_injector = DependencyInjector(index_mro=True)
+interface_injector.register_singleton(Storage)
+interface_injector.register(InnerClass)
+interface_injector.bind('inner_interface', InnerClass)
+
+dynamic_injector = DependencyInjector([DynamicResolver(), NameResolver()])
+dynamic_injector.register(LoopClass)
+
+
+def compile_module(compiled_injector, path):
+    namespace = dict()
+    source = ContainerCompiler(compiled_injector, path).compile()
+    exec(compile(source, '<compiled>', 'exec'), namespace)
+    return namespace
+
+
+class TestContainerCompiler(TestCase):
+
+    def setUp(self):
+        self._module = compile_module(injector, 'tests.unit.test_compiler:injector')
+
+    def test_get_instance(self):
+        result = self._module['get']('instance')
+        self.assertIs(result, injector.get('instance'))
+
+    def test_get_outer_class(self):
+        result = self._module['get'](OuterClass)
+        self.assertIsInstance(result, OuterClass)
+        self.assertIsInstance(result.inner_class, InnerClass)
+        self.assertEqual(result.foo, 'foo')
+        self.assertIs(result.bar, injector.get_service(OuterClass).arguments['bar'])
+        self.assertIs(result.inner_type, InnerClass)
+        self.assertIsNone(result.optional)
+
+    def test_singleton(self):
+        result1 = self._module['get']('inner_class')
+        result2 = self._module['get']('inner_class')
+        self.assertIs(result1, result2)
+
+    def test_not_singleton(self):
+        result1 = self._module['get']('outer_class')
+        result2 = self._module['get']('outer_class')
+        self.assertIsNot(result1, result2)
+
+    def test_unknown_service(self):
+        with self.assertRaises(ServiceNotFoundError):
+            self._module['get']('unknown')
+
+    def test_interfaces(self):
+        module = compile_module(interface_injector, 'tests.unit.test_compiler:interface_injector')
+        storage = module['get'](BaseStorage)
+        self.assertIsInstance(storage, Storage)
+        self.assertIs(storage, module['get'](Storage))
+        self.assertIsInstance(module['get']('inner_interface'), InnerClass)
+
+    def test_dynamic_resolver(self):
+        module = compile_module(dynamic_injector, 'tests.unit.test_compiler:dynamic_injector')
+        self.assertEqual(module['get'](LoopClass).loop_class, 'dynamic')
+
+    def test_circular_dependency(self):
+        loop_injector = DependencyInjector()
+        loop_injector.register(LoopClass)
+        with self.assertRaises(CircularDependencyError):
+            ContainerCompiler(loop_injector, 'module:injector').compile()
+
+    def test_unknown_reference(self):
+        broken_injector = DependencyInjector()
+        broken_injector.register(LoopClass).add_argument('loop_class', Reference('unknown', True))
+        with self.assertRaises(CompilationError):
+            ContainerCompiler(broken_injector, 'module:injector').compile()
+
+    def test_profiled_dependency(self):
+        profiled_injector = DependencyInjector()
+        profiled_injector.register(InnerClass, 'loop_class', profiles={'test'})
+        profiled_injector.register(LoopClass)
+        with mock.patch.dict(os.environ, {'PYJECTION_PROFILES': 'test'}):
+            source = ContainerCompiler(profiled_injector, 'module:injector').compile()
+        self.assertIn("_injector.get_uninstantiated('loop_class')", source)
+
+    def test_command_line(self):
+        output = os.path.join(tempfile.mkdtemp(), 'compiled.py')
+        result = main(['compile', 'tests.unit.test_compiler:injector', output])
+        self.assertEqual(result, 0)
+        self.assertTrue(os.path.exists(output))
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import marshal
+import os
+import sys
+import tempfile
+from unittest import TestCase, mock
+
+from pyjection.configuration import ConfigurationLoader
+from pyjection.dependency_injector import DependencyInjector
+from pyjection.errors import ConfigurationError
+from pyjection.lifetimes import PooledLifetime
+
+
+class Connection(object):
+
+    def __init__(self, url):
+        self.url = url
+
+
+class Repository(object):
+
+    def __init__(self, connection, connection_class, handlers):
+        self.connection = connection
+        self.connection_class = connection_class
+        self.handlers = handlers
+
+
+class Handler(object):
+
+    def handle(self, key):
+        return [key]
+
+
+settings = object()
+
+CONFIGURATION = {
+    "services": {
+        "connection": {
+            "class": "tests.unit.test_configuration:Connection",
+            "lifetime": "singleton",
+            "arguments": {"url": "sqlite://"},
+        },
+        "repository": {
+            "class": "tests.unit.test_configuration:Repository",
+            "lifetime": "pooled",
+            "options": {"max_size": 2},
+            "arguments": {
+                "connection": {"$ref": "connection"},
+                "connection_class": {"$class": "connection"},
+                "handlers": {"$tag": "handlers"},
+            },
+        },
+        "handler": {
+            "class": "tests.unit.test_configuration:Handler",
+            "tags": ["handlers"],
+            "memoize": {"methods": ["handle"], "max_size": 10},
+        },
+        "settings": {"instance": "tests.unit.test_configuration:settings"},
+        "prod_settings": {
+            "instance": "tests.unit.test_configuration:settings",
+            "profiles": ["prod"],
+        },
+    },
+    "bindings": {"tests.unit.test_configuration:Handler": "handler"},
+}
+
+TOML_CONFIGURATION = '''
+[services.connection]
+class = "tests.unit.test_configuration:Connection"
+lifetime = "singleton"
+arguments = { url = "sqlite://" }
+'''
+
+
+class TestConfigurationLoader(TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._cache_path = os.path.join(self._directory, 'configuration.cache')
+
+    def _write(self, content, name='configuration.json'):
+        path = os.path.join(self._directory, name)
+        with open(path, 'w') as configuration_file:
+            configuration_file.write(content if isinstance(content, str) else json.dumps(content))
+        return path
+
+    def test_load(self):
+        injector = ConfigurationLoader().load(self._write(CONFIGURATION))
+        repository = injector.get('repository')
+        self.assertIs(repository.connection, injector.get('connection'))
+        self.assertEqual(repository.connection.url, 'sqlite://')
+        self.assertIs(repository.connection_class, Connection)
+        self.assertEqual(len(repository.handlers), 1)
+        self.assertIsInstance(injector.get_service('repository').lifetime, PooledLifetime)
+        self.assertIs(injector.get('settings'), settings)
+
+    def test_profiles(self):
+        injector = ConfigurationLoader().load(self._write(CONFIGURATION))
+        injector.finalize({'dev'})
+        self.assertFalse(injector.has_service('prod_settings'))
+
+    def test_memoize(self):
+        injector = ConfigurationLoader().load(self._write(CONFIGURATION))
+        handler = injector.get('handler')
+        self.assertIs(handler.handle('a'), handler.handle('a'))
+
+    def test_invalid_memoize(self):
+        configuration = {"services": {"handler": {"class": "app:Handler", "memoize": {"size": 1}}}}
+        with self.assertRaises(ConfigurationError):
+            ConfigurationLoader().validate(configuration)
+
+    def test_load_toml(self):
+        injector = ConfigurationLoader().load(self._write(TOML_CONFIGURATION, 'configuration.toml'))
+        self.assertEqual(injector.get('connection').url, 'sqlite://')
+
+    def test_complete_injector(self):
+        injector = DependencyInjector()
+        result = ConfigurationLoader().load(self._write(CONFIGURATION), injector)
+        self.assertIs(result, injector)
+        self.assertTrue(injector.has_service('connection'))
+
+    def test_cache(self):
+        path = self._write(CONFIGURATION)
+        ConfigurationLoader(self._cache_path).load(path)
+        self.assertTrue(os.path.exists(self._cache_path))
+        with mock.patch.object(ConfigurationLoader, 'validate') as validate:
+            injector = ConfigurationLoader(self._cache_path).load(path)
+        validate.assert_not_called()
+        self.assertEqual(injector.get('connection').url, 'sqlite://')
+
+    def test_cache_invalidated_on_change(self):
+        ConfigurationLoader(self._cache_path).load(self._write(CONFIGURATION))
+        toml_configuration = TOML_CONFIGURATION.replace('sqlite://', 'postgres://')
+        path = self._write(toml_configuration, 'configuration.toml')
+        injector = ConfigurationLoader(self._cache_path).load(path)
+        self.assertEqual(injector.get('connection').url, 'postgres://')
+        self.assertFalse(injector.has_service('repository'))
+
+    def test_cache_of_another_layout(self):
+        path = self._write(CONFIGURATION)
+        with open(path, 'rb') as configuration_file:
+            digest = hashlib.sha1(configuration_file.read()).hexdigest()
+        service = ('connection', 'class', 'tests.unit.test_configuration:Connection', 'singleton',
+                   dict(), (), ())
+        with open(self._cache_path, 'wb') as cache_file:
+            marshal.dump((sys.version, digest, ((service,), ())), cache_file)
+        injector = ConfigurationLoader(self._cache_path).load(path)
+        self.assertEqual(injector.get('connection').url, 'sqlite://')
+
+    def test_corrupted_cache(self):
+        with open(self._cache_path, 'w') as cache_file:
+            cache_file.write('corrupted')
+        injector = ConfigurationLoader(self._cache_path).load(self._write(CONFIGURATION))
+        self.assertTrue(injector.has_service('connection'))
+
+    def test_invalid_json(self):
+        with self.assertRaises(ConfigurationError):
+            ConfigurationLoader().load(self._write('{'))
+
+    def test_unknown_lifetime(self):
+        configuration = {
+            "services": {"connection": {"class": "app:Connection", "lifetime": "unknown"}}
+        }
+        with self.assertRaises(ConfigurationError):
+            ConfigurationLoader().validate(configuration)
+
+    def test_unknown_option(self):
+        configuration = {
+            "services": {"connection": {"class": "app:Connection", "options": {"ttl": 1}}}
+        }
+        with self.assertRaises(ConfigurationError):
+            ConfigurationLoader().validate(configuration)
+
+    def test_invalid_path(self):
+        configuration = {"services": {"connection": {"class": "Connection"}}}
+        with self.assertRaises(ConfigurationError):
+            ConfigurationLoader().validate(configuration)
+
+    def test_unknown_class(self):
+        configuration = {
+            "services": {"connection": {"class": "tests.unit.test_configuration:Unknown"}}
+        }
+        with self.assertRaises(ConfigurationError):
+            ConfigurationLoader().load(self._write(configuration))
@@ -89,3 +89,29 @@ class TestDependencyInjector(TestCase):
         self.injector._services['fake_service'] = fake_service
         result = self.injector.get('fake_service')
         self.assertEqual(subject, result)
+
+    def test_get_service(self):
+        fake_service = Service(Mock)
+        self.injector._services['fake_service'] = fake_service
+        self.assertIs(self.injector.get_service('fake_service'), fake_service)
+
+    def test_get_identifiers(self):
+        self.injector.register(Mock)
+        self.assertEqual(self.injector.get_identifiers(), ['mock'])
+
+    def test_get_construction_plan_instance(self):
+        self.injector._services['fake_service'] = Service(Mock())
+        self.assertEqual(self.injector.get_construction_plan('fake_service'), [])
+
+    def test_get_parameters_instance(self):
+        self.injector._services['fake_service'] = Service(Mock())
+        self.assertEqual(self.injector.get_parameters('fake_service'), ())
+
+    def test_get_resolution(self):
+        self.injector.register(Mock, 'mock').add_argument('spec', 'value')
+        spec = [
+            method_parameter
+            for method_parameter in self.injector.get_parameters('mock')
+            if method_parameter.name == 'spec'
+        ][0]
+        self.assertEqual(self.injector.get_resolution('mock', spec).value, 'value')
@@ -1,8 +1,10 @@
+from typing import Annotated, List, Optional, Union
 from unittest import TestCase
 from unittest.mock import Mock
 
 from pyjection.helper import convert_camel_to_snake
 from pyjection.helper import get_service_subject_identifier
+from pyjection.helper import unwrap_annotation
 
 
 class TestHelper(TestCase):
@@ -23,3 +25,23 @@ class TestHelper(TestCase):
         result = get_service_subject_identifier(Mock())
         self.assertEqual(result, "mock")
 
+    def test_unwrap_annotation_class(self):
+        self.assertEqual(unwrap_annotation(Mock), (Mock, None))
+
+    def test_unwrap_annotation_optional(self):
+        self.assertEqual(unwrap_annotation(Optional[Mock]), (Mock, None))
+
+    def test_unwrap_annotation_union_type(self):
+        self.assertEqual(unwrap_annotation(Mock | None), (Mock, None))
+
+    def test_unwrap_annotation_union(self):
+        self.assertEqual(unwrap_annotation(Union[Mock, str]), (None, None))
+
+    def test_unwrap_annotation_annotated(self):
+        self.assertEqual(unwrap_annotation(Annotated[Mock, 1, 'primary']), (Mock, 'primary'))
+
+    def test_unwrap_annotation_optional_annotated(self):
+        self.assertEqual(unwrap_annotation(Optional[Annotated[Mock, 'primary']]), (Mock, 'primary'))
+
+    def test_unwrap_annotation_generic(self):
+        self.assertEqual(unwrap_annotation(List[Mock]), (List[Mock], None))
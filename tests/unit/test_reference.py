@@ -17,3 +17,10 @@ class TestReference(TestCase):
         reference = Reference('test_name', True)
         self.assertEqual(reference.return_class, True)
 
+    def test_multi(self):
+        reference = Reference('test_name', multi=True)
+        self.assertTrue(reference.multi)
+
+    def test_multi_default(self):
+        reference = Reference('test_name')
+        self.assertFalse(reference.multi)
@@ -1,10 +1,11 @@
-from typing import List
+from typing import Annotated, List, Optional
 from unittest import TestCase
 from unittest.mock import Mock, create_autospec
 from inspect import signature
 from collections import OrderedDict
 
 from pyjection.resolvers import NameResolver, ServiceResolver, TypingResolver
+from pyjection.resolvers import Resolution, VALUE, SERVICE, CLASS, MULTI
 from pyjection.dependency_injector import DependencyInjector
 from pyjection.service import Service
 from pyjection.reference import Reference
@@ -53,6 +54,36 @@ class TestServiceResolver(TestCase):
         self._resolver.resolve(self._parameter, self._service, self._injector)
         self._injector.get.assert_called_with('test_parameter')
 
+    def test_plan_none(self):
+        self._service.arguments = dict()
+        result = self._resolver.plan(self._parameter, self._service, self._injector)
+        self.assertIsNone(result)
+
+    def test_plan_value(self):
+        self._service.arguments = dict(test_parameter='value')
+        result = self._resolver.plan(self._parameter, self._service, self._injector)
+        self.assertEqual(result, Resolution(VALUE, 'value'))
+
+    def test_plan_reference(self):
+        self._service.arguments = dict(test_parameter=Reference('other'))
+        result = self._resolver.plan(self._parameter, self._service, self._injector)
+        self.assertEqual(result, Resolution(SERVICE, 'other'))
+
+    def test_return_reference_multi(self):
+        self._service.arguments = dict(test_parameter=Reference('plugin', multi=True))
+        self._resolver.resolve(self._parameter, self._service, self._injector)
+        self._injector.get_all.assert_called_with('plugin')
+
+    def test_plan_reference_multi(self):
+        self._service.arguments = dict(test_parameter=Reference('plugin', multi=True))
+        result = self._resolver.plan(self._parameter, self._service, self._injector)
+        self.assertEqual(result, Resolution(MULTI, 'plugin'))
+
+    def test_plan_reference_class(self):
+        self._service.arguments = dict(test_parameter=Reference('other', True))
+        result = self._resolver.plan(self._parameter, self._service, self._injector)
+        self.assertEqual(result, Resolution(CLASS, 'other'))
+
 
 class TestNameResolver(TestCase):
 
@@ -86,6 +117,12 @@ class TestNameResolver(TestCase):
         result = self._resolver.resolve(self._parameter, None, self._injector)
         self.assertEqual(result, return_value)
 
+    def test_plan(self):
+        self._injector.has_service = Mock(return_value=True)
+        result = self._resolver.plan(self._parameter, None, self._injector)
+        self.assertEqual(result, Resolution(SERVICE, 'test_parameter'))
+        self._injector.get.assert_not_called()
+
 
 class TestTypingResolver(TestCase):
 
@@ -136,3 +173,78 @@ class TestTypingResolver(TestCase):
         self._injector.get = Mock(return_value=return_value)
         result = self._resolver.resolve(parameter, None, self._injector)
         self.assertEqual(result, return_value)
+
+    def test_plan(self):
+        class TestClass:
+            pass
+
+        def test(_: TestClass):
+            pass
+        parameter = self.get_parameter(test)
+        self._injector.has_service = Mock(return_value=True)
+        result = self._resolver.plan(parameter, None, self._injector)
+        self.assertEqual(result, Resolution(SERVICE, 'test_class'))
+        self._injector.get.assert_not_called()
+
+    def test_return_generic(self):
+        def test(_: dict[str, Mock]):
+            pass
+        parameter = self.get_parameter(test)
+        result = self._resolver.resolve(parameter, None, self._injector)
+        self.assertIsNone(result)
+
+    def test_return_collection_without_tag(self):
+        def test(_: list[Mock]):
+            pass
+        parameter = self.get_parameter(test)
+        self._injector.has_tag = Mock(return_value=False)
+        result = self._resolver.resolve(parameter, None, self._injector)
+        self.assertIsNone(result)
+
+    def test_return_collection(self):
+        def test(_: List[Mock]):
+            pass
+        parameter = self.get_parameter(test)
+        self._injector.has_tag = Mock(return_value=True)
+        self._injector.get_all = Mock(return_value=[])
+        result = self._resolver.resolve(parameter, None, self._injector)
+        self._injector.get_all.assert_called_with(Mock)
+        self.assertEqual(result, [])
+
+    def test_plan_collection(self):
+        def test(_: List[Mock]):
+            pass
+        parameter = self.get_parameter(test)
+        self._injector.has_tag = Mock(return_value=True)
+        result = self._resolver.plan(parameter, None, self._injector)
+        self.assertEqual(result, Resolution(MULTI, 'mock'))
+
+    def test_return_string(self):
+        def test(_: 'TestClass'):
+            pass
+        parameter = self.get_parameter(test)
+        result = self._resolver.resolve(parameter, None, self._injector)
+        self.assertIsNone(result)
+        self._injector.has_service.assert_not_called()
+
+    def test_optional(self):
+        class TestClass:
+            pass
+
+        def test(_: Optional[TestClass]):
+            pass
+        parameter = self.get_parameter(test)
+        self._injector.has_service = Mock(return_value=True)
+        self._resolver.resolve(parameter, None, self._injector)
+        self._injector.get.assert_called_with(TestClass)
+
+    def test_annotated(self):
+        class TestClass:
+            pass
+
+        def test(_: Annotated[TestClass, 'primary']):
+            pass
+        parameter = self.get_parameter(test)
+        self._injector.has_service = Mock(return_value=True)
+        self._resolver.resolve(parameter, None, self._injector)
+        self._injector.get.assert_called_with('primary')
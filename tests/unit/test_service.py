@@ -50,3 +50,14 @@ class TestService(TestCase):
         service = Service(Mock)
         result = service.add_arguments(key1='value', key2='other_value')
         self.assertEqual(service, result)
+
+    def test_close_callback_default(self):
+        service = Service(Mock)
+        self.assertIsNone(service.close_callback)
+
+    def test_on_close(self):
+        service = Service(Mock)
+        callback = Mock()
+        result = service.on_close(callback)
+        self.assertIs(service.close_callback, callback)
+        self.assertEqual(service, result)
@@ -0,0 +1,172 @@
+import dataclasses
+import json
+import os
+import sys
+import tempfile
+import typing
+from inspect import Parameter
+from unittest import TestCase, skipIf
+
+try:
+    import attr
+except ImportError:
+    attr = None
+
+from pyjection.signature_cache import SignatureCache, FileSignatureCache
+
+
+class InnerClass(object):
+    pass
+
+
+class OuterClass(object):
+
+    def __init__(self, inner_class: InnerClass, foo, *args, bar=None, **kwargs):
+        self.inner_class = inner_class
+
+
+@dataclasses.dataclass
+class DataClass(object):
+    inner_class: InnerClass
+    foo: str = 'foo'
+    items: list = dataclasses.field(default_factory=list)
+    computed: int = dataclasses.field(init=False, default=0)
+    bar: int = dataclasses.field(default=1, kw_only=True)
+
+
+@dataclasses.dataclass
+class InitVarClass(object):
+    inner_class: InnerClass
+    seed: dataclasses.InitVar[int] = 0
+
+    def __post_init__(self, seed):
+        pass
+
+
+class NamedTupleClass(typing.NamedTuple):
+    inner_class: InnerClass
+    foo: str = 'foo'
+
+
+class TestSignatureCache(TestCase):
+
+    def setUp(self):
+        self._cache = SignatureCache()
+
+    def test_object_init(self):
+        result = self._cache.get_parameters(InnerClass)
+        self.assertEqual(result, tuple())
+
+    def test_self_skipped(self):
+        result = self._cache.get_parameters(OuterClass)
+        self.assertEqual(
+            [parameter.name for parameter in result],
+            ['inner_class', 'foo', 'args', 'bar', 'kwargs']
+        )
+
+    def test_cached(self):
+        result1 = self._cache.get_parameters(OuterClass)
+        result2 = self._cache.get_parameters(OuterClass)
+        self.assertIs(result1, result2)
+
+    def test_dataclass(self):
+        result = self._cache.get_parameters(DataClass)
+        names = [parameter.name for parameter in result]
+        self.assertEqual(names, ['inner_class', 'foo', 'items', 'bar'])
+        self.assertIs(result[0].annotation, InnerClass)
+        self.assertIs(result[0].default, Parameter.empty)
+        self.assertEqual(result[1].default, 'foo')
+        self.assertIsNot(result[2].default, Parameter.empty)
+        self.assertEqual(result[3].kind, Parameter.KEYWORD_ONLY)
+
+    def test_dataclass_init_var(self):
+        result = self._cache.get_parameters(InitVarClass)
+        self.assertEqual([parameter.name for parameter in result], ['inner_class', 'seed'])
+
+    @skipIf(attr is None, 'attrs is not installed')
+    def test_attrs_class(self):
+        @attr.s
+        class AttrsClass(object):
+            _inner_class = attr.ib(type=InnerClass)
+            foo = attr.ib(default='foo')
+            items = attr.ib(factory=list)
+
+        result = self._cache.get_parameters(AttrsClass)
+        self.assertEqual([parameter.name for parameter in result], ['inner_class', 'foo', 'items'])
+        self.assertIs(result[0].annotation, InnerClass)
+        self.assertIsNot(result[2].default, Parameter.empty)
+
+    def test_named_tuple(self):
+        result = self._cache.get_parameters(NamedTupleClass)
+        self.assertEqual([parameter.name for parameter in result], ['inner_class', 'foo'])
+        self.assertIs(result[0].annotation, InnerClass)
+        self.assertEqual(result[1].default, 'foo')
+
+    def test_clear(self):
+        result1 = self._cache.get_parameters(OuterClass)
+        self._cache.clear()
+        result2 = self._cache.get_parameters(OuterClass)
+        self.assertIsNot(result1, result2)
+
+
+class TestFileSignatureCache(TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self._path = os.path.join(directory, 'signatures.json')
+
+    def _load_entries(self):
+        with open(self._path) as cache_file:
+            return json.load(cache_file)['entries']
+
+    def test_save(self):
+        cache = FileSignatureCache(self._path)
+        cache.get_parameters(OuterClass)
+        cache.save()
+        entries = self._load_entries()
+        self.assertIn('tests.unit.test_signature_cache:OuterClass', entries)
+
+    def test_save_without_change(self):
+        cache = FileSignatureCache(self._path)
+        cache.save()
+        self.assertFalse(os.path.exists(self._path))
+
+    def test_load(self):
+        cache = FileSignatureCache(self._path)
+        expected = cache.get_parameters(OuterClass)
+        cache.save()
+
+        result = FileSignatureCache(self._path).get_parameters(OuterClass)
+        self.assertEqual([p.name for p in result], [p.name for p in expected])
+        self.assertEqual([p.kind for p in result], [p.kind for p in expected])
+        self.assertIs(result[0].annotation, InnerClass)
+        self.assertIs(result[1].default, Parameter.empty)
+        self.assertIsNot(result[3].default, Parameter.empty)
+
+    def test_invalidated_on_change(self):
+        cache = FileSignatureCache(self._path)
+        cache.get_parameters(OuterClass)
+        cache.save()
+        entries = self._load_entries()
+        entries['tests.unit.test_signature_cache:OuterClass']['fingerprint'] = 'outdated'
+        entries['tests.unit.test_signature_cache:OuterClass']['parameters'] = []
+        with open(self._path, 'w') as cache_file:
+            json.dump({'python': sys.version, 'entries': entries}, cache_file)
+
+        result = FileSignatureCache(self._path).get_parameters(OuterClass)
+        self.assertEqual(len(result), 5)
+
+    def test_local_class_not_persisted(self):
+        class LocalClass(object):
+            def __init__(self, foo):
+                pass
+        cache = FileSignatureCache(self._path)
+        cache.get_parameters(LocalClass)
+        cache.save()
+        self.assertFalse(os.path.exists(self._path))
+
+    def test_corrupted_file(self):
+        with open(self._path, 'w') as cache_file:
+            cache_file.write('not json')
+        result = FileSignatureCache(self._path).get_parameters(OuterClass)
+        self.assertEqual(len(result), 5)
@@ -0,0 +1,109 @@
+import io
+from contextlib import redirect_stdout
+from unittest import TestCase
+
+from pyjection.__main__ import main
+from pyjection.dependency_injector import DependencyInjector
+from pyjection.reference import Reference
+from pyjection.validator import ContainerValidator, ServiceMetrics
+
+
+class Connection(object):
+
+    def __init__(self):
+        raise AssertionError('Services must not be instantiated')
+
+
+class Repository(object):
+
+    def __init__(self, connection):
+        self.connection = connection
+
+
+class Controller(object):
+
+    def __init__(self, repository, connection, timeout=10):
+        self.repository = repository
+        self.connection = connection
+
+
+class Broken(object):
+
+    def __init__(self, missing, unknown):
+        self.missing = missing
+        self.unknown = unknown
+
+
+class First(object):
+
+    def __init__(self, second):
+        self.second = second
+
+
+class Second(object):
+
+    def __init__(self, first):
+        self.first = first
+
+
+class Tenant(object):
+
+    def __init__(self, tenant_id):
+        self.tenant_id = tenant_id
+
+
+injector = DependencyInjector()
+injector.register_singleton(Connection)
+injector.register(Repository)
+injector.register(Controller)
+
+
+class TestContainerValidator(TestCase):
+
+    def test_valid(self):
+        report = ContainerValidator(injector).validate()
+        self.assertTrue(report.is_valid)
+        self.assertEqual(report.errors, [])
+        self.assertEqual(report.cycles, [])
+
+    def test_metrics(self):
+        report = ContainerValidator(injector).validate()
+        self.assertEqual(report.metrics['connection'], ServiceMetrics(depth=0, fan_out=0, fan_in=2))
+        self.assertEqual(report.metrics['repository'], ServiceMetrics(depth=1, fan_out=1, fan_in=1))
+        self.assertEqual(report.metrics['controller'], ServiceMetrics(depth=2, fan_out=2, fan_in=0))
+
+    def test_unresolved_arguments(self):
+        broken_injector = DependencyInjector()
+        broken_injector.register(Broken).add_argument('unknown', Reference('unknown'))
+        report = ContainerValidator(broken_injector).validate()
+        self.assertFalse(report.is_valid)
+        self.assertEqual([problem.identifier for problem in report.errors], ['broken', 'broken'])
+        self.assertIn('missing', report.errors[0].message)
+        self.assertIn('unknown', report.errors[1].message)
+
+    def test_cycles(self):
+        loop_injector = DependencyInjector()
+        loop_injector.register(First)
+        loop_injector.register(Second)
+        report = ContainerValidator(loop_injector).validate()
+        self.assertFalse(report.is_valid)
+        self.assertEqual(report.cycles, [['first', 'second', 'first']])
+
+    def test_runtime_arguments(self):
+        multiton_injector = DependencyInjector()
+        multiton_injector.register_multiton(Tenant)
+        report = ContainerValidator(multiton_injector).validate()
+        self.assertTrue(report.is_valid)
+        self.assertEqual(len(report.warnings), 1)
+
+    def test_command_line(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            result = main(['check', 'tests.unit.test_validator:injector', '-v'])
+        self.assertEqual(result, 0)
+        self.assertIn('controller', output.getvalue())
+
+    def test_command_line_max_depth(self):
+        with redirect_stdout(io.StringIO()):
+            result = main(['check', 'tests.unit.test_validator:injector', '--max-depth', '1'])
+        self.assertEqual(result, 1)